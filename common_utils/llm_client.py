@@ -0,0 +1,498 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+
+import httpx
+import ollama
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error):
+    """
+    Returns:
+        bool: True for timeouts, connection problems, rate limits and server errors.
+    """
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    # openai.APIConnectionError / APITimeoutError have no status code
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class LLMClient:
+    """
+    Shared LLM access for every tool of the toolkit.
+
+    Keeps one pooled keep-alive client per backend (Ollama for "offline", OpenAI for "online"),
+    sync and asyncio flavours, with request timeouts, retries with jittered exponential backoff
+    and a limit on concurrent requests.
+
+    Args:
+        timeout (float): Request timeout in seconds.
+        max_retries (int): Retries of a failed request (only for retryable errors).
+        backoff_base (float): First backoff delay in seconds, doubled on each retry.
+        backoff_max (float): Maximum backoff delay in seconds.
+        max_concurrency (int): Maximum requests in flight at the same time.
+        ollama_host (str): Ollama server URL (default: OLLAMA_HOST or the local server).
+        verify_ssl (bool): Verify TLS certificates on the OpenAI connection.
+        max_metrics (int): Most recent calls kept in `metrics`.
+    """
+
+    def __init__(self, timeout=300.0, max_retries=3, backoff_base=1.0, backoff_max=30.0,
+                 max_concurrency=8, ollama_host=None, verify_ssl=False, max_metrics=10000):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+        self.ollama_host = ollama_host
+        self.verify_ssl = verify_ssl
+
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        # one semaphore per event loop; entries go away with their loop
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._ollama = None
+        self._openai = None
+        self._async_ollama = None
+        self._async_openai = None
+        self._closing = None
+        self.metrics = deque(maxlen=max_metrics)
+
+    def _limits(self):
+        return httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+
+    @staticmethod
+    def _load_api_key():
+        load_dotenv()
+        if os.getenv('OPENAI_API_KEY'):
+            os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY')
+
+    @property
+    def ollama(self):
+        with self._lock:
+            if self._ollama is None:
+                self._ollama = ollama.Client(host=self.ollama_host, timeout=self.timeout, limits=self._limits())
+            return self._ollama
+
+    @property
+    def openai(self):
+        with self._lock:
+            if self._openai is None:
+                self._load_api_key()
+                http_client = httpx.Client(verify=self.verify_ssl, timeout=self.timeout, limits=self._limits())
+                # retries are handled here, with jitter, for both backends
+                self._openai = OpenAI(http_client=http_client, max_retries=0)
+            return self._openai
+
+    @property
+    def async_ollama(self):
+        with self._lock:
+            if self._async_ollama is None:
+                self._async_ollama = ollama.AsyncClient(host=self.ollama_host, timeout=self.timeout, limits=self._limits())
+            return self._async_ollama
+
+    @property
+    def async_openai(self):
+        with self._lock:
+            if self._async_openai is None:
+                self._load_api_key()
+                http_client = httpx.AsyncClient(verify=self.verify_ssl, timeout=self.timeout, limits=self._limits())
+                self._async_openai = AsyncOpenAI(http_client=http_client, max_retries=0)
+            return self._async_openai
+
+    def _async_semaphore(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # a semaphore that waited keeps a reference to its loop, which would keep the weak entry
+            # alive: drop the loops already closed (asyncio.run per call, restarted notebook kernels...)
+            for closed in [other for other in self._async_semaphores if other.is_closed()]:
+                del self._async_semaphores[closed]
+            if loop not in self._async_semaphores:
+                self._async_semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return self._async_semaphores[loop]
+
+    def backoff_delay(self, attempt):
+        """
+        Returns:
+            float: Seconds to wait before retry number `attempt` (full jitter).
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def build_messages(prompt, system_prompt):
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+
+    @staticmethod
+    def _check_mode(execution_mode):
+        mode = execution_mode.lower()
+        if mode not in ("offline", "online"):
+            raise ValueError("Invalid execution_mode. Use 'offline' or 'online'.")
+        return mode
+
+    def _request(self, prompt, model, system_prompt, mode, temperature):
+        messages = self.build_messages(prompt, system_prompt)
+        if mode == "offline":
+            options = {"temperature": temperature} if temperature is not None else None
+            response = self.ollama.chat(model=model, messages=messages, options=options)
+            return response["message"]["content"], response.get("eval_count")
+
+        kwargs = {"temperature": temperature} if temperature is not None else {}
+        response = self.openai.chat.completions.create(model=model, messages=messages, **kwargs)
+        usage = getattr(response, "usage", None)
+        return response.choices[0].message.content, getattr(usage, "completion_tokens", None)
+
+    async def _arequest(self, prompt, model, system_prompt, mode, temperature):
+        messages = self.build_messages(prompt, system_prompt)
+        if mode == "offline":
+            options = {"temperature": temperature} if temperature is not None else None
+            response = await self.async_ollama.chat(model=model, messages=messages, options=options)
+            return response["message"]["content"], response.get("eval_count")
+
+        kwargs = {"temperature": temperature} if temperature is not None else {}
+        response = await self.async_openai.chat.completions.create(model=model, messages=messages, **kwargs)
+        usage = getattr(response, "usage", None)
+        return response.choices[0].message.content, getattr(usage, "completion_tokens", None)
+
+    def _stream_request(self, prompt, model, system_prompt, mode, temperature):
+        """
+        Yields:
+            tuple: (text chunk, output token count) - the token count is only known at the end of the stream.
+        """
+        messages = self.build_messages(prompt, system_prompt)
+        if mode == "offline":
+            options = {"temperature": temperature} if temperature is not None else None
+            stream = self.ollama.chat(model=model, messages=messages, options=options, stream=True)
+            try:
+                for chunk in stream:
+                    yield chunk["message"]["content"], chunk.get("eval_count") if chunk.get("done") else None
+            finally:
+                # abandoned stream: end the HTTP response so the connection goes back to the pool
+                stream.close()
+            return
+
+        kwargs = {"temperature": temperature} if temperature is not None else {}
+        stream = self.openai.chat.completions.create(
+            model=model, messages=messages, stream=True, stream_options={"include_usage": True}, **kwargs
+        )
+        try:
+            for chunk in stream:
+                text = (chunk.choices[0].delta.content or "") if chunk.choices else ""
+                usage = getattr(chunk, "usage", None)
+                yield text, getattr(usage, "completion_tokens", None)
+        finally:
+            stream.close()
+
+    def _record_metrics(self, model, mode, started, first_token, finished, output_tokens, streamed):
+        total = finished - started
+        generation = finished - (first_token if first_token is not None else started)
+        record = {
+            "timestamp": time.time(),
+            "backend": "ollama" if mode == "offline" else "openai",
+            "model": model,
+            "streamed": streamed,
+            "ttft_seconds": round(first_token - started, 4) if first_token is not None else None,
+            "total_seconds": round(total, 4),
+            "output_tokens": output_tokens,
+            "tokens_per_second": round(output_tokens / generation, 2) if output_tokens and generation > 0 else None,
+        }
+        with self._lock:
+            self.metrics.append(record)
+        return record
+
+    def chat(self, prompt, model, system_prompt, execution_mode="offline", temperature=None, stream=False, on_chunk=None):
+        """
+        Send a chat request and return the answer text.
+
+        Args:
+            prompt (str): User prompt.
+            model (str): Model name ("llama3.2", "gpt-4o-mini"...).
+            system_prompt (str): System prompt.
+            execution_mode (str): "offline" (Ollama) or "online" (OpenAI API).
+            temperature (float): Sampling temperature (model default when None).
+            stream (bool): Receive the answer as a stream (see stream_chat).
+            on_chunk (callable): Called with every text chunk when streaming.
+
+        Returns:
+            str: The model answer.
+        """
+        if stream:
+            return "".join(self.stream_chat(prompt, model, system_prompt, execution_mode, temperature, on_chunk))
+
+        mode = self._check_mode(execution_mode)
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.semaphore:
+                    started = time.perf_counter()
+                    text, output_tokens = self._request(prompt, model, system_prompt, mode, temperature)
+                    self._record_metrics(model, mode, started, None, time.perf_counter(), output_tokens, False)
+                    return text
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"⚠️ LLM request failed ({type(e).__name__}), retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+    def stream_chat(self, prompt, model, system_prompt, execution_mode="offline", temperature=None, on_chunk=None):
+        """
+        Send a chat request and yield the answer while it is generated.
+
+        A request is only retried if it fails before the first chunk arrives.
+        Time to first token, total latency and tokens/sec are stored in `metrics`.
+
+        The request holds a slot of the concurrency limit until the stream ends; close the generator
+        (or use it in a `with contextlib.closing(...)` block) when stopping early, so the slot and the
+        connection are released at once instead of when the generator is garbage collected.
+
+        Yields:
+            str: Text chunks of the answer.
+        """
+        mode = self._check_mode(execution_mode)
+        for attempt in range(self.max_retries + 1):
+            first_token = None
+            try:
+                self.semaphore.acquire()
+                stream = self._stream_request(prompt, model, system_prompt, mode, temperature)
+                try:
+                    started = time.perf_counter()
+                    output_tokens = None
+                    chunks = 0
+                    for text, tokens in stream:
+                        if tokens is not None:
+                            output_tokens = tokens
+                        if not text:
+                            continue
+                        if first_token is None:
+                            first_token = time.perf_counter()
+                        chunks += 1
+                        if on_chunk is not None:
+                            on_chunk(text)
+                        yield text
+                    self._record_metrics(model, mode, started, first_token, time.perf_counter(), output_tokens or chunks, True)
+                    return
+                finally:
+                    stream.close()
+                    self.semaphore.release()
+            except Exception as e:
+                if first_token is not None or attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"⚠️ LLM request failed ({type(e).__name__}), retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+    def _embed_request(self, texts, model, mode):
+        if mode == "offline":
+            return self.ollama.embed(model=model, input=texts)["embeddings"]
+        response = self.openai.embeddings.create(model=model, input=texts)
+        return [item.embedding for item in response.data]
+
+    def embed(self, texts, model, execution_mode="offline"):
+        """
+        Embed texts, with the same pooled clients, retries and concurrency limit as chat().
+
+        Args:
+            texts (list): Texts to embed.
+            model (str): Embedding model name ("nomic-embed-text", "text-embedding-3-small"...).
+            execution_mode (str): "offline" (Ollama) or "online" (OpenAI API).
+
+        Returns:
+            list: One vector (list of floats) per text.
+        """
+        mode = self._check_mode(execution_mode)
+        texts = list(texts)
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.semaphore:
+                    started = time.perf_counter()
+                    vectors = self._embed_request(texts, model, mode)
+                    self._record_metrics(model, mode, started, None, time.perf_counter(), None, False)
+                    return vectors
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"⚠️ Embedding request failed ({type(e).__name__}), retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+    async def achat(self, prompt, model, system_prompt, execution_mode="offline", temperature=None):
+        """
+        Asyncio version of chat().
+        """
+        mode = self._check_mode(execution_mode)
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._async_semaphore():
+                    started = time.perf_counter()
+                    text, output_tokens = await self._arequest(prompt, model, system_prompt, mode, temperature)
+                    self._record_metrics(model, mode, started, None, time.perf_counter(), output_tokens, False)
+                    return text
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"⚠️ LLM request failed ({type(e).__name__}), retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+
+    def summarize_metrics(self):
+        """
+        Aggregate the recorded calls per backend and model.
+
+        Returns:
+            list: One dict per (backend, model) with call count, mean/p95 latency, mean time to first
+                token and overall tokens per second.
+        """
+        with self._lock:
+            records = list(self.metrics)
+
+        groups = {}
+        for record in records:
+            groups.setdefault((record["backend"], record["model"]), []).append(record)
+
+        summary = []
+        for (backend, model), group in groups.items():
+            latencies = sorted(r["total_seconds"] for r in group)
+            ttfts = [r["ttft_seconds"] for r in group if r["ttft_seconds"] is not None]
+            tokens = sum(r["output_tokens"] or 0 for r in group)
+            summary.append({
+                "backend": backend,
+                "model": model,
+                "calls": len(group),
+                "mean_seconds": round(sum(latencies) / len(latencies), 3),
+                "p95_seconds": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+                "mean_ttft_seconds": round(sum(ttfts) / len(ttfts), 3) if ttfts else None,
+                "tokens_per_second": round(tokens / sum(latencies), 2) if tokens and sum(latencies) > 0 else None,
+            })
+        return summary
+
+    def _detach_clients(self):
+        with self._lock:
+            clients = (self._openai, self._ollama, self._async_openai, self._async_ollama)
+            self._openai = self._ollama = self._async_openai = self._async_ollama = None
+            self._async_semaphores = weakref.WeakKeyDictionary()
+        return clients
+
+    @staticmethod
+    async def _close_async(clients):
+        for client in clients:
+            if client is not None:
+                try:
+                    await client.close()
+                except Exception as e:
+                    # e.g. a client created in an event loop that is closed since
+                    print(f"⚠️ Could not close {type(client).__name__}: {e}")
+
+    def close(self):
+        """
+        Close the pooled connections of every backend client, sync and asyncio.
+
+        Inside a running event loop, use `await aclose()` instead: the asyncio clients can only be
+        closed from a loop, so here they are closed by a task scheduled on the running loop.
+        """
+        openai_client, ollama_client, async_openai, async_ollama = self._detach_clients()
+        for client in (openai_client, ollama_client):
+            if client is not None:
+                client.close()
+        if async_openai is None and async_ollama is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._close_async((async_openai, async_ollama)))
+            return
+        self._closing = loop.create_task(self._close_async((async_openai, async_ollama)))
+
+    async def aclose(self):
+        """
+        Asyncio version of close().
+        """
+        openai_client, ollama_client, async_openai, async_ollama = self._detach_clients()
+        for client in (openai_client, ollama_client):
+            if client is not None:
+                client.close()
+        await self._close_async((async_openai, async_ollama))
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns:
+        LLMClient: The process-wide client shared by all the tools.
+    """
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = LLMClient()
+        return _default_client
+
+
+def configure(**kwargs):
+    """
+    Replace the shared client with one built with the given LLMClient settings.
+
+    Returns:
+        LLMClient: The new shared client.
+    """
+    global _default_client
+    with _default_lock:
+        if _default_client is not None:
+            _default_client.close()
+        _default_client = LLMClient(**kwargs)
+        return _default_client
+
+
+def display_stream(chunks, refresh_seconds=0.2):
+    """
+    Render a streamed answer incrementally as Markdown in Jupyter.
+
+    Args:
+        chunks (iterable): Text chunks (e.g. LLMClient.stream_chat(...)).
+        refresh_seconds (float): Minimum time between two refreshes of the output.
+
+    Returns:
+        str: The full answer.
+    """
+    from IPython.display import Markdown, display
+
+    handle = display(Markdown(""), display_id=True)
+    text = ""
+    last_refresh = 0.0
+    for chunk in chunks:
+        text += chunk
+        now = time.perf_counter()
+        if handle is not None and now - last_refresh >= refresh_seconds:
+            handle.update(Markdown(text))
+            last_refresh = now
+    if handle is not None:
+        handle.update(Markdown(text))
+    return text
+
+
+def report_metrics(client=None):
+    """
+    Print the aggregated latency metrics of the LLM calls made so far.
+    """
+    client = client or get_client()
+    print("⏱️ LLM call metrics:")
+    for row in client.summarize_metrics():
+        print(
+            f"   - {row['backend']}/{row['model']}: {row['calls']} calls, mean {row['mean_seconds']}s, "
+            f"p95 {row['p95_seconds']}s, TTFT {row['mean_ttft_seconds']}s, {row['tokens_per_second']} tokens/s"
+        )
@@ -0,0 +1,17 @@
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+
+def estimate_tokens(text):
+    """
+    Count the tokens of a text (tiktoken when available, ~4 characters per token otherwise).
+
+    Shared by the tools that size prompts (CV batches, transcript chunks).
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
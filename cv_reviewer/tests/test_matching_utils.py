@@ -0,0 +1,73 @@
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.matching_utils import AhoCorasick, KeywordMatcher, is_whole_word
+
+
+def regex_found(text, keywords):
+    # per-keyword search the matcher replaced
+    lowered = text.lower()
+    return [kw for kw in keywords if re.search(rf"\b{re.escape(kw.lower())}\b", lowered)]
+
+
+CVS = [
+    "Built ETL pipelines in Python and SQL Server; tuned MySQL queries.",
+    "Machine learning engineer: PyTorch, machine-learning ops, Spark and Scala.",
+    "Data analyst with Excel, Power BI and some R. No Java.",
+    "JavaScript and TypeScript developer, Go backend, AWS Lambda.",
+    "",
+]
+KEYWORDS = ["python", "SQL", "sql server", "mysql", "machine learning", "Spark", "R", "java", "Go", "aws", "Kubernetes"]
+
+
+@pytest.mark.parametrize("text", CVS)
+def test_same_keywords_as_the_regex_search(text):
+    result = KeywordMatcher(KEYWORDS).match(text)
+
+    assert result["found"] == regex_found(text, KEYWORDS)
+    assert result["not_found"] == [kw for kw in KEYWORDS if kw not in result["found"]]
+
+
+def test_overlapping_keywords_are_all_reported():
+    text = "Tuned SQL Server and MySQL databases with plain SQL."
+    result = KeywordMatcher(["sql", "sql server", "server", "mysql"]).match(text)
+
+    assert result["found"] == ["sql", "sql server", "server", "mysql"]
+    # whole words only: the "sql" inside "MySQL" is not counted
+    assert result["counts"] == {"sql": 2, "sql server": 1, "server": 1, "mysql": 1}
+    assert result["positions"]["sql server"] == [[6, 16, "SQL Server"]]
+
+
+def test_keywords_differing_only_by_case():
+    result = KeywordMatcher(["Go", "GO", "go"]).match("Backend services in go.")
+
+    assert result["found"] == ["Go", "GO", "go"]
+    assert result["percentage"] == 100
+    assert result["counts"] == {"Go": 1, "GO": 1, "go": 1}
+
+
+def test_aliases_count_for_their_keyword():
+    matcher = KeywordMatcher(["Kubernetes", "Python"], aliases={"k8s": "kubernetes", "PYTHON": "python"})
+    result = matcher.match("Deployed on K8s with python scripts.")
+
+    assert result["found"] == ["Kubernetes", "Python"]
+    assert result["counts"] == {"Kubernetes": 1, "Python": 1}
+    with pytest.raises(ValueError):
+        KeywordMatcher(["python"], aliases={"py": "ruby"})
+
+
+def test_automaton_finds_every_occurrence():
+    automaton = AhoCorasick(["he", "she", "his", "hers"])
+    matches = automaton.find_all("ushers")
+
+    assert sorted(matches) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_whole_word_boundaries():
+    assert is_whole_word("c and r", 6, 7)
+    assert not is_whole_word("rust", 0, 1)
+    assert not is_whole_word("go_lang", 0, 2)
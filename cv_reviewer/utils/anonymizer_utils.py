@@ -0,0 +1,266 @@
+import re
+
+from .matching_utils import AhoCorasick
+
+US_STATES = (
+    "AL|AK|AZ|AR|CA|CO|CT|DE|DC|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|"
+    "OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY"
+)
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+URL_PATTERN = re.compile(
+    r"(?:https?://|www\.)[^\s,;]+|\b(?:linkedin|github|gitlab|twitter|x)\.com/[^\s,;]+",
+    re.IGNORECASE,
+)
+PHONE_PATTERN = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,4}\)[\s.-]?)?\d{2,4}(?:[\s.-]?\d{2,4}){1,4}(?!\w)")
+POSTCODE_PATTERNS = (
+    re.compile(rf"(?<=\b(?:{US_STATES})\s)\d{{5}}(?:-\d{{4}})?\b"),  # US ZIP code after a state
+    re.compile(r"\b[A-Z]{1,2}\d[A-Z\d]?\s?\d[A-Z]{2}\b"),  # UK
+    re.compile(r"\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b"),  # Canada
+)
+CITY_STATE_PATTERN = re.compile(rf"\b[A-Z][A-Za-z.'-]+(?:[ \t][A-Z][A-Za-z.'-]+){{0,2}},[ \t]?(?:{US_STATES})\b")
+ADDRESS_PATTERN = re.compile(
+    r"\b\d{1,5}[ \t](?:[A-Z][a-z]+[ \t]){1,3}"
+    r"(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr|Way|Court|Ct|Place|Pl|Square|Sq)\b\.?"
+)
+CAPITALIZED_SEQUENCE_PATTERN = re.compile(r"\b[A-Z][\w'-]*(?:[ \t]+[A-Z][\w'-]*){0,3}\b")
+TRAILING_PLACE_PATTERN = re.compile(r",[ \t]*([A-Z][\w'-]*(?:[ \t][A-Z][\w'-]*){0,2})[ \t]*$", re.MULTILINE)
+
+FIRST_NAMES = (
+    "james", "john", "robert", "michael", "william", "david", "richard", "joseph", "thomas", "charles",
+    "christopher", "daniel", "matthew", "anthony", "donald", "steven", "paul", "andrew", "joshua", "kenneth",
+    "kevin", "brian", "george", "edward", "ronald", "timothy", "jason", "jeffrey", "ryan", "jacob", "gary",
+    "nicholas", "eric", "jonathan", "stephen", "larry", "justin", "scott", "brandon", "benjamin", "samuel",
+    "alan", "alex", "alexander", "peter", "carlos", "juan", "luis", "jose", "manuel", "javier", "pablo",
+    "mary", "patricia", "jennifer", "linda", "elizabeth", "barbara", "susan", "jessica", "sarah", "karen",
+    "nancy", "lisa", "betty", "margaret", "sandra", "ashley", "kimberly", "emily", "donna", "michelle",
+    "carol", "amanda", "melissa", "deborah", "stephanie", "rebecca", "laura", "sharon", "cynthia", "kathleen",
+    "amy", "anna", "emma", "olivia", "sophia", "isabella", "mia", "charlotte", "amelia", "harper", "ella",
+    "maria", "lucia", "elena", "carmen", "sofia", "mark", "will", "grant", "rose", "june",
+)
+SURNAMES = (
+    "smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis", "rodriguez", "martinez",
+    "hernandez", "lopez", "gonzalez", "wilson", "anderson", "thomas", "taylor", "moore", "jackson", "martin",
+    "lee", "perez", "thompson", "white", "harris", "sanchez", "clark", "ramirez", "lewis", "robinson",
+    "walker", "young", "allen", "king", "wright", "scott", "torres", "nguyen", "hill", "flores", "green",
+    "adams", "nelson", "baker", "hall", "rivera", "campbell", "mitchell", "carter", "roberts", "gomez",
+    "phillips", "evans", "turner", "diaz", "parker", "cruz", "edwards", "collins", "reyes", "stewart",
+    "morris", "morales", "murphy", "cook", "rogers", "gutierrez", "ortiz", "morgan", "cooper", "peterson",
+    "bailey", "reed", "kelly", "howard", "ramos", "kim", "cox", "ward", "richardson", "watson", "brooks",
+    "chavez", "wood", "james", "bennett", "gray", "mendoza", "ruiz", "hughes", "price", "alvarez", "castillo",
+    "sanders", "patel", "myers", "long", "ross", "foster", "jimenez",
+)
+LOCATIONS = (
+    "new york", "los angeles", "chicago", "houston", "phoenix", "philadelphia", "san antonio", "san diego",
+    "dallas", "san jose", "austin", "jacksonville", "san francisco", "columbus", "seattle", "denver",
+    "washington", "boston", "nashville", "detroit", "portland", "las vegas", "baltimore", "milwaukee",
+    "atlanta", "miami", "pittsburgh", "minneapolis", "london", "manchester", "birmingham", "glasgow",
+    "dublin", "paris", "berlin", "munich", "hamburg", "madrid", "barcelona", "valencia", "sevilla", "seville",
+    "lisbon", "porto", "rome", "milan", "amsterdam", "rotterdam", "brussels", "zurich", "geneva", "vienna",
+    "prague", "warsaw", "stockholm", "oslo", "copenhagen", "helsinki", "toronto", "vancouver", "montreal",
+    "mexico city", "bogota", "buenos aires", "sao paulo", "lima", "santiago", "sydney", "melbourne",
+    "singapore", "tokyo", "bangalore", "mumbai", "delhi", "united states", "usa", "united kingdom", "uk",
+    "spain", "france", "germany", "italy", "portugal", "ireland", "netherlands", "belgium", "switzerland",
+    "austria", "poland", "sweden", "norway", "denmark", "finland", "canada", "mexico", "colombia",
+    "argentina", "brazil", "peru", "chile", "australia", "india", "china", "japan",
+)
+# names that are also common english words: only trusted next to another name
+AMBIGUOUS_NAMES = {"mark", "will", "grant", "rose", "june", "young", "king", "long", "price", "hill", "green",
+                   "white", "brown", "wood", "gray", "cook", "ward", "reed", "ross", "lee", "scott", "james"}
+# words that are never personal data in a CV header (section titles, job titles...)
+SAFE_WORDS = {
+    "work", "experience", "education", "skills", "projects", "profile", "details", "contact", "summary",
+    "employment", "history", "certifications", "certificates", "languages", "references", "interests",
+    "about", "me", "objective", "resume", "curriculum", "vitae", "cv", "linkedin", "github", "portfolio",
+    "data", "engineer", "engineering", "intern", "internship", "junior", "senior", "lead", "principal",
+    "manager", "developer", "analyst", "scientist", "architect", "consultant", "software", "analytics",
+    "bachelor", "master", "science", "arts", "of", "in", "and", "the", "at", "for", "computer", "university",
+    "b.a.", "b.s.", "m.s.", "phd", "place", "birth", "driving", "license", "licence", "email", "phone",
+}
+
+# one automaton for the whole gazetteer, built once at import
+GAZETTEER = AhoCorasick(
+    {**{name: "name" for name in FIRST_NAMES + SURNAMES}, **{place: "location" for place in LOCATIONS}}
+)
+
+
+def _header_lines(text, max_lines=4):
+    lines = []
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        if line.strip():
+            lines.append((offset, line.rstrip("\r\n")))
+            if len(lines) == max_lines:
+                break
+        offset += len(line)
+    return lines
+
+
+def _is_name_token(token):
+    return token.lower() not in SAFE_WORDS and re.fullmatch(r"[^\W\d_][\w'.-]*", token) is not None
+
+
+def _header_name_tokens(text):
+    """
+    The first non-empty line of a CV is almost always the candidate's name (section titles aside).
+
+    When it holds a single name, two-column layouts often put the surname at the start of the
+    next line ("JANE  WORK EXPERIENCE" / "DOE  Data Engineer"): a following word written the same
+    way (capitalized, or upper case like the first name) is taken as the surname.
+    """
+    header = _header_lines(text, max_lines=2)
+    if not header:
+        return []
+    tokens = [t for t in header[0][1].split() if t.lower() not in SAFE_WORDS]
+    if not 1 <= len(tokens) <= 4 or not all(_is_name_token(t) for t in tokens):
+        return []
+    if len(tokens) == 1 and len(header) > 1:
+        following = header[1][1].split()[:1]
+        if following and _is_name_token(following[0]) and _is_capitalized(following[0]) \
+                and following[0].isupper() == tokens[0].isupper():
+            tokens.append(following[0])
+    return [t.strip(".") for t in tokens if len(t.strip(".")) > 1]
+
+
+def _is_capitalized(word):
+    return word[:1].isupper()
+
+
+def find_entities(text, extra_names=(), extra_locations=()):
+    """
+    Locate personal data in a CV with precompiled patterns and the name/location gazetteer.
+
+    Args:
+        text (str): CV text.
+        extra_names (iterable): Additional names to redact for this text.
+        extra_locations (iterable): Additional locations to redact for this text.
+
+    Returns:
+        dict: "entities" (list of (start, end, label) spans, sorted and non-overlapping) and
+            "uncertain" (list of (start, end) spans that look like names/places but are not confirmed).
+    """
+    spans = []
+
+    for match in EMAIL_PATTERN.finditer(text):
+        spans.append((match.start(), match.end(), "EMAIL"))
+    for match in URL_PATTERN.finditer(text):
+        spans.append((match.start(), match.end(), "URL"))
+    for match in PHONE_PATTERN.finditer(text):
+        if 9 <= sum(c.isdigit() for c in match.group()) <= 15:
+            spans.append((match.start(), match.end(), "PHONE"))
+    for pattern in POSTCODE_PATTERNS:
+        for match in pattern.finditer(text):
+            spans.append((match.start(), match.end(), "POSTCODE"))
+    for match in ADDRESS_PATTERN.finditer(text):
+        spans.append((match.start(), match.end(), "ADDRESS"))
+    for match in CITY_STATE_PATTERN.finditer(text):
+        # "DATA ENGINEER LOS ANGELES, CA": leave the job title out of the location
+        start = match.start()
+        for word in re.findall(r"\S+[ \t]+", match.group()):
+            if word.strip().lower() not in SAFE_WORDS:
+                break
+            start += len(word)
+        spans.append((start, match.end(), "LOCATION"))
+
+    name_tokens = _header_name_tokens(text) + [n for n in extra_names if n]
+    if name_tokens:
+        name_pattern = re.compile(r"\b(?:" + "|".join(re.escape(t) for t in name_tokens) + r")\b", re.IGNORECASE)
+        for match in name_pattern.finditer(text):
+            spans.append((match.start(), match.end(), "NAME"))
+    for location in extra_locations:
+        if location:
+            for match in re.finditer(r"\b" + re.escape(location) + r"\b", text, re.IGNORECASE):
+                spans.append((match.start(), match.end(), "LOCATION"))
+
+    uncertain = []
+    gazetteer_names = []
+    for start, end, label in GAZETTEER.iter_matches(text, whole_words=True):
+        if not _is_capitalized(text[start:end]):
+            continue
+        if label == "location":
+            spans.append((start, end, "LOCATION"))
+        else:
+            gazetteer_names.append((start, end))
+
+    for index, (start, end) in enumerate(gazetteer_names):
+        word = text[start:end].lower()
+        neighbours = gazetteer_names[max(0, index - 1):index] + gazetteer_names[index + 1:index + 2]
+        next_to_name = any(0 < s - end <= 1 or 0 < start - e <= 1 for s, e in neighbours)
+        if word not in AMBIGUOUS_NAMES or next_to_name:
+            spans.append((start, end, "NAME"))
+        else:
+            uncertain.append((start, end))
+
+    entities = merge_spans(spans)
+
+    # capitalized words in the header or a trailing ", Place" may still be names/locations
+    candidates = []
+    for offset, line in _header_lines(text):
+        for match in CAPITALIZED_SEQUENCE_PATTERN.finditer(line):
+            candidates.append((offset + match.start(), offset + match.end()))
+    for match in TRAILING_PLACE_PATTERN.finditer(text):
+        candidates.append((match.start(1), match.end(1)))
+
+    for start, end in candidates:
+        words = text[start:end].split()
+        if all(w.lower() in SAFE_WORDS for w in words):
+            continue
+        if any(s < end and start < e for s, e, _ in entities):
+            continue
+        uncertain.append((start, end))
+
+    return {"entities": entities, "uncertain": sorted(set(uncertain))}
+
+
+def merge_spans(spans):
+    """
+    Keep the longest span when several overlap.
+    """
+    merged = []
+    for start, end, label in sorted(spans, key=lambda s: (s[0], -(s[1] - s[0]))):
+        if merged and start < merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end, merged[-1][2])
+            continue
+        merged.append((start, end, label))
+    return merged
+
+
+def redact(text, spans):
+    """
+    Replace each (start, end, label) span of the text with a [LABEL] placeholder.
+
+    Args:
+        text (str): Original text.
+        spans (list): Sorted, non-overlapping spans.
+
+    Returns:
+        str: The redacted text.
+    """
+    parts = []
+    position = 0
+    for start, end, label in spans:
+        parts.append(text[position:start])
+        parts.append(f"[{label}]")
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def fast_anonymize(text, extra_names=(), extra_locations=()):
+    """
+    Deterministic local anonymization (no LLM call).
+
+    Args:
+        text (str): CV text.
+
+    Returns:
+        dict: "text" (anonymized text), "entities" (redacted spans) and
+            "uncertain" (list of strings the fast path could not classify).
+    """
+    found = find_entities(text, extra_names, extra_locations)
+    return {
+        "text": redact(text, found["entities"]),
+        "entities": found["entities"],
+        "uncertain": [text[start:end] for start, end in found["uncertain"]],
+    }
@@ -0,0 +1,38 @@
+import os
+import sys
+
+# shared modules (common_utils/) live in the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common_utils.token_utils import estimate_tokens
+
+
+def split_batches(items, token_budget, overhead_tokens=0, max_batch_size=None):
+    """
+    Greedily pack items into batches whose prompt fits the token budget.
+
+    Args:
+        items (list): (item_id, text) tuples, in the order they should be packed.
+        token_budget (int): Maximum tokens of a whole batch prompt.
+        overhead_tokens (int): Tokens shared by every batch (instructions, job description...).
+        max_batch_size (int): Maximum items per batch.
+
+    Returns:
+        list: Batches, each one a list of item ids. An item larger than the budget gets its own batch.
+    """
+    batches = []
+    current = []
+    current_tokens = overhead_tokens
+
+    for item_id, text in items:
+        tokens = estimate_tokens(text)
+        full = max_batch_size is not None and len(current) >= max_batch_size
+        if current and (full or current_tokens + tokens > token_budget):
+            batches.append(current)
+            current = []
+            current_tokens = overhead_tokens
+        current.append(item_id)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def text_hash(text):
+    """
+    Returns:
+        str: SHA-256 hex digest of the given text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CVCache:
+    """
+    Persistent content-addressed cache for anonymized CVs and candidate evaluations.
+
+    Entries live in a single SQLite file and are evicted least-recently-used first
+    once the stored values exceed `max_bytes`.
+
+    Args:
+        path (str): SQLite file used to persist the cache.
+        max_bytes (int): Maximum total size of the cached values.
+    """
+
+    def __init__(self, path="cv_cache.sqlite", max_bytes=256 * 1024 * 1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self.connection.commit()
+
+    @staticmethod
+    def anonymized_key(cv_text, model):
+        return "anonymized:" + text_hash(f"{model}\n{text_hash(cv_text)}")
+
+    @staticmethod
+    def evaluation_key(anonymized_text, job_description, model, language, keywords_string):
+        parts = [text_hash(anonymized_text), text_hash(job_description), model, language, keywords_string]
+        return "evaluation:" + text_hash("\n".join(parts))
+
+    def _get(self, key):
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.connection.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.connection.commit()
+            return row[0]
+
+    def _put(self, key, kind, value):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, value, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, value, size, time.time()),
+            )
+            self._evict()
+            self.connection.commit()
+
+    def _evict(self):
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.connection.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+
+    def get_anonymized(self, cv_text, model):
+        """
+        Returns:
+            str: The cached anonymized text for this CV text and model, or None.
+        """
+        return self._get(self.anonymized_key(cv_text, model))
+
+    def put_anonymized(self, cv_text, model, anonymized_text):
+        self._put(self.anonymized_key(cv_text, model), "anonymized", anonymized_text)
+
+    def get_evaluation(self, anonymized_text, job_description, model, language, keywords_string):
+        """
+        Returns:
+            dict: The cached evaluation for this candidate/job/settings combination, or None.
+        """
+        value = self._get(self.evaluation_key(anonymized_text, job_description, model, language, keywords_string))
+        return json.loads(value) if value is not None else None
+
+    def put_evaluation(self, anonymized_text, job_description, model, language, keywords_string, evaluation):
+        key = self.evaluation_key(anonymized_text, job_description, model, language, keywords_string)
+        self._put(key, "evaluation", json.dumps(evaluation))
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute("DELETE FROM entries")
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def report(self):
+        """
+        Print the hit/miss counters of this cache.
+        """
+        print(f"🗃️ Cache {self.path}: {self.hits} hits, {self.misses} misses")
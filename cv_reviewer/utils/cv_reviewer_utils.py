@@ -1,49 +1,267 @@
-import ollama
-from openai import OpenAI
-import httpx
-import pdfplumber
 import requests
 from bs4 import BeautifulSoup
-from dotenv import load_dotenv
 import re
 import os
+import sys
 import json
-
-def evaluate_all_candidates(model, job_description, mandatory_keywords, landing_path, language, execution_mode):
+from functools import partial
+from .pipeline_utils import Pipeline, Stage
+from .cache_utils import CVCache
+from .matching_utils import KeywordMatcher
+from .extraction_utils import extract_document, read_doc, read_docx, read_pdf, report_extractions
+from .anonymizer_utils import fast_anonymize, find_entities, merge_spans, redact
+from .ranking_utils import CandidatePrefilter
+from .batching_utils import split_batches
+from .index_utils import CandidateIndex, job_hash
+
+# shared modules (common_utils/) live in the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common_utils.llm_client import display_stream, get_client
+from common_utils.token_utils import estimate_tokens
+
+ANONYMIZER_MODEL = "llama3.2"
+
+def evaluate_all_candidates(model, job_description, mandatory_keywords, landing_path, language, execution_mode, workers=1, extract_workers=None, cache=None, anonymize_mode="llm", keyword_aliases=None, max_pages=None, page_workers=1, prefilter=None, batch_size=None, batch_token_budget=8000, index=None, job_id=None):
     """
     Process all CVs in the given directory and evaluate them against a job description.
 
+    Files flow through a pipeline (PDF extraction -> anonymization -> evaluation), so the
+    extraction of the next CVs overlaps with the LLM calls of the previous ones.
+
     Args:
         model (str): Model name to be used for evaluation.
         job_description (str): The job description to compare candidates against.
-        mandatory_keywords (list): List of keywords to highlight in evaluation.
+        mandatory_keywords (list): List of keywords to highlight in evaluation (or a KeywordMatcher).
         landing_path (str): Path to the folder containing CV files.
+        workers (int): Maximum concurrent LLM calls per LLM stage (anonymization and evaluation).
+        extract_workers (int): Processes used for text extraction (default: min(workers, CPU count)).
+        cache (CVCache or str): Optional cache (or path of its SQLite file) reusing anonymized CVs
+            and evaluations from previous runs.
+        anonymize_mode (str): "llm", "fast" or "hybrid" (see anonymize_resume).
+        keyword_aliases (dict): Synonyms of the mandatory keywords, e.g. {"k8s": "kubernetes"}.
+        max_pages (int): Page budget per PDF, longer documents are only read up to this page.
+        page_workers (int): Processes used to split the pages of very large PDFs.
+        prefilter (CandidatePrefilter): Optional embedding pre-ranking; only the candidates it selects
+            are sent to the LLM evaluation.
+        batch_size (int): Evaluate up to this many CVs per LLM request (None evaluates them one by one).
+        batch_token_budget (int): Maximum estimated tokens of a batched evaluation prompt.
+        index (CandidateIndex or str): Optional index (or its folder) of the CVs already processed:
+            only new or changed files are extracted and anonymized again, and candidates already
+            evaluated for this job are merged into the ranking without calling the LLM.
+        job_id (str): Key of the evaluations stored in the index (default: hash of the job settings).
 
     Returns:
-        list: A list of JSON strings representing the evaluation results.
+        list: A list of JSON strings representing the evaluation results, in file name order.
     """
-    matches = []
+    filenames = [f for f in sorted(os.listdir(landing_path)) if os.path.isfile(os.path.join(landing_path, f))]
+    paths = [os.path.join(landing_path, f) for f in filenames]
 
-    for filename in os.listdir(landing_path):
-        path = os.path.join(landing_path, filename)
-        
-        if os.path.isfile(path):
-            cv_text = extract_text_from_cv(path)
-            if cv_text is not None:
-                
-                words = cv_text.split()    
-                num_of_words = len(words)
+    if extract_workers is None:
+        extract_workers = min(workers, os.cpu_count() or 1)
 
-                if num_of_words > 5:    
-                    anonymized_desc = anonymize_resume(cv_text)
+    if isinstance(cache, str):
+        cache = CVCache(cache)
+    if isinstance(mandatory_keywords, KeywordMatcher):
+        keyword_matcher = mandatory_keywords
+    else:
+        keyword_matcher = KeywordMatcher(mandatory_keywords, keyword_aliases)
+    anonymizer_model = ANONYMIZER_MODEL if anonymize_mode == "llm" else f"{anonymize_mode}:{ANONYMIZER_MODEL}"
+
+    if isinstance(index, str):
+        index = CandidateIndex(index)
+    if job_id is None:
+        job_id = job_hash(job_description, model, language, keyword_matcher.keywords, keyword_aliases, anonymize_mode)
+
+    # files already evaluated for this job are reused, unchanged ones skip extraction (and anonymization)
+    items = []
+    item_names = []
+    reused = {}
+    if index is not None:
+        index.prune(filenames)
+    for filename, path in zip(filenames, paths):
+        entry = index.lookup(filename, path) if index is not None else None
+        if entry is None:
+            items.append(path)
+            item_names.append(filename)
+            continue
+
+        evaluation = index.get_evaluation(filename, job_id)
+        if evaluation is not None:
+            reused[filename] = evaluation
+            continue
+        if entry["text_path"] is None:
+            # already known to be unreadable
+            continue
+
+        cv_text = index.read_text(entry)
+        if cv_text is None:
+            items.append(path)
+        else:
+            record = {"path": path, "parser": "index", "pages": 0, "seconds": 0.0, "text": cv_text, "error": None}
+            if entry["anonymize_mode"] == anonymize_mode and entry["anonymized"] is not None:
+                record["anonymized"] = entry["anonymized"]
+            items.append(record)
+        item_names.append(filename)
+
+    if index is not None:
+        print(f"🗂️ Index: {len(reused)} candidates already evaluated, {len(items)} files to process")
+
+    extractions = []
+
+    def record(filename, llm_answer):
+        # stored as soon as it is known, and saved periodically, so an interrupted run keeps its work
+        if index is not None:
+            index.set_evaluation(filename, job_id, llm_answer)
+            index.checkpoint()
+
+    def anonymize_stage(extraction):
+        extractions.append(extraction)
+        if "anonymized" in extraction:
+            return extraction["anonymized"]
+
+        cv_text = extraction["text"]
+        anonymized_desc = None
+
+        if cv_text is not None:
+            words = cv_text.split()
+            num_of_words = len(words)
+
+            if num_of_words > 5:
+                if cache is None:
+                    anonymized_desc = anonymize_resume(cv_text, anonymize_mode)
+                else:
+                    anonymized_desc = cache.get_anonymized(cv_text, anonymizer_model)
+                    if anonymized_desc is None:
+                        anonymized_desc = anonymize_resume(cv_text, anonymize_mode)
+                        cache.put_anonymized(cv_text, anonymizer_model, anonymized_desc)
+
+        if index is not None:
+            path = extraction["path"]
+            index.update(os.path.basename(path), path, cv_text, anonymized_desc, anonymize_mode)
+        return anonymized_desc
+
+    def keywords_note(anonymized_desc):
+        keywords_summary, keyword_matches = evaluate_mandatory_keywords(anonymized_desc, keyword_matcher, return_details=True)
+        return "Additional note: " + keywords_summary, keyword_matches
+
+    def evaluate_stage(anonymized_desc):
+        keywords_string, keyword_matches = keywords_note(anonymized_desc)
+
+        if cache is None:
+            llm_answer = evaluate_candidate(model, anonymized_desc, job_description, language, execution_mode, keywords_string)
+        else:
+            llm_answer = cache.get_evaluation(anonymized_desc, job_description, model, language, keywords_string)
+            if llm_answer is None:
+                llm_answer = evaluate_candidate(model, anonymized_desc, job_description, language, execution_mode, keywords_string)
+                cache.put_evaluation(anonymized_desc, job_description, model, language, keywords_string, llm_answer)
+
+        llm_answer['keyword_matches'] = keyword_matches
+        return llm_answer
+
+    def evaluate_batched(descriptions, on_evaluation=None):
+        notes = [keywords_note(desc) for desc in descriptions]
+        evaluations = [None] * len(descriptions)
+
+        pending = []
+        for i, desc in enumerate(descriptions):
+            if cache is not None:
+                evaluations[i] = cache.get_evaluation(desc, job_description, model, language, notes[i][0])
+            if evaluations[i] is None:
+                pending.append(i)
+
+        # stable ids that do not leak the file names to the LLM
+        candidates = {f"C{i + 1:03d}": (descriptions[i], notes[i][0]) for i in pending}
+        overhead = estimate_tokens(build_batch_prompt([], job_description, language))
+        batches = split_batches(
+            [(candidate_id, desc + note) for candidate_id, (desc, note) in candidates.items()],
+            batch_token_budget, overhead, batch_size,
+        )
+
+        def evaluate_batch(batch):
+            return evaluate_candidates_batch(model, [(cid, *candidates[cid]) for cid in batch], job_description, language, execution_mode)
+
+        def store_batch(position, batch_result):
+            for candidate_id, llm_answer in batch_result.items():
+                i = int(candidate_id[1:]) - 1
+                if cache is not None:
+                    cache.put_evaluation(descriptions[i], job_description, model, language, notes[i][0], llm_answer)
+                llm_answer['keyword_matches'] = notes[i][1]
+                evaluations[i] = llm_answer
+                if on_evaluation is not None:
+                    on_evaluation(i, llm_answer)
+
+        pending_set = set(pending)
+        pipeline = Pipeline([Stage("evaluate_batch", evaluate_batch, workers=workers)])
+        pipeline.run(batches, on_result=store_batch)
+        pipeline.report()
+
+        for i, (llm_answer, (_, keyword_matches)) in enumerate(zip(evaluations, notes)):
+            if i not in pending_set:
+                llm_answer['keyword_matches'] = keyword_matches
+                if on_evaluation is not None:
+                    on_evaluation(i, llm_answer)
+        return evaluations
+
+    extract = Stage(
+        "extract", partial(extract_document, max_pages=max_pages, page_workers=page_workers),
+        workers=extract_workers, kind="cpu", skip=lambda item: isinstance(item, dict),
+    )
+    anonymize = Stage("anonymize", anonymize_stage, workers=workers)
+    evaluate = Stage("evaluate", evaluate_stage, workers=workers)
 
-                    keywords_string = "Additional note: " + evaluate_mandatory_keywords(anonymized_desc, mandatory_keywords)
+    if prefilter is None and not batch_size:
+        pipeline = Pipeline([extract, anonymize, evaluate])
+        results = pipeline.run(items, on_result=lambda position, llm_answer: record(item_names[position], llm_answer))
+        pipeline.report()
+    else:
+        # pre-ranking and batching need every anonymized CV, so evaluation becomes a second phase
+        pipeline = Pipeline([extract, anonymize])
+        anonymized = pipeline.run(items)
+        pipeline.report()
+
+        candidates = [i for i, desc in enumerate(anonymized) if desc is not None]
+        scores = None
+        selected = list(range(len(candidates)))
+        if prefilter is not None:
+            selected, scores = prefilter.select(job_description, [anonymized[i] for i in candidates])
+            print(f"🔎 Pre-filter kept {len(selected)} of {len(candidates)} candidates for LLM evaluation")
+
+        def on_evaluation(position, llm_answer):
+            i = selected[position]
+            if scores is not None:
+                llm_answer['similarity'] = round(float(scores[i]), 4)
+            record(item_names[candidates[i]], llm_answer)
+
+        descriptions = [anonymized[candidates[i]] for i in selected]
+        if batch_size:
+            evaluations = evaluate_batched(descriptions, on_evaluation)
+        else:
+            pipeline = Pipeline([evaluate])
+            evaluations = pipeline.run(descriptions, on_result=on_evaluation)
+            pipeline.report()
+
+        results = [None] * len(items)
+        for i, llm_answer in zip(selected, evaluations):
+            results[candidates[i]] = llm_answer
+    report_extractions(extractions)
+    if cache is not None:
+        cache.report()
+
+    evaluated = dict(reused)
+    for filename, llm_answer in zip(item_names, results):
+        if llm_answer is not None:
+            evaluated[filename] = llm_answer
+    if index is not None:
+        index.save()
 
-                    llm_answer = evaluate_candidate(model, anonymized_desc, job_description, language, execution_mode, keywords_string)
-                    llm_answer['name'] = filename
+    matches = []
+    for filename in filenames:
+        llm_answer = evaluated.get(filename)
+        if llm_answer is not None:
+            llm_answer['name'] = filename
 
-                    updated_json_str = json.dumps(llm_answer, indent=2)
-                    matches.append(updated_json_str)
+            updated_json_str = json.dumps(llm_answer, indent=2)
+            matches.append(updated_json_str)
 
     return matches
 
@@ -84,9 +302,13 @@ def render_candidate_evaluations(matches):
 
     return markdown_text
 
-def analyze_candidates(model, job_description, mandatory_keywords, landing_path, language, execution_mode):
-    
-    matches = evaluate_all_candidates(model, job_description, mandatory_keywords, landing_path, language, execution_mode)
+def analyze_candidates(model, job_description, mandatory_keywords, landing_path, language, execution_mode, **kwargs):
+    """
+    Evaluate every CV in `landing_path` and render the ranking as Markdown.
+
+    Extra keyword arguments (workers, extract_workers, cache, anonymize_mode, keyword_aliases, max_pages, page_workers, prefilter, batch_size, index...) are passed to evaluate_all_candidates.
+    """
+    matches = evaluate_all_candidates(model, job_description, mandatory_keywords, landing_path, language, execution_mode, **kwargs)
     evaluation_text = render_candidate_evaluations(matches)
     
     return evaluation_text
@@ -102,7 +324,25 @@ def extract_json(text):
     except Exception as e:
         raise ValueError(f"Error parsing JSON: {e}\nRaw text:\n{text}")
 
-def anonymize_resume(text):
+def anonymize_resume(text, mode="llm"):
+    """
+    Remove personal data (name, surname, email, location, telephone number...) from a CV text.
+
+    Args:
+        text (str): CV text.
+        mode (str): "llm" asks the LLM to anonymize the whole text, "fast" only uses the local
+            deterministic anonymizer, "hybrid" uses the local anonymizer and asks the LLM only
+            about the spans it could not classify.
+
+    Returns:
+        str: The anonymized CV text.
+    """
+    if mode == "fast":
+        return fast_anonymize(text)["text"]
+    elif mode == "hybrid":
+        return hybrid_anonymize(text)
+    elif mode != "llm":
+        raise ValueError("Invalid anonymization mode. Use 'llm', 'fast' or 'hybrid'.")
 
     prompt = f"""
     I want you to anonymize this CV text content and return it without sensible data (name, surname, email, location, telephone number...), DON'T provide notes
@@ -110,98 +350,57 @@ def anonymize_resume(text):
     {text}
     """
     
-    response = ollama.chat(
-        model="llama3.2",
-        messages=[
-            {"role": "system", "content": "you are a CV anonymizer"},
-            {"role": "user", "content": prompt}
-        ]
-    )
-    llm_response = response["message"]["content"]
-    return llm_response
-    
-def call_llama3_ollama(prompt: str, model: str, system_prompt: str) -> str:
-    
-    response = ollama.chat(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ]
-    )
-    llm_response = response["message"]["content"]
+    llm_response = call_llama3_ollama(prompt, ANONYMIZER_MODEL, "you are a CV anonymizer")
     return llm_response
 
-def call_chatgpt_openai(prompt: str, model_name: str, system_prompt: str) -> str:
-    load_dotenv()
-    os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY')
+def hybrid_anonymize(text):
+    """
+    Anonymize a CV locally and only ask the LLM about the spans the local anonymizer is unsure about.
 
-    openai = OpenAI(http_client=httpx.Client(verify=False))
-    
-    response = openai.chat.completions.create(
-        model=model_name,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ],
-        temperature = 0.1
-    )
-    
-    return response.choices[0].message.content
+    Args:
+        text (str): CV text.
 
-# Función para leer el contenido de un archivo .docx
-def read_docx(cv_path):
-    try:
-        # Cargar el documento
-        doc = Document(cv_path)
-        
-        # Leer el contenido del documento
-        contenido = []
-        for parrafo in doc.paragraphs:
-            contenido.append(parrafo.text)
-        
-        return '\n'.join(contenido)
-    except:
-        return None
+    Returns:
+        str: The anonymized CV text.
+    """
+    found = find_entities(text)
+    if not found["uncertain"]:
+        return redact(text, found["entities"])
 
-def read_doc(cv_path):
-    try:
-        # Inicializar la aplicación de Word
-        word = win32com.client.Dispatch("Word.Application")
-        word.Visible = False
-        
-        # Abrir el documento
-        doc = word.Documents.Open(cv_path)
-        
-        # Leer el contenido del documento
-        contenido = doc.Content.Text
-        
-        # Cerrar el documento y la aplicación de Word
-        doc.Close(False)
-        word.Quit()
-        
-        return contenido
-    except:
-        return None
+    candidates = sorted({text[start:end] for start, end in found["uncertain"]})
+    prompt = f"""
+    Which of the following strings taken from a CV are personal names, surnames, addresses or locations?
+    Answer ONLY with a JSON list containing those strings (an empty list if there are none), DON'T provide notes
+
+    {json.dumps(candidates, ensure_ascii=False)}
+    """
+    response = call_llama3_ollama(prompt, ANONYMIZER_MODEL, "you are a CV anonymizer")
 
-def read_pdf(pdf_path):
-    text = ""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text()
-        return text
-    except:
-        return None
+        sensitive = set(json.loads(re.search(r"\[.*\]", response, re.DOTALL).group()))
+    except Exception:
+        # when in doubt, redact every uncertain span
+        sensitive = set(candidates)
 
-def extract_text_from_cv(cv_path):
-    cv_text = read_pdf(cv_path)
-    if cv_text is None:
-        cv_text = read_docx(cv_path)
-        if cv_text is None:
-            cv_text =read_doc(cv_path)
+    spans = found["entities"] + [(start, end, "REDACTED") for start, end in found["uncertain"] if text[start:end] in sensitive]
+    return redact(text, merge_spans(spans))
+    
+def call_llama3_ollama(prompt: str, model: str, system_prompt: str, stream: bool = False) -> str:
+    if stream:
+        return display_stream(get_client().stream_chat(prompt, model, system_prompt, execution_mode="offline"))
+    return get_client().chat(prompt, model, system_prompt, execution_mode="offline")
 
-    return cv_text
+def call_chatgpt_openai(prompt: str, model_name: str, system_prompt: str, stream: bool = False) -> str:
+    if stream:
+        return display_stream(get_client().stream_chat(prompt, model_name, system_prompt, execution_mode="online", temperature=0.1))
+    return get_client().chat(prompt, model_name, system_prompt, execution_mode="online", temperature=0.1)
+
+def extract_text_from_cv(cv_path, max_pages=None):
+    """
+    Returns:
+        str: The text of the CV (PDF, .docx or .doc), or None if it could not be read.
+    """
+    return extract_document(cv_path, max_pages=max_pages)["text"]
 
 
 def get_job_description(url):
@@ -223,7 +422,7 @@ def get_job_description(url):
     else:
         return f"Error: Unable to fetch the page. Status code: {response.status_code}"
 
-def evaluate_candidate(model_source, candidate_desc, job_description, language, execution_mode, keywords_string = ""):
+def evaluate_candidate(model_source, candidate_desc, job_description, language, execution_mode, keywords_string = "", stream=False):
 
     system_prompt = "you are a CV reviewer."
        
@@ -264,11 +463,11 @@ def evaluate_candidate(model_source, candidate_desc, job_description, language,
     
     if execution_mode.lower() == "offline":
         print(f"▶️ Using {model_source} via Ollama...")
-        full_response = call_llama3_ollama(prompt, model_source, system_prompt)
+        full_response = call_llama3_ollama(prompt, model_source, system_prompt, stream)
     
     elif execution_mode.lower() == "online":
         print(f"▶️ Using {model_source} via OpenAI API...")
-        full_response = call_chatgpt_openai(prompt, model_source, system_prompt)
+        full_response = call_chatgpt_openai(prompt, model_source, system_prompt, stream)
     
     else:
         raise ValueError("Invalid execution_mode. Use 'offline' or 'online'.")
@@ -283,35 +482,131 @@ def evaluate_candidate(model_source, candidate_desc, job_description, language,
     result = extract_json(clean_response)
     return result
 
-def evaluate_mandatory_keywords(cv_text, mandatory_keywords):
+def is_valid_evaluation(entry):
+    return isinstance(entry, dict) and isinstance(entry.get("match_percentage"), (int, float))
+
+def extract_json_array(text):
+    try:
+        json_match = re.search(r"\[.*\]", text, re.DOTALL)
+        if json_match:
+            result = json.loads(json_match.group())
+            if isinstance(result, list):
+                return result
+        raise ValueError("No valid JSON array found")
+    except Exception as e:
+        raise ValueError(f"Error parsing JSON: {e}\nRaw text:\n{text}")
+
+def build_batch_prompt(candidates, job_description, language):
+    cv_blocks = "\n\n".join(
+        f"=== CANDIDATE {candidate_id} ===\n{candidate_desc}\n{keywords_string}"
+        for candidate_id, candidate_desc, keywords_string in candidates
+    )
+
+    return f"""
+    Review the following CV descriptions, each one introduced by its candidate id:
+
+    {cv_blocks}
+
+    Evaluate how well EACH candidate matches the following job description:
+    
+    {job_description}
+    
+    You MUST pay attention mostly to the ROLE and the SENIORITY match between what we are looking for and each candidate's seniority, and answer ONLY with a JSON array containing one object per candidate in the following structure:
+    
+    [
+      {{
+        "candidate_id": "the candidate id given above",
+        "name": "Candidate Name",
+        "match_percentage": number between 0 and 100 based on seniority and technologies fit with the job description ,
+        "summary": "A  summary explaining the match, including relevant skills, technologies, and gaps",
+        "recommended_questions" : list about recommended questions, focused on the mandatory keywords note of the candidate (if provided)
+      }}
+    ]
+    
+    ❗️Output STRICTLY as valid JSON with {language} language content. Do NOT include any explanations, extra text, markdown formatting, or comments.
+    """
+
+def evaluate_candidates_batch(model_source, candidates, job_description, language, execution_mode):
+    """
+    Evaluate several anonymized CVs with a single LLM request.
+
+    Candidates whose entry is missing or invalid in the answer are evaluated again one by one.
+
+    Args:
+        model_source (str): Model name to be used for evaluation.
+        candidates (list): (candidate_id, anonymized CV text, keywords_string) tuples.
+        job_description (str): The job description to compare candidates against.
+
+    Returns:
+        dict: Evaluation result per candidate id.
+    """
+    if len(candidates) == 1:
+        candidate_id, candidate_desc, keywords_string = candidates[0]
+        return {candidate_id: evaluate_candidate(model_source, candidate_desc, job_description, language, execution_mode, keywords_string)}
+
+    system_prompt = "you are a CV reviewer."
+    prompt = build_batch_prompt(candidates, job_description, language)
+
+    if execution_mode.lower() == "offline":
+        print(f"▶️ Using {model_source} via Ollama ({len(candidates)} candidates)...")
+        full_response = call_llama3_ollama(prompt, model_source, system_prompt)
+    
+    elif execution_mode.lower() == "online":
+        print(f"▶️ Using {model_source} via OpenAI API ({len(candidates)} candidates)...")
+        full_response = call_chatgpt_openai(prompt, model_source, system_prompt)
+    
+    else:
+        raise ValueError("Invalid execution_mode. Use 'offline' or 'online'.")
+
+    # clean markdown delimiter
+    clean_response = full_response.replace("```json", "").replace("```", "").strip()
+
+    try:
+        entries = extract_json_array(clean_response)
+    except ValueError:
+        entries = []
+
+    results = {}
+    for entry in entries:
+        if is_valid_evaluation(entry) and str(entry.get("candidate_id")) in {c[0] for c in candidates}:
+            results[str(entry.pop("candidate_id"))] = entry
+
+    for candidate_id, candidate_desc, keywords_string in candidates:
+        if candidate_id not in results:
+            print(f"⚠️ No valid evaluation for {candidate_id} in the batch answer, retrying it alone...")
+            results[candidate_id] = evaluate_candidate(model_source, candidate_desc, job_description, language, execution_mode, keywords_string)
+
+    return results
+
+def evaluate_mandatory_keywords(cv_text, mandatory_keywords, return_details=False):
     """
     Evaluates the percentage of mandatory keywords present in the candidate's CV text.
     
     :param cv_text: str, the candidate's CV text
-    :param mandatory_keywords: list of str, mandatory keywords
+    :param mandatory_keywords: list of str (or a KeywordMatcher built once for the job), mandatory keywords
+    :param return_details: bool, also return the structured match (positions and counts per keyword)
     :return: str, summary of the match percentage and details of found/not found keywords
+        (a (summary, details) tuple when return_details is True)
     """
 
-    found = []
-    not_found = []
-    
-    text = cv_text.lower()
-
-    for kw in mandatory_keywords:
-        pattern = re.escape(kw.lower())
-        if re.search(rf"\b{pattern}\b", text):
-            found.append(kw)
-        else:
-            not_found.append(kw)
+    if isinstance(mandatory_keywords, KeywordMatcher):
+        matcher = mandatory_keywords
+    else:
+        matcher = KeywordMatcher(mandatory_keywords)
 
-    total = len(mandatory_keywords)
-    matched = len(found)
-    percentage = round((matched / total) * 100) if total > 0 else 0
+    details = matcher.match(cv_text)
+    found = details["found"]
+    not_found = details["not_found"]
+    percentage = details["percentage"]
 
     found_str = ", ".join(found) if found else "none"
     not_found_str = ", ".join(not_found) if not_found else "none"
 
-    return (
+    summary = (
         f"The candidate accomplishes {percentage}% of the mandatory keywords required: "
         f"{found_str} were found but {not_found_str} {'was' if len(not_found)==1 else 'were'} not found."
     )
+
+    if return_details:
+        return summary, details
+    return summary
@@ -0,0 +1,237 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"  # .docx files are zip containers
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # legacy .doc files
+EXTENSION_TYPES = {".pdf": "pdf", ".docx": "docx", ".doc": "doc"}
+
+
+def detect_file_type(path):
+    """
+    Detect the document type from its magic bytes (falling back to the file extension).
+
+    Args:
+        path (str): Path to the document.
+
+    Returns:
+        str: "pdf", "docx", "doc" or None if the type is unknown.
+    """
+    with open(path, "rb") as f:
+        head = f.read(1024)
+
+    # the PDF header is allowed anywhere in the first 1024 bytes
+    if PDF_MAGIC in head:
+        return "pdf"
+    if head.startswith(ZIP_MAGIC):
+        return "docx"
+    if head.startswith(OLE_MAGIC):
+        return "doc"
+    return EXTENSION_TYPES.get(os.path.splitext(path)[1].lower())
+
+
+def iter_pdf_pages(pdf_path, max_pages=None, first_page=0, last_page=None):
+    """
+    Yield the text of each PDF page, one page at a time.
+
+    Pages are released as soon as they are read, so memory does not grow with the document
+    and callers can stop early.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        max_pages (int): Stop after this many pages.
+        first_page (int): Index of the first page to read.
+        last_page (int): Index after the last page to read.
+
+    Yields:
+        str: Text of the page ("" for pages without text).
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        stop = len(pdf.pages) if last_page is None else min(last_page, len(pdf.pages))
+        if max_pages is not None:
+            stop = min(stop, first_page + max_pages)
+        for index in range(first_page, stop):
+            page = pdf.pages[index]
+            yield page.extract_text() or ""
+            page.close()
+
+
+def count_pdf_pages(pdf_path):
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_page_range(pdf_path, first_page, last_page):
+    """
+    Returns:
+        list: Text of the pages in [first_page, last_page) (used by the page-parallel reader).
+    """
+    return list(iter_pdf_pages(pdf_path, first_page=first_page, last_page=last_page))
+
+
+def read_pdf_parallel(pdf_path, workers, max_pages=None):
+    """
+    Extract a large PDF by splitting its pages across a process pool.
+
+    Args:
+        pdf_path (str): Path to the PDF file.
+        workers (int): Number of processes.
+        max_pages (int): Only read the first `max_pages` pages.
+
+    Returns:
+        list: Text of every page, in page order.
+    """
+    total = count_pdf_pages(pdf_path)
+    if max_pages is not None:
+        total = min(total, max_pages)
+
+    step = max(1, -(-total // workers))
+    ranges = [(start, min(start + step, total)) for start in range(0, total, step)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges) or 1)) as executor:
+        chunks = executor.map(extract_pdf_page_range, *zip(*[(pdf_path, s, e) for s, e in ranges]))
+        return [page for chunk in chunks for page in chunk]
+
+
+def read_pdf(pdf_path, max_pages=None):
+    try:
+        return "\n".join(iter_pdf_pages(pdf_path, max_pages=max_pages))
+    except Exception:
+        return None
+
+
+def _parse_docx(cv_path):
+    from docx import Document
+
+    # Cargar el documento
+    doc = Document(cv_path)
+
+    # Leer el contenido del documento
+    contenido = []
+    for parrafo in doc.paragraphs:
+        contenido.append(parrafo.text)
+
+    return '\n'.join(contenido)
+
+
+def _parse_doc(cv_path):
+    # Word automation is only available on Windows
+    import win32com.client
+
+    # Inicializar la aplicación de Word
+    word = win32com.client.Dispatch("Word.Application")
+    word.Visible = False
+
+    # Abrir el documento
+    doc = word.Documents.Open(os.path.abspath(cv_path))
+
+    # Leer el contenido del documento
+    contenido = doc.Content.Text
+
+    # Cerrar el documento y la aplicación de Word
+    doc.Close(False)
+    word.Quit()
+
+    return contenido
+
+
+# Función para leer el contenido de un archivo .docx
+def read_docx(cv_path):
+    try:
+        return _parse_docx(cv_path)
+    except Exception:
+        return None
+
+
+def read_doc(cv_path):
+    try:
+        return _parse_doc(cv_path)
+    except Exception:
+        return None
+
+
+def _parse(parser, path, max_pages, page_workers, parallel_threshold):
+    """
+    Returns:
+        tuple: (text, PDF pages read). Parse errors are raised.
+    """
+    if parser == "pdf":
+        if page_workers > 1 and count_pdf_pages(path) > parallel_threshold:
+            page_texts = read_pdf_parallel(path, page_workers, max_pages)
+        else:
+            page_texts = list(iter_pdf_pages(path, max_pages=max_pages))
+        return "\n".join(page_texts), len(page_texts)
+    if parser == "docx":
+        return _parse_docx(path), 0
+    return _parse_doc(path), 0
+
+
+def extract_document(path, max_pages=None, page_workers=1, parallel_threshold=40):
+    """
+    Extract the text of a CV, choosing the parser from the file magic bytes.
+
+    Only files whose type cannot be detected go through the chain of parsers (PDF, .docx, .doc);
+    a detected file is parsed by its own parser only, and its error is reported.
+
+    Args:
+        path (str): Path to the document.
+        max_pages (int): Page budget for PDFs, extraction stops once it is reached.
+        page_workers (int): Processes used for PDFs with more than `parallel_threshold` pages.
+        parallel_threshold (int): Minimum number of pages before extracting in parallel.
+
+    Returns:
+        dict: "path", "parser" (the parser that produced the text, None if all failed),
+            "pages" (PDF pages read), "seconds" (parse time), "text" (None if extraction failed)
+            and "error" (error of the detected parser, or of the last one tried, None on success).
+    """
+    start = time.perf_counter()
+    detected = detect_file_type(path)
+    chain = [detected] if detected else ["pdf", "docx", "doc"]
+
+    text = None
+    parser = None
+    pages = 0
+    error = None
+    for candidate in chain:
+        try:
+            text, pages = _parse(candidate, path, max_pages, page_workers, parallel_threshold)
+        except Exception as e:
+            error = f"{candidate}: {type(e).__name__}: {e}"
+            continue
+        parser = candidate
+        error = None
+        break
+
+    return {
+        "path": path,
+        "parser": parser,
+        "pages": pages,
+        "seconds": round(time.perf_counter() - start, 4),
+        "text": text,
+        "error": error,
+    }
+
+
+def report_extractions(records):
+    """
+    Print how many files each parser handled and the slowest files.
+
+    Args:
+        records (list): Dicts returned by extract_document.
+    """
+    if not records:
+        return
+    parsers = {}
+    for record in records:
+        parsers[record["parser"]] = parsers.get(record["parser"], 0) + 1
+    total = sum(record["seconds"] for record in records)
+
+    print(f"📄 Extracted {len(records)} files in {total:.2f}s of parse time: "
+          + ", ".join(f"{parser or 'failed'}={count}" for parser, count in parsers.items()))
+    for record in sorted(records, key=lambda r: r["seconds"], reverse=True)[:3]:
+        print(f"   - {os.path.basename(record['path'])}: {record['parser']}, {record['pages']} pages, {record['seconds']}s")
+    for record in records:
+        if record.get("error"):
+            print(f"   ❌ {os.path.basename(record['path'])}: {record['error']}")
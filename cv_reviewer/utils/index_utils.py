@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def file_hash(path, block_size=1024 * 1024):
+    """
+    Returns:
+        str: SHA-256 hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def job_hash(*parts):
+    """
+    Returns:
+        str: Short stable id for a job (job description, model, language, keywords...).
+    """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+class CandidateIndex:
+    """
+    Manifest of the CVs already processed in a landing folder.
+
+    For every file it keeps the path, mtime, size, content hash, where its extracted text is stored,
+    the anonymized text and the last evaluation per job id, so reruns only process new or changed files.
+
+    Args:
+        directory (str): Folder holding the manifest (index.json) and the extracted texts.
+        checkpoint_seconds (float): Minimum time between two saves by checkpoint().
+    """
+
+    def __init__(self, directory, checkpoint_seconds=30):
+        self.directory = directory
+        self.checkpoint_seconds = checkpoint_seconds
+        self.manifest_path = os.path.join(directory, "index.json")
+        self.texts_dir = os.path.join(directory, "texts")
+        self.lock = threading.Lock()
+        self.saved_at = time.monotonic()
+        os.makedirs(self.texts_dir, exist_ok=True)
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        else:
+            self.entries = {}
+
+    def lookup(self, filename, path):
+        """
+        Returns:
+            dict: The index entry of the file if its content did not change since it was indexed, else None.
+        """
+        entry = self.entries.get(filename)
+        if entry is None:
+            return None
+
+        stat = os.stat(path)
+        if entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            return entry
+        if entry["size"] == stat.st_size and entry["content_hash"] == file_hash(path):
+            # touched but not modified
+            with self.lock:
+                entry["mtime"] = stat.st_mtime
+            return entry
+        return None
+
+    def read_text(self, entry):
+        """
+        Returns:
+            str: The extracted text stored for this entry, or None.
+        """
+        if not entry.get("text_path") or not os.path.exists(entry["text_path"]):
+            return None
+        with open(entry["text_path"], "r", encoding="utf-8") as f:
+            return f.read()
+
+    def update(self, filename, path, text, anonymized, anonymize_mode):
+        """
+        Record the extraction and anonymization of a (new or changed) file. Its evaluations are kept
+        when the content is the same as the one indexed (e.g. only the anonymization changed, which is
+        part of the job id), and dropped when the content changed.
+        """
+        stat = os.stat(path)
+        content_hash = file_hash(path)
+
+        text_path = None
+        if text is not None:
+            text_path = os.path.join(self.texts_dir, f"{content_hash}.txt")
+            with open(text_path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        with self.lock:
+            previous = self.entries.get(filename)
+            evaluations = previous["evaluations"] if previous and previous["content_hash"] == content_hash else {}
+            self.entries[filename] = {
+                "path": path,
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "content_hash": content_hash,
+                "text_path": text_path,
+                "anonymized": anonymized,
+                "anonymize_mode": anonymize_mode,
+                "evaluations": evaluations,
+            }
+            if previous and previous.get("text_path") != text_path:
+                # the raw text of the old content is personal data nothing needs anymore
+                self._remove_text(previous.get("text_path"))
+
+    def get_evaluation(self, filename, job_id):
+        entry = self.entries.get(filename)
+        return entry["evaluations"].get(job_id) if entry else None
+
+    def set_evaluation(self, filename, job_id, evaluation):
+        with self.lock:
+            self.entries[filename]["evaluations"][job_id] = evaluation
+
+    def prune(self, filenames):
+        """
+        Forget the files that are no longer in the landing folder, and delete their extracted texts.
+        """
+        keep = set(filenames)
+        with self.lock:
+            for filename in [f for f in self.entries if f not in keep]:
+                self._remove_text(self.entries.pop(filename).get("text_path"))
+
+    def _remove_text(self, text_path):
+        # texts are stored per content hash: keep the file while another entry has the same content
+        if not text_path or any(entry.get("text_path") == text_path for entry in self.entries.values()):
+            return
+        try:
+            os.remove(text_path)
+        except FileNotFoundError:
+            pass
+
+    def checkpoint(self):
+        """
+        Save the manifest if the last save is older than `checkpoint_seconds`, so an interrupted run
+        keeps most of its work without rewriting the whole manifest after every candidate.
+        """
+        if time.monotonic() - self.saved_at >= self.checkpoint_seconds:
+            self.save()
+
+    def save(self):
+        with self.lock:
+            self.saved_at = time.monotonic()
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
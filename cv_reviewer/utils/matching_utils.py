@@ -0,0 +1,186 @@
+from collections import deque
+
+
+def is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def is_whole_word(text, start, end):
+    """
+    Check that text[start:end] is delimited like a regex \\b...\\b match.
+
+    Args:
+        text (str): Full text.
+        start (int): Start index of the match.
+        end (int): End index (exclusive) of the match.
+
+    Returns:
+        bool: True if there is a word boundary at both ends of the match.
+    """
+    if start >= end:
+        return False
+    before = start > 0 and is_word_char(text[start - 1])
+    after = end < len(text) and is_word_char(text[end])
+    return before != is_word_char(text[start]) and after != is_word_char(text[end - 1])
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton: finds every occurrence of a set of patterns in a single pass over the text.
+
+    Args:
+        patterns (dict or iterable): Patterns to search. A dict maps each pattern to the value
+            reported when it matches; otherwise the pattern itself is reported.
+        case_sensitive (bool): When False (default) patterns and text are compared in lower case.
+    """
+
+    def __init__(self, patterns=(), case_sensitive=False):
+        self.case_sensitive = case_sensitive
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.built = False
+
+        items = patterns.items() if isinstance(patterns, dict) else ((p, p) for p in patterns)
+        for pattern, value in items:
+            self.add(pattern, value)
+        self.build()
+
+    def add(self, pattern, value=None):
+        """
+        Add a pattern to the automaton (build() must be called again before searching).
+        """
+        if not pattern:
+            return
+        key = pattern if self.case_sensitive else pattern.lower()
+        state = 0
+        for char in key:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(key), pattern if value is None else value))
+        self.built = False
+
+    def build(self):
+        """
+        Compute the failure links (breadth first) so the automaton can be searched.
+        """
+        queue = deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+        self.built = True
+
+    def iter_matches(self, text, whole_words=False):
+        """
+        Yield every pattern occurrence in the text.
+
+        Args:
+            text (str): Text to scan.
+            whole_words (bool): Only report matches delimited by word boundaries.
+
+        Yields:
+            tuple: (start, end, value) for each match, ordered by end position.
+        """
+        if not self.built:
+            self.build()
+
+        haystack = text if self.case_sensitive else text.lower()
+        if len(haystack) != len(text):
+            # some characters change length when lower-cased, keep indexes aligned with the original text
+            haystack = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for index, char in enumerate(haystack):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = index + 1
+                for length, value in output[state]:
+                    start = end - length
+                    if not whole_words or is_whole_word(text, start, end):
+                        yield start, end, value
+
+    def find_all(self, text, whole_words=False):
+        """
+        Returns:
+            list: All (start, end, value) matches in the text.
+        """
+        return list(self.iter_matches(text, whole_words))
+
+
+class KeywordMatcher:
+    """
+    Finds a fixed set of keywords (and their aliases) in a single scan of a text.
+
+    Build it once per job and reuse it for every CV.
+
+    Args:
+        keywords (list): Mandatory keywords.
+        aliases (dict): Alternative spellings mapped to the keyword they stand for, e.g. {"k8s": "kubernetes"}.
+    """
+
+    def __init__(self, keywords, aliases=None):
+        self.keywords = list(keywords)
+        # keywords differing only by case ("Go" and "GO") share one pattern and are all reported
+        canonical = {}
+        for kw in self.keywords:
+            canonical.setdefault(kw.lower(), [])
+            if kw not in canonical[kw.lower()]:
+                canonical[kw.lower()].append(kw)
+
+        patterns = {pattern: list(kws) for pattern, kws in canonical.items()}
+        for alias, keyword in (aliases or {}).items():
+            if keyword.lower() not in canonical:
+                raise ValueError(f"Alias '{alias}' points to unknown keyword '{keyword}'")
+            targets = patterns.setdefault(alias.lower(), [])
+            targets.extend(kw for kw in canonical[keyword.lower()] if kw not in targets)
+
+        self.automaton = AhoCorasick(patterns)
+
+    def match(self, text):
+        """
+        Find every keyword occurrence in the text (whole words, case insensitive).
+
+        Args:
+            text (str): Text to scan.
+
+        Returns:
+            dict: "found" and "not_found" keyword lists, "percentage" of keywords found,
+                "counts" (occurrences per keyword) and "positions" ([start, end, matched text] per keyword).
+        """
+        positions = {}
+        for start, end, keywords in self.automaton.iter_matches(text, whole_words=True):
+            for keyword in keywords:
+                positions.setdefault(keyword, []).append([start, end, text[start:end]])
+
+        found = [kw for kw in self.keywords if kw in positions]
+        not_found = [kw for kw in self.keywords if kw not in positions]
+        total = len(self.keywords)
+
+        return {
+            "found": found,
+            "not_found": not_found,
+            "percentage": round((len(found) / total) * 100) if total > 0 else 0,
+            "counts": {kw: len(positions.get(kw, [])) for kw in self.keywords},
+            "positions": positions,
+        }
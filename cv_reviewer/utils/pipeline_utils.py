@@ -0,0 +1,148 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class Stage:
+    """
+    One step of a Pipeline.
+
+    Args:
+        name (str): Name used in the throughput report.
+        func (callable): Function applied to the output of the previous stage.
+            Returning None drops the item from the rest of the pipeline.
+        workers (int): Maximum number of items processed by this stage at the same time.
+        kind (str): "io" runs the stage in threads (LLM calls, network...),
+            "cpu" runs it in a process pool (func must be picklable, i.e. a module level function).
+        skip (callable): Optional predicate, items for which it returns True bypass this stage unchanged.
+    """
+
+    def __init__(self, name, func, workers=1, kind="io", skip=None):
+        if kind not in ("io", "cpu"):
+            raise ValueError("Invalid stage kind. Use 'io' or 'cpu'.")
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.kind = kind
+        self.skip = skip
+        self.semaphore = threading.BoundedSemaphore(self.workers)
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.count = 0
+        self.dropped = 0
+        self.busy_seconds = 0.0
+        self.first_start = None
+        self.last_end = None
+
+    def record(self, start, end, dropped):
+        with self.lock:
+            self.count += 1
+            if dropped:
+                self.dropped += 1
+            self.busy_seconds += end - start
+            self.first_start = start if self.first_start is None else min(self.first_start, start)
+            self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+    def stats(self):
+        """
+        Returns:
+            dict: items processed, dropped items, wall/busy seconds and items per second for this stage.
+        """
+        wall = (self.last_end - self.first_start) if self.count else 0.0
+        return {
+            "stage": self.name,
+            "items": self.count,
+            "dropped": self.dropped,
+            "wall_seconds": round(wall, 3),
+            "busy_seconds": round(self.busy_seconds, 3),
+            "items_per_second": round(self.count / wall, 3) if wall > 0 else None,
+        }
+
+
+class Pipeline:
+    """
+    Runs every item through a chain of stages, overlapping the stages between items.
+
+    CPU stages share a process pool, IO stages run in threads bounded by their own
+    worker count, so a slow LLM stage never blocks the extraction of the next files.
+    Results are always returned in the same order as the input items.
+    """
+
+    def __init__(self, stages):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.stages = stages
+        self.wall_seconds = 0.0
+
+    def _run_item(self, item, process_pool, position=None, on_result=None):
+        value = item
+        for stage in self.stages:
+            if stage.skip is not None and stage.skip(value):
+                continue
+            with stage.semaphore:
+                start = time.perf_counter()
+                if stage.kind == "cpu":
+                    value = process_pool.submit(stage.func, value).result()
+                else:
+                    value = stage.func(value)
+                stage.record(start, time.perf_counter(), value is None)
+            if value is None:
+                return None
+        if on_result is not None:
+            on_result(position, value)
+        return value
+
+    def run(self, items, on_result=None):
+        """
+        Process all items through the pipeline.
+
+        Args:
+            items (list): Inputs of the first stage.
+            on_result (callable): on_result(position, value), called from a worker thread as soon as an
+                item leaves the last stage (not for dropped items), e.g. to save progress.
+
+        Returns:
+            list: Output of the last stage for every item (None for dropped items), in input order.
+        """
+        items = list(items)
+        for stage in self.stages:
+            stage.reset_stats()
+
+        cpu_workers = sum(stage.workers for stage in self.stages if stage.kind == "cpu")
+        # enough driver threads to keep every stage busy at the same time
+        driver_workers = max(1, min(len(items), sum(stage.workers for stage in self.stages)))
+
+        start = time.perf_counter()
+        process_pool = ProcessPoolExecutor(max_workers=cpu_workers) if cpu_workers else None
+        try:
+            with ThreadPoolExecutor(max_workers=driver_workers) as executor:
+                futures = [executor.submit(self._run_item, item, process_pool, position, on_result)
+                           for position, item in enumerate(items)]
+                results = [future.result() for future in futures]
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown(cancel_futures=True)
+        self.wall_seconds = time.perf_counter() - start
+
+        return results
+
+    def stats(self):
+        """
+        Returns:
+            list: One stats dict per stage (see Stage.stats).
+        """
+        return [stage.stats() for stage in self.stages]
+
+    def report(self):
+        """
+        Print the per-stage throughput of the last run.
+        """
+        print(f"📈 Pipeline throughput (total {self.wall_seconds:.2f}s):")
+        for stats in self.stats():
+            rate = f"{stats['items_per_second']} items/s" if stats["items_per_second"] else "n/a"
+            print(
+                f"   - {stats['stage']}: {stats['items']} items ({stats['dropped']} dropped) "
+                f"in {stats['wall_seconds']}s, {rate}, busy {stats['busy_seconds']}s"
+            )
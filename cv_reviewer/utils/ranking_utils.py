@@ -0,0 +1,162 @@
+import os
+import sys
+
+import numpy as np
+
+from .cache_utils import text_hash
+
+# shared modules (common_utils/) live in the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common_utils.llm_client import get_client
+
+DEFAULT_EMBEDDING_MODELS = {
+    "ollama": "nomic-embed-text",
+    "sentence-transformers": "all-MiniLM-L6-v2",
+}
+
+# sentence-transformers models are loaded once per process
+_SENTENCE_MODELS = {}
+
+
+def embed_texts(texts, backend="ollama", model=None):
+    """
+    Embed texts with a local model.
+
+    Args:
+        texts (list): Texts to embed.
+        backend (str): "ollama" (local Ollama server, through the shared LLM client) or
+            "sentence-transformers" (small CPU model).
+        model (str): Embedding model name (default depends on the backend).
+
+    Returns:
+        np.ndarray: One row per text.
+    """
+    model = model or DEFAULT_EMBEDDING_MODELS[backend]
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    if backend == "ollama":
+        return np.asarray(get_client().embed(texts, model), dtype=np.float32)
+
+    elif backend == "sentence-transformers":
+        if model not in _SENTENCE_MODELS:
+            from sentence_transformers import SentenceTransformer
+
+            _SENTENCE_MODELS[model] = SentenceTransformer(model, device="cpu")
+        return np.asarray(_SENTENCE_MODELS[model].encode(list(texts)), dtype=np.float32)
+
+    else:
+        raise ValueError("Invalid embedding backend. Use 'ollama' or 'sentence-transformers'.")
+
+
+def cosine_similarity(query, matrix):
+    """
+    Returns:
+        np.ndarray: Cosine similarity between the query vector and every row of the matrix.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    return (matrix @ query) / np.where(norms == 0, 1, norms)
+
+
+class EmbeddingStore:
+    """
+    Embeddings persisted in a .npz file, keyed by the hash of the embedded text.
+
+    Args:
+        path (str): .npz file (None keeps the store in memory only).
+        backend (str): Embedding backend (see embed_texts).
+        model (str): Embedding model name.
+    """
+
+    def __init__(self, path=None, backend="ollama", model=None):
+        self.path = path
+        self.backend = backend
+        self.model = model or DEFAULT_EMBEDDING_MODELS[backend]
+        self.vectors = {}
+
+        if path and os.path.exists(path):
+            data = np.load(path, allow_pickle=False)
+            if str(data["model"]) == f"{self.backend}:{self.model}":
+                self.vectors = dict(zip(data["keys"].tolist(), data["vectors"]))
+
+    def embed(self, texts):
+        """
+        Embed the texts, only computing vectors for texts not already in the store.
+
+        Returns:
+            np.ndarray: One row per text.
+        """
+        keys = [text_hash(text) for text in texts]
+        missing = {key: text for key, text in zip(keys, texts) if key not in self.vectors}
+        if missing:
+            vectors = embed_texts(list(missing.values()), self.backend, self.model)
+            self.vectors.update(zip(missing.keys(), vectors))
+            self.save()
+        return np.vstack([self.vectors[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        keys = list(self.vectors.keys())
+        np.savez(
+            self.path,
+            model=np.array(f"{self.backend}:{self.model}"),
+            keys=np.array(keys),
+            vectors=np.vstack([self.vectors[key] for key in keys]),
+        )
+
+
+class CandidatePrefilter:
+    """
+    Cheap embedding similarity pre-ranking, so only promising CVs reach the LLM evaluation.
+
+    Args:
+        top_k (int): Keep at most this many candidates.
+        min_similarity (float): Drop candidates whose cosine similarity with the job is below this value.
+        backend (str): Embedding backend (see embed_texts).
+        model (str): Embedding model name.
+        store_path (str): .npz file persisting the embeddings between runs.
+    """
+
+    def __init__(self, top_k=None, min_similarity=None, backend="ollama", model=None, store_path=None):
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self.store = EmbeddingStore(store_path, backend, model)
+
+    def score(self, job_description, documents):
+        """
+        Returns:
+            np.ndarray: Cosine similarity between the job description and every document.
+        """
+        if not documents:
+            return np.zeros(0, dtype=np.float32)
+        vectors = self.store.embed([job_description] + list(documents))
+        return cosine_similarity(vectors[0], vectors[1:])
+
+    def select(self, job_description, documents):
+        """
+        Pick the documents worth an LLM evaluation.
+
+        Args:
+            job_description (str): The job description.
+            documents (list): Anonymized CV texts.
+
+        Returns:
+            tuple: (indexes of the selected documents in input order, similarity scores of all documents).
+        """
+        scores = self.score(job_description, documents)
+        keep = np.ones(len(scores), dtype=bool)
+
+        if self.min_similarity is not None:
+            keep &= scores >= self.min_similarity
+        if self.top_k is not None and keep.sum() > self.top_k:
+            ranked = np.argsort(-np.where(keep, scores, -np.inf), kind="stable")
+            keep[:] = False
+            keep[ranked[:self.top_k]] = True
+
+        return np.flatnonzero(keep).tolist(), scores
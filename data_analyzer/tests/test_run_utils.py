@@ -0,0 +1,232 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils import run_utils
+from utils.run_utils import RunError, RunWaiter
+
+
+class FakeClock:
+    """time.monotonic / time.sleep replacement: sleeping advances the clock instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_run(status, run_id="run_1", **fields):
+    return SimpleNamespace(**{"id": run_id, "status": status, "last_error": None, "incomplete_details": None, **fields})
+
+
+class FakeStream:
+    def __init__(self, events, clock, error=None):
+        self.events = events
+        self.clock = clock
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        for seconds, name, run in self.events:
+            self.clock.now += seconds
+            yield SimpleNamespace(event=name, data=run)
+        if self.error is not None:
+            raise self.error
+
+
+class FakeRuns:
+    """
+    beta.threads.runs stand-in. `timeline` is a list of (seconds, status): the status the run has
+    once that many seconds have passed since it was created.
+    """
+
+    def __init__(self, clock, timeline, stream_events=None, stream_error=None):
+        self.clock = clock
+        self.timeline = timeline
+        self.stream_events = stream_events
+        self.stream_error = stream_error
+        self.created_at = None
+        self.retrieves = 0
+        self.cancelled = []
+
+    def status(self):
+        elapsed = self.clock.now - self.created_at
+        current = self.timeline[0][1]
+        for seconds, status in self.timeline:
+            if elapsed >= seconds:
+                current = status
+        return current
+
+    def create(self, thread_id, assistant_id, **options):
+        self.created_at = self.clock.now
+        return make_run(self.status())
+
+    def retrieve(self, thread_id, run_id):
+        self.retrieves += 1
+        return make_run(self.status(), run_id)
+
+    def cancel(self, run_id, thread_id):
+        self.cancelled.append(run_id)
+        return make_run("cancelling", run_id)
+
+
+class FakeStreamingRuns(FakeRuns):
+    def stream(self, thread_id, assistant_id, timeout=None, **options):
+        self.created_at = self.clock.now
+        return FakeStream(self.stream_events, self.clock, self.stream_error)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(run_utils, "time", clock)
+    return clock
+
+
+def make_waiter(runs, **options):
+    openai = SimpleNamespace(beta=SimpleNamespace(threads=SimpleNamespace(runs=runs)))
+    return RunWaiter(openai, **options)
+
+
+def test_polling_completed_with_backoff_and_timings(clock):
+    runs = FakeRuns(clock, [(0, "queued"), (2, "in_progress"), (10, "completed")])
+    progress = []
+    waiter = make_waiter(runs, initial_interval=0.5, max_interval=4, on_progress=lambda status, elapsed, run: progress.append(status))
+
+    run = waiter.run("thread_1", "asst_1")
+
+    assert run.status == "completed"
+    assert progress == ["queued", "in_progress", "completed"]
+    # client-side times: the change to in_progress is seen at the poll of t=3.5, completed at t=11
+    assert waiter.queued_seconds == pytest.approx(3.5)
+    assert waiter.running_seconds == pytest.approx(7.5)
+    # intervals double while the status does not change, reset on a change, and are capped
+    assert clock.sleeps == [0.5, 1.0, 2.0, 0.5, 1.0, 2.0, 4.0]
+    assert runs.retrieves < 10
+
+
+@pytest.mark.parametrize("status", ["failed", "expired", "cancelled", "incomplete"])
+def test_polling_terminal_failures_raise(clock, status):
+    runs = FakeRuns(clock, [(0, "queued"), (1, "in_progress"), (3, status)])
+    waiter = make_waiter(runs)
+
+    with pytest.raises(RunError) as error:
+        waiter.run("thread_1", "asst_1")
+
+    assert error.value.status == status
+    assert runs.cancelled == []
+
+
+def test_failed_run_reports_the_server_error(clock):
+    runs = FakeRuns(clock, [(0, "queued")])
+    runs.retrieve = lambda thread_id, run_id: make_run("failed", last_error=SimpleNamespace(message="rate limit"))
+    waiter = make_waiter(runs)
+
+    with pytest.raises(RunError, match="rate limit"):
+        waiter.run("thread_1", "asst_1")
+
+
+def test_requires_action_cancels_the_run(clock):
+    runs = FakeRuns(clock, [(0, "queued"), (1, "requires_action")])
+    waiter = make_waiter(runs)
+
+    with pytest.raises(RunError) as error:
+        waiter.run("thread_1", "asst_1")
+
+    assert error.value.status == "requires_action"
+    assert runs.cancelled == ["run_1"]
+
+
+def test_deadline_cancels_the_run(clock):
+    runs = FakeRuns(clock, [(0, "queued"), (1, "in_progress")])
+    waiter = make_waiter(runs, deadline_seconds=30, max_interval=8)
+
+    with pytest.raises(RunError) as error:
+        waiter.run("thread_1", "asst_1")
+
+    assert error.value.status == "timeout"
+    assert runs.cancelled == ["run_1"]
+    assert clock.now == pytest.approx(30)
+    assert waiter.queued_seconds + waiter.running_seconds == pytest.approx(30)
+
+
+def test_streaming_completed_without_polling(clock):
+    events = [
+        (0, "thread.run.created", make_run("queued")),
+        (0, "thread.run.queued", make_run("queued")),
+        (1.5, "thread.run.in_progress", make_run("in_progress")),
+        (0.5, "thread.run.step.created", make_run("in_progress")),
+        (3, "thread.run.completed", make_run("completed")),
+    ]
+    runs = FakeStreamingRuns(clock, [(0, "queued")], stream_events=events)
+    waiter = make_waiter(runs)
+
+    run = waiter.run("thread_1", "asst_1")
+
+    assert run.status == "completed"
+    assert waiter.streamed and waiter.polls == 0
+    assert waiter.queued_seconds == pytest.approx(1.5)
+    assert waiter.running_seconds == pytest.approx(3.5)
+
+
+def test_streaming_requires_action_cancels_the_run(clock):
+    events = [
+        (0, "thread.run.created", make_run("queued")),
+        (1, "thread.run.requires_action", make_run("requires_action")),
+    ]
+    runs = FakeStreamingRuns(clock, [(0, "queued")], stream_events=events)
+    waiter = make_waiter(runs)
+
+    with pytest.raises(RunError):
+        waiter.run("thread_1", "asst_1")
+
+    assert runs.cancelled == ["run_1"]
+
+
+def test_interrupted_stream_falls_back_to_polling(clock):
+    events = [
+        (0, "thread.run.created", make_run("queued")),
+        (1, "thread.run.in_progress", make_run("in_progress")),
+    ]
+    runs = FakeStreamingRuns(
+        clock, [(0, "queued"), (1, "in_progress"), (6, "completed")],
+        stream_events=events, stream_error=ConnectionError("connection reset"),
+    )
+    waiter = make_waiter(runs)
+
+    run = waiter.run("thread_1", "asst_1")
+
+    assert run.status == "completed"
+    assert waiter.polls > 0
+    assert waiter.queued_seconds == pytest.approx(1)
+
+
+def test_stream_ended_before_a_final_status_falls_back_to_polling(clock):
+    events = [(0, "thread.run.created", make_run("queued"))]
+    runs = FakeStreamingRuns(clock, [(0, "queued"), (2, "completed")], stream_events=events)
+    waiter = make_waiter(runs)
+
+    assert waiter.run("thread_1", "asst_1").status == "completed"
+    assert waiter.polls > 0
+
+
+def test_streaming_disabled_polls(clock):
+    runs = FakeStreamingRuns(clock, [(0, "queued"), (1, "completed")], stream_events=[])
+    waiter = make_waiter(runs, use_streaming=False)
+
+    assert waiter.run("thread_1", "asst_1").status == "completed"
+    assert not waiter.streamed and waiter.polls > 0
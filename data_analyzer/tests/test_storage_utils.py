@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.storage_utils import DatasetWriter, dataset_path, read_dataset
+
+
+def write_chunks(path, fmt, chunks):
+    with DatasetWriter(path, fmt) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return read_dataset(path)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_integer_column_parsed_as_float_in_a_later_chunk(tmp_path, fmt):
+    # iter_csv_chunks leaves a chunk with fractional or missing values as parsed (float)
+    chunks = [
+        pd.DataFrame({"a": pd.Series([1, 2], dtype="int8")}),
+        pd.DataFrame({"a": [1.5, None]}),
+    ]
+
+    result = write_chunks(dataset_path(str(tmp_path), "data.csv", fmt), fmt, chunks)
+
+    assert result["a"].tolist()[:3] == [1.0, 2.0, 1.5]
+    assert result["a"].isna().tolist() == [False, False, False, True]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_integers_beyond_float_precision_fail_clearly(tmp_path, fmt):
+    chunks = [pd.DataFrame({"a": [2 ** 60, 1]}), pd.DataFrame({"a": [1.5, 2.0]})]
+
+    with pytest.raises(ValueError, match="Column 'a'"):
+        write_chunks(dataset_path(str(tmp_path), "data.csv", fmt), fmt, chunks)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_formats_match_csv(tmp_path, fmt):
+    chunks = [
+        pd.DataFrame({"id": ["x1", "x2"], "city": pd.Categorical(["Paris", "Lyon"]), "n": [1, 2]}),
+        pd.DataFrame({"id": ["x3", "x4"], "city": pd.Categorical(["Lyon", None]), "n": [3, None]}),
+    ]
+
+    expected = write_chunks(dataset_path(str(tmp_path), "data.csv", "csv"), "csv", chunks)
+    result = write_chunks(dataset_path(str(tmp_path), "data.csv", fmt), fmt, chunks)
+
+    pd.testing.assert_frame_equal(
+        result.astype({"city": object}), expected.astype({"city": object}), check_dtype=False
+    )
+
+
+def test_arrow_categories_across_chunks(tmp_path):
+    chunks = [
+        pd.DataFrame({"city": pd.Categorical(["Paris", "Lyon"])}),
+        pd.DataFrame({"city": pd.Categorical(["Nice", "Paris"])}),
+    ]
+
+    result = write_chunks(dataset_path(str(tmp_path), "data.csv", "arrow"), "arrow", chunks)
+
+    assert isinstance(result["city"].dtype, pd.CategoricalDtype)
+    assert result["city"].tolist() == ["Paris", "Lyon", "Nice", "Paris"]
@@ -0,0 +1,76 @@
+import hashlib
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def hash_unique_values(values, key=None):
+    """
+    Hash every value once.
+
+    Args:
+        values (iterable): Distinct non-null values.
+        key (str or bytes): Secret key. When given, values are hashed with HMAC-SHA256 so the
+            hashes cannot be reversed by hashing a dictionary of candidate identifiers.
+
+    Returns:
+        np.ndarray: Hex digests (object array), in the order of `values`.
+    """
+    if key is None:
+        digests = [hashlib.sha256(str(value).encode("utf-8")).hexdigest() for value in values]
+    else:
+        key = key.encode("utf-8") if isinstance(key, str) else key
+        digests = [hmac.new(key, str(value).encode("utf-8"), hashlib.sha256).hexdigest() for value in values]
+    return np.array(digests, dtype=object)
+
+
+def anonymize_series(series, key=None):
+    """
+    Hash a column, computing each distinct value's hash only once (factorize, hash, take).
+
+    Without key the result is identical to `series.apply(hash_value)`: SHA-256 of str(value),
+    missing values left as they are.
+
+    Args:
+        series (pd.Series): Column to anonymize.
+        key (str or bytes): Optional HMAC key (see hash_unique_values).
+
+    Returns:
+        pd.Series: The hashed column, same index and name.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    hashed = hash_unique_values(uniques, key)
+    if len(hashed):
+        result = hashed.take(np.maximum(codes, 0))
+    else:
+        result = np.empty(len(codes), dtype=object)
+    missing = codes < 0
+    if missing.any():
+        result[missing] = series.to_numpy(dtype=object)[missing]
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+def anonymize_columns(df, columns, key=None, workers=1):
+    """
+    Anonymize several columns of a DataFrame in place, in parallel threads when workers > 1.
+
+    Args:
+        df (pd.DataFrame): Data to anonymize.
+        columns (iterable): Columns to hash; the ones missing from the DataFrame are ignored.
+        key (str or bytes): Optional HMAC key (see hash_unique_values).
+        workers (int): Columns processed at the same time.
+
+    Returns:
+        list: The columns actually anonymized.
+    """
+    columns = [col for col in columns if col in df.columns]
+    if workers > 1 and len(columns) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(columns))) as executor:
+            hashed = list(executor.map(lambda col: anonymize_series(df[col], key), columns))
+    else:
+        hashed = [anonymize_series(df[col], key) for col in columns]
+    for col, values in zip(columns, hashed):
+        df[col] = values
+    return columns
@@ -1,19 +1,178 @@
 import os
-import time
+import sys
 import hashlib
 import pandas as pd
 import glob
-from openai import OpenAI
-from dotenv import load_dotenv
 import warnings
-import httpx
 from IPython.display import display, Markdown
 
+# shared modules (common_utils/) live in the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common_utils.llm_client import get_client
+from .anonymization_utils import anonymize_columns
+from .ingestion_utils import DatasetStats, iter_csv_chunks
+from .local_analysis_utils import analyze_locally
+from .profile_utils import profile_dataframe, profile_to_prompt, stratified_sample
+from .run_utils import RunWaiter
+from .session_utils import AnalysisSession, hash_dataset
+from .storage_utils import DatasetWriter, dataset_path, read_dataset
+
 def hash_value(value):
     if pd.isna(value):
         return value
     return hashlib.sha256(str(value).encode('utf-8')).hexdigest()
 
+def run_assistant_analysis(anon_csv_path, prompt, model_name, temperature, report_lines, data_context=None, session=None, dataset_key=None,
+                           run_timeout_seconds=600):
+    """
+    Upload the anonymized file and let an OpenAI assistant (code interpreter) analyze it.
+
+    With `data_context` (profile and sample of the data), that text is sent with the prompt instead of
+    uploading the file.
+
+    With a `session` (see AnalysisSession), the upload, the assistant and the thread of the dataset
+    `dataset_key` are reused: a follow-up question only costs the message and the model turn, and the
+    file or profile already in the thread is not sent again.
+
+    The run is followed with RunWaiter (event stream, or polling with backoff) and cancelled after
+    `run_timeout_seconds`.
+
+    Returns:
+        str: The assistant answer.
+    """
+    if session is None:
+        # one-off analysis: nothing is reused afterwards (nor deleted, as before)
+        session = AnalysisSession()
+    if dataset_key is None or dataset_key not in session.datasets:
+        dataset_key = dataset_key or anon_csv_path
+        session.add_dataset(dataset_key, anon_csv_path)
+    entry = session.datasets[dataset_key]
+    openai = session.openai
+
+    # 4. Upload file to OpenAI
+    content = prompt
+    attachments = []
+    if data_context is None:
+        file_id, reused = session.file_id(dataset_key)
+        if reused:
+            report_lines.append(f"♻️ Reusing the uploaded file_id: {file_id}")
+        else:
+            report_lines.append(f"☁️ File uploaded to OpenAI with file_id: {file_id}")
+        if not entry["file_attached"]:
+            attachments = [{"file_id": file_id, "tools": [{"type": "code_interpreter"}]}]
+            entry["file_attached"] = True
+    elif entry["context_sent"] != data_context:
+        report_lines.append(f"☁️ Sending the dataset profile and sample ({len(data_context.encode('utf-8')) / 1024:.1f} KB) instead of the file")
+        content = f"{prompt}\n\n{data_context}"
+        entry["context_sent"] = data_context
+    else:
+        report_lines.append("♻️ Dataset profile and sample already in the thread")
+
+    # 5. Create a temporary assistant (if you don’t have a permanent one)
+    assistant_id, reused = session.assistant_id(
+        model_name,
+        temperature,
+        name="CSV Cleaner",
+        instructions="You are an expert in data cleansing and analysis. Use code to process CSV files.",
+        tools=[{"type": "code_interpreter"}],
+    )
+    if reused:
+        report_lines.append(f"♻️ Reusing assistant: {assistant_id}")
+
+    # 6. Create thread
+    thread_id, reused = session.thread_id(dataset_key)
+    if reused:
+        report_lines.append(f"♻️ Follow-up question in thread: {thread_id}")
+
+    # 7. Send message with prompt and attached file
+    openai.beta.threads.messages.create(
+        thread_id=thread_id,
+        role="user",
+        content=content,
+        attachments=attachments
+    )
+
+    # 8. Run assistant and 9. wait for completion
+    waiter = RunWaiter(
+        openai,
+        deadline_seconds=run_timeout_seconds,
+        on_progress=lambda status, elapsed, run: print(f"⏳ Run {status} ({elapsed:.1f}s)"),
+    )
+    run = waiter.run(thread_id, assistant_id)
+    report_lines.append(f"⏱️ Assistant run: {waiter.summary()}")
+
+    # 10. Get assistant response (the thread may hold earlier questions: only this run's messages)
+    messages = openai.beta.threads.messages.list(thread_id=thread_id, run_id=run.id)
+    return messages.data[0].content[0].text.value
+
+def run_local_analysis(df, prompt, model_name, temperature, output_dir, report_lines, timeout_seconds=120, memory_limit_mb=2048, data_context=None):
+    """
+    Generate the analysis code with a local Ollama model and run it in a sandboxed subprocess
+    against the DataFrame: no upload, no polling, no network round-trip to OpenAI.
+
+    Returns:
+        str: What the analysis code printed.
+    """
+    client = get_client()
+    chat = lambda user_prompt, system: client.chat(user_prompt, model_name, system, execution_mode="offline", temperature=temperature)
+    result = analyze_locally(df, prompt, chat, timeout_seconds=timeout_seconds, memory_mb=memory_limit_mb, data_context=data_context)
+
+    report_lines.append(f"🧠 Analysis code generated locally with {model_name} ({result['attempts']} attempt(s)):")
+    report_lines.append(f"```python\n{result['code']}\n```")
+    report_lines.append(f"⏱️ Code executed in {result['seconds']:.2f}s")
+    if not result["ok"]:
+        error = result["stderr"].strip().splitlines() or ["unknown error"]
+        raise Exception(f"❌ Local analysis failed: {error[-1]}")
+    if result["result_df"] is not None:
+        result_path = os.path.join(output_dir, "analysis_result.csv")
+        result["result_df"].to_csv(result_path, index=False)
+        report_lines.append(f"📁 Resulting table saved at: {result_path}")
+    return result["stdout"].strip()
+
+def _anonymize_to_file(csv_file_path, anon_csv_path, columns_to_anonymize, chunksize, anonymization_key,
+                       anonymization_workers, output_format, show_sample):
+    """
+    Read the CSV (in chunks when `chunksize` is set), anonymize it and write it to `anon_csv_path`.
+
+    Returns:
+        tuple: (the anonymized DataFrame, or None when it was streamed; the report lines)
+    """
+    if chunksize:
+        # anonymized identifiers are read as text so a value gets the same hash in every chunk
+        chunks = iter_csv_chunks(csv_file_path, chunksize, text_columns=columns_to_anonymize)
+    else:
+        chunks = [pd.read_csv(csv_file_path)]
+    # the whole anonymized DataFrame when it is already in memory (not streamed)
+    frames_loaded = None if chunksize else chunks[0]
+
+    # 2. Anonymize sensitive columns and 3. save the anonymized CSV, chunk by chunk
+    stats = DatasetStats()
+    anonymization_lines = []
+    with DatasetWriter(anon_csv_path, output_format) as writer:
+        for index, df in enumerate(chunks):
+            if index == 0:
+                if show_sample:
+                    display(Markdown("## Original data:\n"))
+                    display(df.head(1))
+                for col in columns_to_anonymize:
+                    if col in df.columns:
+                        anonymization_lines.append(f"🔒 Anonymized column: {col}")
+                    else:
+                        anonymization_lines.append(f"⚠️ Column not found for anonymization: {col}")
+
+            anonymize_columns(df, columns_to_anonymize, anonymization_key, anonymization_workers)
+            stats.update(df)
+
+            if index == 0 and show_sample:
+                display(Markdown("## Anonymized data:\n"))
+                display(df.head(1))
+
+            writer.write(df)
+
+    lines = stats.report_lines() + anonymization_lines
+    lines.append(f"📁 Anonymized {output_format.upper()} saved at: {anon_csv_path}")
+    return frames_loaded, lines
+
 def anonymize_and_process(
     model_name,
     temperature,
@@ -24,98 +183,111 @@ def anonymize_and_process(
     report_file_name,
     prompt,
     input_filename = None,
-    show_sample=False
+    show_sample=False,
+    chunksize=None,
+    anonymization_key=None,
+    anonymization_workers=1,
+    engine="assistants",
+    local_model="llama3.2",
+    timeout_seconds=120,
+    memory_limit_mb=2048,
+    data_mode="file",
+    sample_rows=50,
+    stratify_by=None,
+    output_format="csv",
+    session=None,
+    run_timeout_seconds=600
 ):
-    report_lines = []
-    load_dotenv()
+    """
+    Anonymize a CSV file and ask an OpenAI assistant (code interpreter) to analyze it.
 
-    os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY')
-    
-    openai = OpenAI(http_client=httpx.Client(verify=False))
-    openai.api_type = "openai"  # 👈 Required to resolve ambiguity
+    Args:
+        chunksize (int): Stream the CSV in chunks of this many rows (compact dtypes, anonymized and
+            appended chunk by chunk), so memory stays bounded for multi-GB files. None reads it at once.
+        anonymization_key (str): Secret key to hash the columns with HMAC-SHA256 instead of plain SHA-256,
+            so the hashes cannot be reversed with a dictionary of known identifiers.
+        anonymization_workers (int): Columns anonymized at the same time.
+        engine (str): "assistants" uploads the file to an OpenAI assistant (code interpreter), "local" generates
+            the analysis code with a local Ollama model (`local_model`) and runs it in a sandboxed subprocess
+            limited to `timeout_seconds` and `memory_limit_mb`.
+        data_mode (str): "file" sends the whole anonymized file to the assistant, "profile" sends a compact
+            statistical profile plus a stratified sample of `sample_rows` rows (stratified on `stratify_by`).
+        output_format (str): Format of the anonymized file: "csv", "parquet" or "arrow" (Arrow IPC). The columnar
+            formats keep the dtypes, dictionary-encode text columns and are memory-mapped when reloaded for
+            the analysis; the extension of `output_file_name` is replaced accordingly.
+        session (AnalysisSession): Reuse work across calls: a dataset with the same content and anonymization
+            settings is not anonymized again, and follow-up questions go to the same uploaded file, assistant
+            and thread. The profile is computed once per dataset. Call `session.close()` to delete the remote
+            objects (idle ones are deleted after the session TTL).
+        run_timeout_seconds (float): Deadline of the assistant run, which is cancelled when it is reached.
+
+    Returns:
+        list: The report lines.
+    """
+    if engine not in ("assistants", "local"):
+        raise ValueError("Invalid engine. Use 'assistants' or 'local'.")
+    if data_mode not in ("file", "profile"):
+        raise ValueError("Invalid data_mode. Use 'file' or 'profile'.")
+    report_lines = []
 
     try:
         if input_filename is None:
             # Find the first CSV file in the input directory
             csv_files = glob.glob(os.path.join(input_csv_dir, "*.csv"))
-            csv_file_path = csv_files[0]
             if not csv_files:
                 raise FileNotFoundError(f"No CSV file found in {input_csv_dir}")
+            csv_file_path = csv_files[0]
         else:
             csv_file_path = input_csv_dir + input_filename        
         
-        df = pd.read_csv(csv_file_path)
-        
-        if show_sample:
-            display(Markdown("## Original data:\n"))
-            display(df.head(1))
-            
-        report_lines.append(f"✅ CSV read from: {input_csv_dir}")
-        report_lines.append(f"➡️ Rows: {len(df)}, Columns: {len(df.columns)}")
-
-        # 2. Anonymize sensitive columns
-        for col in columns_to_anonymize:
-            if col in df.columns:
-                df[col] = df[col].apply(hash_value)
-                report_lines.append(f"🔒 Anonymized column: {col}")
+        anon_csv_path = dataset_path(output_csv_dir, output_file_name, output_format)
+        dataset_key = None
+        cached = None
+        if session is not None:
+            # same content anonymized the same way: reuse the file, its upload and its thread
+            dataset_key = hash_dataset(
+                csv_file_path,
+                columns=list(columns_to_anonymize),
+                anonymization_key=hashlib.sha256(anonymization_key.encode("utf-8")).hexdigest() if anonymization_key else None,
+                output_format=output_format,
+            )
+            cached = session.get_dataset(dataset_key)
+
+        if cached is not None:
+            anon_csv_path = cached["path"]
+            frames_loaded = None
+            report_lines.append(f"♻️ Dataset already anonymized in this session: {anon_csv_path}")
+            report_lines.extend(cached["report_lines"])
+        else:
+            frames_loaded, dataset_lines = _anonymize_to_file(
+                csv_file_path, anon_csv_path, columns_to_anonymize, chunksize, anonymization_key,
+                anonymization_workers, output_format, show_sample,
+            )
+            report_lines.append(f"✅ CSV read from: {input_csv_dir}")
+            report_lines.extend(dataset_lines)
+            if session is not None:
+                session.add_dataset(dataset_key, anon_csv_path, dataset_lines)
+
+        # 4-10. Analyze the anonymized data
+        contexts = cached["contexts"] if cached is not None else {}
+        if frames_loaded is None and (engine == "local" or (data_mode == "profile" and (stratify_by, sample_rows) not in contexts)):
+            frames_loaded = read_dataset(anon_csv_path)
+        data_context = None
+        if data_mode == "profile":
+            if (stratify_by, sample_rows) in contexts:
+                data_context = contexts[(stratify_by, sample_rows)]
+                report_lines.append("♻️ Dataset profile reused from this session")
             else:
-                report_lines.append(f"⚠️ Column not found for anonymization: {col}")
+                profile = profile_dataframe(frames_loaded)
+                data_context = profile_to_prompt(profile, stratified_sample(frames_loaded, stratify_by, sample_rows))
+                report_lines.append(f"📋 Dataset profile computed ({len(profile['columns'])} columns, {len(profile['correlations'])} notable correlations)")
+                if session is not None:
+                    session.datasets[dataset_key]["contexts"][(stratify_by, sample_rows)] = data_context
 
-        # 3. Save the anonymized CSV temporarily
-        anon_csv_path = os.path.join(output_csv_dir, output_file_name)
-        
-        if show_sample:
-            display(Markdown("## Anonymized data:\n"))
-            display(df.head(1))
-            
-        df.to_csv(anon_csv_path, index=False)
-        report_lines.append(f"📁 Anonymized CSV saved at: {anon_csv_path}")
-
-        # 4. Upload file to OpenAI
-        file_upload = openai.files.create(file=open(anon_csv_path, "rb"), purpose="assistants")
-        report_lines.append(f"☁️ File uploaded to OpenAI with file_id: {file_upload.id}")
-
-        # 5. Create a temporary assistant (if you don’t have a permanent one)
-        assistant = openai.beta.assistants.create(
-            name="CSV Cleaner",
-            temperature=temperature,
-            instructions="You are an expert in data cleansing and analysis. Use code to process CSV files.",
-            tools=[{"type": "code_interpreter"}],
-            model=model_name
-        )
-
-        # 6. Create thread
-        thread = openai.beta.threads.create()
-
-        # 7. Send message with prompt and attached file
-        openai.beta.threads.messages.create(
-            thread_id=thread.id,
-            role="user",
-            content=prompt,
-            attachments=[{
-                "file_id": file_upload.id,
-                "tools": [{"type": "code_interpreter"}]
-            }]
-        )
-
-        # 8. Run assistant
-        run = openai.beta.threads.runs.create(
-            thread_id=thread.id,
-            assistant_id=assistant.id
-        )
-
-        # 9. Wait for completion
-        while True:
-            status = openai.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
-            if status.status == "completed":
-                break
-            elif status.status == "failed":
-                raise Exception("❌ Assistant execution failed.")
-            time.sleep(2)
-
-        # 10. Get assistant response
-        messages = openai.beta.threads.messages.list(thread_id=thread.id)
-        last_response = messages.data[0].content[0].text.value
+        if engine == "local":
+            last_response = run_local_analysis(frames_loaded, prompt, local_model, temperature, output_csv_dir, report_lines, timeout_seconds, memory_limit_mb, data_context)
+        else:
+            last_response = run_assistant_analysis(anon_csv_path, prompt, model_name, temperature, report_lines, data_context, session, dataset_key, run_timeout_seconds)
         report_lines.append("🤖 Assistant response:")
         report_lines.append(last_response)
 
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+
+def iter_csv_chunks(csv_path, chunksize, text_columns=()):
+    """
+    Read a CSV file chunk by chunk with compact dtypes.
+
+    The dtypes are inferred once, on the first `chunksize` rows, and every chunk is read with them,
+    so a column has the same type in all chunks (categorical columns are built by the parser, never
+    as a full object column). Integers are parsed as int64 and cast to the inferred type after a range
+    check: a chunk with larger values widens the type of that column from then on, instead of
+    wrapping around.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        chunksize (int): Rows per chunk.
+        text_columns (iterable): Columns always read as text (e.g. the identifiers to anonymize),
+            so their values do not depend on what else is in the chunk.
+
+    Yields:
+        pd.DataFrame: Chunks with downcast integers and categorical low-cardinality text columns.
+    """
+    text_dtypes = {col: str for col in text_columns}
+    sample = pd.read_csv(csv_path, nrows=chunksize, dtype=text_dtypes or None)
+    dtypes = infer_compact_dtypes(sample, exclude=text_columns)
+    integer_dtypes = {col: dtype for col, dtype in dtypes.items() if pd.api.types.is_integer_dtype(dtype)}
+    read_dtypes = {col: dtype for col, dtype in dtypes.items() if col not in integer_dtypes}
+    read_dtypes.update(text_dtypes)
+    del sample
+
+    rows = 0
+    with pd.read_csv(csv_path, chunksize=chunksize, dtype=read_dtypes or None) as reader:
+        for chunk in reader:
+            for col, dtype in integer_dtypes.items():
+                series = chunk[col]
+                if not pd.api.types.is_integer_dtype(series):
+                    # missing values (float) or text in this chunk: left as parsed
+                    continue
+                info = np.iinfo(dtype)
+                if len(series) and (series.min() < info.min or series.max() > info.max):
+                    needed = pd.to_numeric(series, downcast="signed" if series.min() < 0 else "unsigned").dtype
+                    dtype = integer_dtypes[col] = np.promote_types(dtype, needed)
+                    print(f"⚠️ Column {col} widened to {dtype} from row {rows}")
+                chunk[col] = series.astype(dtype)
+            rows += len(chunk)
+            yield chunk
+
+
+def infer_compact_dtypes(df, exclude=(), category_max_ratio=0.5, category_max_unique=1000):
+    """
+    Smallest dtypes for the columns of a DataFrame: integers downcast to the smallest type holding
+    their values (coded columns fit in int8) and repetitive text columns as categoricals.
+
+    Args:
+        df (pd.DataFrame): Data (or sample) to inspect.
+        exclude (iterable): Columns left out.
+        category_max_ratio (float): Maximum unique/non-null ratio of a text column converted to category.
+        category_max_unique (int): Maximum distinct values of a text column converted to category.
+
+    Returns:
+        dict: Column -> dtype, for the columns to convert only.
+    """
+    exclude = set(exclude)
+    dtypes = {}
+    for col in df.columns:
+        if col in exclude:
+            continue
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series):
+            dtypes[col] = pd.to_numeric(series, downcast="signed" if series.min() < 0 else "unsigned").dtype
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            non_null = series.count()
+            unique = series.nunique()
+            if non_null and unique <= category_max_unique and unique / non_null <= category_max_ratio:
+                dtypes[col] = "category"
+    return dtypes
+
+
+def compact_dtypes(df, exclude=(), category_max_ratio=0.5, category_max_unique=1000):
+    """
+    Shrink the memory of a DataFrame with the dtypes of infer_compact_dtypes.
+
+    Args:
+        df (pd.DataFrame): Data to compact (modified in place).
+        exclude (iterable): Columns left untouched.
+        category_max_ratio (float): Maximum unique/non-null ratio of a text column converted to category.
+        category_max_unique (int): Maximum distinct values of a text column converted to category.
+
+    Returns:
+        pd.DataFrame: The same DataFrame.
+    """
+    for col, dtype in infer_compact_dtypes(df, exclude, category_max_ratio, category_max_unique).items():
+        df[col] = df[col].astype(dtype)
+    return df
+
+
+class DatasetStats:
+    """
+    Row and column statistics collected chunk by chunk, without keeping the data.
+
+    For every column it counts the non-null values, and for numeric columns it keeps
+    min, max, sum and sum of squares to report mean and standard deviation.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = []
+        self.non_null = None
+        self.minimum = None
+        self.maximum = None
+        self.total = None
+        self.total_squares = None
+        self.numeric_count = None
+
+    def update(self, chunk):
+        """
+        Add one chunk to the statistics.
+        """
+        if not self.columns:
+            self.columns = list(chunk.columns)
+            self.non_null = pd.Series(0, index=chunk.columns, dtype="int64")
+        self.rows += len(chunk)
+        self.non_null = self.non_null.add(chunk.count(), fill_value=0).astype("int64")
+
+        numeric = chunk.select_dtypes("number").astype("float64")
+        if numeric.empty:
+            return
+        stats = {
+            "minimum": numeric.min(),
+            "maximum": numeric.max(),
+            "total": numeric.sum(),
+            "total_squares": np.square(numeric).sum(),
+            "numeric_count": numeric.count(),
+        }
+        if self.minimum is None:
+            for name, value in stats.items():
+                setattr(self, name, value)
+            return
+        self.minimum = pd.concat([self.minimum, stats["minimum"]], axis=1).min(axis=1)
+        self.maximum = pd.concat([self.maximum, stats["maximum"]], axis=1).max(axis=1)
+        self.total = self.total.add(stats["total"], fill_value=0)
+        self.total_squares = self.total_squares.add(stats["total_squares"], fill_value=0)
+        self.numeric_count = self.numeric_count.add(stats["numeric_count"], fill_value=0)
+
+    def summary(self):
+        """
+        Returns:
+            pd.DataFrame: One row per column with non-null/null counts, and min/max/mean/std for numeric columns.
+        """
+        summary = pd.DataFrame({"non_null": self.non_null, "nulls": self.rows - self.non_null})
+        if self.minimum is not None:
+            mean = self.total / self.numeric_count
+            variance = (self.total_squares / self.numeric_count - np.square(mean)).clip(lower=0)
+            summary["min"] = self.minimum
+            summary["max"] = self.maximum
+            summary["mean"] = mean
+            summary["std"] = np.sqrt(variance * self.numeric_count / (self.numeric_count - 1).clip(lower=1))
+        return summary.loc[self.columns]
+
+    def report_lines(self):
+        """
+        Returns:
+            list: Report lines describing the dataset.
+        """
+        lines = [f"➡️ Rows: {self.rows}, Columns: {len(self.columns)}"]
+        for col, row in self.summary().iterrows():
+            line = f"   - {col}: {int(row['nulls'])} nulls"
+            if "min" in row and pd.notna(row["min"]):
+                line += f", min {row['min']:g}, max {row['max']:g}, mean {row['mean']:.4g}, std {row['std']:.4g}"
+            lines.append(line)
+        return lines
@@ -0,0 +1,199 @@
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+CODE_SYSTEM_MESSAGE = (
+    "You are an expert data analyst who answers questions about a dataset by writing Python code. "
+    "Answer only with one ```python code block."
+)
+CODE_PROMPT = """A pandas DataFrame named `df` is already loaded ({rows} rows). Its columns and dtypes are:
+{schema}
+
+First rows:
+{head}
+{context}
+Write Python code (pandas/numpy only) answering the request below.
+- Do not read or download any file: use `df`.
+- print() the answer in clear sentences with the relevant numbers.
+- If the request asks to create or modify a table, assign the final DataFrame to a variable named `result_df`.
+
+Request:
+{prompt}
+"""
+FIX_PROMPT = """The code below failed.
+
+```python
+{code}
+```
+
+Error:
+{error}
+
+Fix it. Answer only with the corrected ```python code block."""
+
+# executed by the sandboxed interpreter: load the data, run the generated code, save result_df.
+# The result is saved as Parquet (CSV when the frame cannot be), never pickled: the parent process
+# reads it back, and unpickling a file the generated code can write would run code next to the secrets.
+RUNNER = textwrap.dedent("""
+    import os
+    import sys
+    import pandas as pd
+    import numpy as np
+
+    data_path, code_path, result_path = sys.argv[1:4]
+    df = pd.read_pickle(data_path)
+    with open(code_path, "r", encoding="utf-8") as f:
+        code = f.read()
+    namespace = {"df": df, "pd": pd, "np": np}
+    exec(compile(code, "analysis.py", "exec"), namespace)
+    result_df = namespace.get("result_df")
+    if isinstance(result_df, pd.DataFrame):
+        try:
+            result_df.to_parquet(result_path + ".parquet")
+        except Exception:
+            if os.path.exists(result_path + ".parquet"):
+                os.remove(result_path + ".parquet")
+            result_df.to_csv(result_path + ".csv", index=False)
+""")
+
+# environment variables never passed to the generated code
+SECRET_ENV_PATTERN = re.compile(r"KEY|TOKEN|SECRET|PASSWORD|CREDENTIAL", re.IGNORECASE)
+
+
+def extract_code(text):
+    """
+    Returns:
+        str: The content of the first ```python block of a model answer (the whole answer if there is none).
+    """
+    match = re.search(r"```(?:python|py)?\s*\n(.*?)```", text, re.DOTALL)
+    return (match.group(1) if match else text).strip()
+
+
+def build_code_prompt(df, prompt, head_rows=5, data_context=None):
+    schema = "\n".join(f"- {col}: {dtype}" for col, dtype in df.dtypes.astype(str).items())
+    context = f"\n{data_context}\n" if data_context else ""
+    return CODE_PROMPT.format(rows=len(df), schema=schema, head=df.head(head_rows).to_string(), context=context, prompt=prompt)
+
+
+def _limit_resources(memory_mb, cpu_seconds):
+    def apply():
+        # runs in the child before exec: cap its address space and CPU time
+        memory = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    return apply
+
+
+def run_sandboxed(code, df, timeout_seconds=60, memory_mb=2048):
+    """
+    Run generated analysis code against a DataFrame in a separate, restricted Python process.
+
+    The process ignores PYTHON* variables and runs inside a temporary working directory, without the
+    secrets of the environment (API keys, tokens...), with a wall-clock timeout and, on POSIX,
+    memory and CPU time limits. This contains runaway or buggy generated code; it is not an
+    isolation boundary against hostile code (network and file system stay reachable).
+
+    Args:
+        code (str): Python code using the variable `df`.
+        df (pd.DataFrame): Data handed to the code.
+        timeout_seconds (float): Wall-clock limit.
+        memory_mb (int): Address-space limit of the process (POSIX only).
+
+    Returns:
+        dict: "ok", "stdout", "stderr", "timed_out", "seconds" and "result_df" (DataFrame or None).
+    """
+    with tempfile.TemporaryDirectory(prefix="analysis_sandbox_") as workdir:
+        data_path = os.path.join(workdir, "data.pkl")
+        code_path = os.path.join(workdir, "analysis.py")
+        runner_path = os.path.join(workdir, "runner.py")
+        result_path = os.path.join(workdir, "result")
+        df.to_pickle(data_path)
+        with open(code_path, "w", encoding="utf-8") as f:
+            f.write(code)
+        with open(runner_path, "w", encoding="utf-8") as f:
+            f.write(RUNNER)
+
+        env = {k: v for k, v in os.environ.items() if not SECRET_ENV_PATTERN.search(k)}
+        # one BLAS thread: keeps the reserved address space under the memory limit
+        env.update(OPENBLAS_NUM_THREADS="1", OMP_NUM_THREADS="1", MKL_NUM_THREADS="1")
+        preexec_fn = _limit_resources(memory_mb, int(timeout_seconds) + 1) if resource is not None else None
+
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-E", runner_path, data_path, code_path, result_path],
+                cwd=workdir, env=env, capture_output=True, text=True,
+                timeout=timeout_seconds, preexec_fn=preexec_fn,
+            )
+        except subprocess.TimeoutExpired as e:
+            stdout = e.stdout or ""
+            if isinstance(stdout, bytes):
+                stdout = stdout.decode("utf-8", errors="replace")
+            return {
+                "ok": False,
+                "stdout": stdout,
+                "stderr": f"Execution exceeded the {timeout_seconds}s limit.",
+                "timed_out": True,
+                "seconds": time.perf_counter() - start,
+                "result_df": None,
+            }
+
+        stderr = completed.stderr
+        if completed.returncode != 0 and not stderr.strip():
+            stderr = f"Process exited with code {completed.returncode} (memory or CPU limit reached?)"
+        return {
+            "ok": completed.returncode == 0,
+            "stdout": completed.stdout,
+            "stderr": stderr,
+            "timed_out": False,
+            "seconds": time.perf_counter() - start,
+            "result_df": _read_result(result_path),
+        }
+
+
+def _read_result(result_path):
+    import pandas as pd
+
+    if os.path.exists(result_path + ".parquet"):
+        return pd.read_parquet(result_path + ".parquet")
+    if os.path.exists(result_path + ".csv"):
+        return pd.read_csv(result_path + ".csv")
+    return None
+
+
+def analyze_locally(df, prompt, chat, max_attempts=2, timeout_seconds=60, memory_mb=2048, data_context=None):
+    """
+    Answer a question about a DataFrame with code generated by a local model and run in the sandbox.
+
+    When the code fails, the error is sent back to the model for a corrected version.
+
+    Args:
+        df (pd.DataFrame): The (anonymized) data.
+        prompt (str): The user request.
+        chat (callable): chat(prompt, system_prompt) -> str, e.g. a wrapper around the shared LLM client.
+        max_attempts (int): Code generations tried before giving up.
+        timeout_seconds (float): Wall-clock limit of each execution.
+        memory_mb (int): Memory limit of each execution.
+        data_context (str): Optional dataset profile added to the code generation prompt.
+
+    Returns:
+        dict: The last execution result (see run_sandboxed) plus "code" and "attempts".
+    """
+    code = extract_code(chat(build_code_prompt(df, prompt, data_context=data_context), CODE_SYSTEM_MESSAGE))
+    for attempt in range(1, max_attempts + 1):
+        result = run_sandboxed(code, df, timeout_seconds, memory_mb)
+        result.update(code=code, attempts=attempt)
+        if result["ok"] or attempt == max_attempts:
+            return result
+        print(f"⚠️ Generated code failed (attempt {attempt}), asking the model for a fix...")
+        error = result["stderr"].strip().splitlines()[-20:]
+        code = extract_code(chat(FIX_PROMPT.format(code=code, error="\n".join(error)), CODE_SYSTEM_MESSAGE))
@@ -0,0 +1,164 @@
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+
+QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+
+def _detect_date_columns(df, sample_size=200):
+    # text columns whose sampled values almost all parse as dates
+    dates = []
+    for col in df.columns:
+        series = df[col]
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+                or isinstance(series.dtype, pd.CategoricalDtype)):
+            continue
+        sample = series.dropna().astype(str).head(sample_size)
+        if sample.empty or sample.str.len().max() > 40:
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = pd.to_datetime(sample, dayfirst=True, errors="coerce")
+        if parsed.notna().mean() >= 0.9:
+            dates.append(col)
+    return dates
+
+
+def _detect_time_columns(df):
+    # integer HHMM columns such as time_24hr (1840 = 18:40)
+    times = []
+    for col in df.select_dtypes("integer").columns:
+        if "time" not in col.lower():
+            continue
+        values = df[col].dropna()
+        if len(values) and values.min() >= 0 and values.max() <= 2359 and (values % 100).max() < 60:
+            times.append(col)
+    return times
+
+
+def profile_dataframe(df, top_k=5, coded_max_unique=20, max_correlations=15, min_correlation=0.3):
+    """
+    Compact statistical profile of a DataFrame, computed with whole-frame vectorized operations.
+
+    Args:
+        df (pd.DataFrame): Data to profile.
+        top_k (int): Most frequent values kept for coded and text columns.
+        coded_max_unique (int): Numeric columns with at most this many distinct values are treated
+            as codes (weather_conditions, casualty_severity...): top values instead of only quantiles.
+        max_correlations (int): Strongest correlations kept.
+        min_correlation (float): Weaker correlations (absolute value) are left out.
+
+    Returns:
+        dict: "rows", "columns" (dtype, nulls, unique, quantiles/mean/std, top values),
+            "correlations", "date_ranges" and "time_ranges". JSON serializable.
+    """
+    nulls = df.isna().sum()
+    unique = df.nunique()
+    numeric = df.select_dtypes("number")
+    quantiles = numeric.quantile(list(QUANTILES)) if not numeric.empty else pd.DataFrame()
+    means = numeric.mean()
+    stds = numeric.std()
+
+    columns = {}
+    for col in df.columns:
+        info = {"dtype": str(df[col].dtype), "nulls": int(nulls[col]), "unique": int(unique[col])}
+        if col in numeric.columns:
+            info["quantiles"] = {f"p{int(q * 100)}": _number(quantiles.loc[q, col]) for q in QUANTILES}
+            info["mean"] = _number(means[col])
+            info["std"] = _number(stds[col])
+        if col not in numeric.columns or unique[col] <= coded_max_unique:
+            counts = df[col].value_counts(dropna=True).head(top_k)
+            info["top_values"] = {str(value): int(count) for value, count in counts.items()}
+        columns[col] = info
+
+    correlations = []
+    coded_or_continuous = numeric.loc[:, unique[numeric.columns] > 1]
+    if coded_or_continuous.shape[1] > 1:
+        matrix = coded_or_continuous.corr()
+        upper = matrix.where(np.triu(np.ones(matrix.shape, dtype=bool), k=1)).stack()
+        upper = upper[upper.abs() >= min_correlation]
+        strongest = upper.reindex(upper.abs().sort_values(ascending=False).index).head(max_correlations)
+        correlations = [{"a": a, "b": b, "r": round(float(r), 3)} for (a, b), r in strongest.items()]
+
+    date_ranges = {}
+    for col in _detect_date_columns(df):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = pd.to_datetime(df[col].astype(str), dayfirst=True, errors="coerce")
+        busiest = parsed.dt.date.value_counts().head(top_k)
+        date_ranges[col] = {
+            "min": str(parsed.min().date()),
+            "max": str(parsed.max().date()),
+            "unparsed": int(parsed.isna().sum() - df[col].isna().sum()),
+            "by_weekday": {str(k): int(v) for k, v in parsed.dt.day_name().value_counts().items()},
+            "busiest_days": {str(k): int(v) for k, v in busiest.items()},
+        }
+
+    time_ranges = {}
+    for col in _detect_time_columns(df):
+        values = df[col].dropna()
+        hours = (values // 100).astype(int).value_counts().sort_index()
+        time_ranges[col] = {
+            "min": f"{int(values.min()) // 100:02d}:{int(values.min()) % 100:02d}",
+            "max": f"{int(values.max()) // 100:02d}:{int(values.max()) % 100:02d}",
+            "by_hour": {f"{hour:02d}h": int(count) for hour, count in hours.items()},
+        }
+
+    return {
+        "rows": int(len(df)),
+        "columns": columns,
+        "correlations": correlations,
+        "date_ranges": date_ranges,
+        "time_ranges": time_ranges,
+    }
+
+
+def _number(value):
+    if pd.isna(value):
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 4)
+
+
+def stratified_sample(df, by=None, n=50, random_state=0):
+    """
+    Sample rows keeping the proportions of a categorical column (every group gets at least one row).
+
+    Args:
+        df (pd.DataFrame): Data to sample.
+        by (str): Column to stratify on. None picks the non-constant column with the fewest distinct values.
+        n (int): Approximate number of rows.
+        random_state (int): Seed, so the same data always gives the same sample.
+
+    Returns:
+        pd.DataFrame: The sample, in the original row order.
+    """
+    if len(df) <= n:
+        return df
+    if by is None:
+        unique = df.nunique()
+        candidates = unique[(unique > 1) & (unique <= n)]
+        by = candidates.idxmin() if not candidates.empty else None
+    if by is None:
+        return df.sample(n, random_state=random_state).sort_index()
+
+    sizes = df[by].value_counts(dropna=False)
+    quotas = np.maximum(1, np.round(sizes * n / len(df))).astype(int)
+    parts = [
+        group.sample(min(len(group), quotas[key]), random_state=random_state)
+        for key, group in df.groupby(by, dropna=False, observed=True)
+    ]
+    return pd.concat(parts).sort_index()
+
+
+def profile_to_prompt(profile, sample=None):
+    """
+    Returns:
+        str: The profile (compact JSON) and the sample (CSV) to paste in an LLM prompt.
+    """
+    text = "Dataset profile (computed on all rows):\n" + json.dumps(profile, separators=(",", ":"), ensure_ascii=False)
+    if sample is not None:
+        text += f"\n\nStratified sample ({len(sample)} of {profile['rows']} rows, CSV):\n" + sample.to_csv(index=False)
+    return text
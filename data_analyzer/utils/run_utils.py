@@ -0,0 +1,186 @@
+import time
+
+# statuses after which a run does not change anymore (requires_action waits for tool outputs
+# this code never submits, so it is treated as an end too and the run is cancelled)
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled", "incomplete", "requires_action")
+
+
+class RunError(Exception):
+    """
+    An assistant run ended without completing, or did not end before the deadline.
+
+    Attributes:
+        status (str): Last status of the run ("failed", "expired", "timeout"...).
+        run: The last run object received.
+    """
+
+    def __init__(self, message, status, run=None):
+        super().__init__(message)
+        self.status = status
+        self.run = run
+
+
+class RunWaiter:
+    """
+    Starts an assistant run and waits for its end.
+
+    The run is followed through the streaming API when the client has it (one request, pushed
+    status changes, no polling); otherwise, or if the stream breaks before the end, its status is
+    polled with exponential backoff: `initial_interval`, multiplied by `backoff` after each
+    unchanged status, capped at `max_interval`, reset when the status changes.
+
+    The client-side time spent in each status is recorded in `durations` (`queued_seconds` and
+    `running_seconds` for the common ones).
+
+    Args:
+        openai (OpenAI): Client.
+        deadline_seconds (float): Overall limit; the run is cancelled when it is reached.
+        initial_interval (float): First polling interval, in seconds.
+        max_interval (float): Polling interval cap.
+        backoff (float): Growth factor of the polling interval.
+        on_progress (callable): on_progress(status, elapsed_seconds, run), called at every status change.
+        use_streaming (bool): Set to False to always poll.
+    """
+
+    def __init__(self, openai, deadline_seconds=600, initial_interval=0.5, max_interval=8.0, backoff=2.0,
+                 on_progress=None, use_streaming=True):
+        self.openai = openai
+        self.deadline_seconds = deadline_seconds
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.on_progress = on_progress
+        self.use_streaming = use_streaming
+        self._reset()
+
+    def _reset(self):
+        self.start = time.monotonic()
+        self.status = None
+        self.status_since = self.start
+        self.durations = {}
+        self.polls = 0
+        self.streamed = False
+
+    @property
+    def queued_seconds(self):
+        return self.durations.get("queued", 0.0)
+
+    @property
+    def running_seconds(self):
+        return self.durations.get("in_progress", 0.0)
+
+    @property
+    def elapsed_seconds(self):
+        return time.monotonic() - self.start
+
+    def _observe(self, run):
+        # account the time spent in the previous status and report the change
+        if run.status == self.status:
+            return False
+        now = time.monotonic()
+        if self.status is not None:
+            self.durations[self.status] = self.durations.get(self.status, 0.0) + now - self.status_since
+        self.status = run.status
+        self.status_since = now
+        if self.on_progress is not None:
+            self.on_progress(run.status, now - self.start, run)
+        return True
+
+    def _finish(self, thread_id, run):
+        self._observe(run)
+        if run.status == "completed":
+            return run
+        if run.status == "requires_action":
+            self._cancel(thread_id, run.id)
+            raise RunError("❌ Assistant run requires an action (tool call) this analysis does not handle.", run.status, run)
+        details = getattr(run, "last_error", None) or getattr(run, "incomplete_details", None)
+        reason = f": {getattr(details, 'message', None) or getattr(details, 'reason', None) or details}" if details else ""
+        raise RunError(f"❌ Assistant execution {run.status}{reason}.", run.status, run)
+
+    def _cancel(self, thread_id, run_id):
+        try:
+            self.openai.beta.threads.runs.cancel(run_id, thread_id=thread_id)
+        except Exception as e:
+            print(f"⚠️ Could not cancel run {run_id}: {e}")
+
+    def _timeout(self, thread_id, run):
+        # the run never left its last status: count the time spent in it until now
+        now = time.monotonic()
+        self.durations[self.status] = self.durations.get(self.status, 0.0) + now - self.status_since
+        self.status_since = now
+        self._cancel(thread_id, run.id)
+        raise RunError(f"❌ Assistant run did not finish within {self.deadline_seconds}s (last status: {run.status}).", "timeout", run)
+
+    def run(self, thread_id, assistant_id, **options):
+        """
+        Start a run of the assistant on the thread and wait for its end.
+
+        Returns:
+            Run: The completed run.
+
+        Raises:
+            RunError: The run failed, expired, was cancelled, stopped incomplete, required an action
+                or exceeded the deadline.
+        """
+        self._reset()
+        runs = self.openai.beta.threads.runs
+        if not self.use_streaming or not hasattr(runs, "stream"):
+            run = runs.create(thread_id=thread_id, assistant_id=assistant_id, **options)
+            return self.wait(thread_id, run.id, run)
+
+        run = None
+        try:
+            with runs.stream(thread_id=thread_id, assistant_id=assistant_id, timeout=self.deadline_seconds, **options) as stream:
+                self.streamed = True
+                for event in stream:
+                    if not event.event.startswith("thread.run.") or event.event.startswith("thread.run.step"):
+                        continue
+                    run = event.data
+                    self._observe(run)
+                    if run.status in TERMINAL_STATUSES:
+                        return self._finish(thread_id, run)
+                    if self.elapsed_seconds > self.deadline_seconds:
+                        self._timeout(thread_id, run)
+        except RunError:
+            raise
+        except Exception as e:
+            if run is None:
+                raise
+            print(f"⚠️ Run stream interrupted ({e}), polling instead")
+        if run is None:
+            raise RunError("❌ The run stream ended before the run was created.", "unknown")
+        # the stream ended (or broke) before a final status
+        return self.wait(thread_id, run.id, run)
+
+    def wait(self, thread_id, run_id, run=None):
+        """
+        Poll an existing run with exponential backoff until it ends or the deadline is reached.
+
+        Returns:
+            Run: The completed run.
+
+        Raises:
+            RunError: See run().
+        """
+        interval = self.initial_interval
+        while True:
+            if run is not None:
+                if run.status in TERMINAL_STATUSES:
+                    return self._finish(thread_id, run)
+                if self._observe(run):
+                    interval = self.initial_interval
+                remaining = self.deadline_seconds - self.elapsed_seconds
+                if remaining <= 0:
+                    self._timeout(thread_id, run)
+                time.sleep(min(interval, remaining))
+                interval = min(interval * self.backoff, self.max_interval)
+            run = self.openai.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run_id)
+            self.polls += 1
+
+    def summary(self):
+        """
+        Returns:
+            str: Time queued and running, and how the run was followed.
+        """
+        mode = "streamed" if self.streamed else f"{self.polls} polls"
+        return f"{self.queued_seconds:.1f}s queued, {self.running_seconds:.1f}s running ({mode})"
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import sys
+import time
+
+# shared modules (common_utils/) live in the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common_utils.llm_client import get_client
+
+
+def hash_dataset(csv_path, block_size=1024 * 1024, **settings):
+    """
+    Identify a dataset by the SHA-256 of its content and of the settings that change its anonymized
+    version, so the same data processed the same way maps to the same session entry whatever the path.
+
+    Args:
+        csv_path (str): Input file.
+        block_size (int): Bytes hashed at a time (the file is never loaded whole).
+        **settings: JSON-serializable settings (anonymized columns, output format...).
+
+    Returns:
+        str: Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class AnalysisSession:
+    """
+    Keeps what a follow-up question about the same dataset can reuse: the anonymized file on disk,
+    its OpenAI upload, the conversation thread, the dataset profile sent to the model, and the
+    assistants (one per model and temperature).
+
+    Entries unused for `ttl_seconds` are torn down (remote file and thread deleted) the next time
+    the session is used, or by cleanup_expired(). close() tears everything down; the session is
+    also a context manager.
+
+    Args:
+        ttl_seconds (float): Idle time after which a dataset or an assistant is cleaned up.
+        openai (OpenAI): Client to use (default: the shared pooled client).
+    """
+
+    def __init__(self, ttl_seconds=3600, openai=None):
+        self.ttl_seconds = ttl_seconds
+        self._openai = openai
+        self.datasets = {}
+        self.assistants = {}
+
+    @property
+    def openai(self):
+        if self._openai is None:
+            self._openai = get_client().openai
+        return self._openai
+
+    def get_dataset(self, key):
+        """
+        Returns:
+            dict: The entry of the dataset, or None when it is unknown or its anonymized file was
+                modified or removed since (e.g. overwritten by another dataset with the same output name).
+        """
+        self.cleanup_expired()
+        entry = self.datasets.get(key)
+        if entry is None:
+            return None
+        entry["last_used"] = time.monotonic()
+        try:
+            if _fingerprint(entry["path"]) == entry["fingerprint"]:
+                return entry
+        except OSError:
+            pass
+        return None
+
+    def add_dataset(self, key, path, report_lines=()):
+        """
+        Register the anonymized file of a dataset. The remote objects of a known key (uploaded
+        file, thread) are kept: they were created from the same content.
+
+        Returns:
+            dict: The entry.
+        """
+        self.cleanup_expired()
+        entry = self.datasets.setdefault(key, {
+            "file_id": None,
+            "thread_id": None,
+            "file_attached": False,
+            "context_sent": None,
+            "contexts": {},
+        })
+        entry.update(
+            path=path,
+            fingerprint=_fingerprint(path),
+            report_lines=list(report_lines),
+            last_used=time.monotonic(),
+        )
+        return entry
+
+    def file_id(self, key):
+        """
+        Returns:
+            tuple: (file_id, reused) - the file is uploaded on first use only.
+        """
+        entry = self.datasets[key]
+        if entry["file_id"] is not None:
+            return entry["file_id"], True
+        with open(entry["path"], "rb") as f:
+            entry["file_id"] = self.openai.files.create(file=f, purpose="assistants").id
+        return entry["file_id"], False
+
+    def thread_id(self, key):
+        """
+        Returns:
+            tuple: (thread_id, reused) - the thread is created on first use only.
+        """
+        entry = self.datasets[key]
+        if entry["thread_id"] is not None:
+            return entry["thread_id"], True
+        entry["thread_id"] = self.openai.beta.threads.create().id
+        return entry["thread_id"], False
+
+    def assistant_id(self, model_name, temperature, **options):
+        """
+        Returns:
+            tuple: (assistant_id, reused) - one assistant per model and temperature, created on first use.
+        """
+        self.cleanup_expired()
+        key = (model_name, temperature)
+        assistant = self.assistants.get(key)
+        reused = assistant is not None
+        if not reused:
+            assistant = {"id": self.openai.beta.assistants.create(model=model_name, temperature=temperature, **options).id}
+            self.assistants[key] = assistant
+        assistant["last_used"] = time.monotonic()
+        return assistant["id"], reused
+
+    def remove_dataset(self, key):
+        """
+        Forget a dataset and delete its uploaded file and thread (the local files are kept).
+        """
+        entry = self.datasets.pop(key, None)
+        if entry is None:
+            return
+        if entry["thread_id"] is not None:
+            self._delete(self.openai.beta.threads.delete, entry["thread_id"])
+        if entry["file_id"] is not None:
+            self._delete(self.openai.files.delete, entry["file_id"])
+
+    def cleanup_expired(self):
+        """
+        Tear down the datasets and assistants idle for more than ttl_seconds.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        limit = time.monotonic() - self.ttl_seconds
+        expired = [key for key, entry in self.datasets.items() if entry["last_used"] < limit]
+        for key in expired:
+            self.remove_dataset(key)
+        idle = [key for key, assistant in self.assistants.items() if assistant["last_used"] < limit]
+        for key in idle:
+            self._delete(self.openai.beta.assistants.delete, self.assistants.pop(key)["id"])
+        return len(expired) + len(idle)
+
+    def close(self):
+        """
+        Delete every uploaded file, thread and assistant of the session.
+        """
+        for key in list(self.datasets):
+            self.remove_dataset(key)
+        for key in list(self.assistants):
+            self._delete(self.openai.beta.assistants.delete, self.assistants.pop(key)["id"])
+
+    def _delete(self, delete, object_id):
+        # teardown must go on when an object is already gone (deleted elsewhere, expired...)
+        try:
+            delete(object_id)
+        except Exception as e:
+            print(f"⚠️ Could not delete {object_id}: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,178 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+# largest integer magnitude float64 holds exactly
+FLOAT_EXACT_INTEGER = 2 ** 53
+
+
+def dataset_path(directory, file_name, fmt):
+    """
+    Returns:
+        str: Path of the dataset file, with the extension of the format.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Invalid format '{fmt}'. Use one of: {', '.join(FORMATS)}")
+    return os.path.join(directory, os.path.splitext(file_name)[0] + FORMATS[fmt])
+
+
+class DatasetWriter:
+    """
+    Writes a dataset chunk by chunk as CSV, Parquet or Arrow IPC.
+
+    For the columnar formats the schema is fixed by the first chunk. Integer columns are stored as
+    float64, because a later chunk may parse them as floats (missing or fractional values) and the
+    schema cannot change mid-file; only integers beyond 2**53, which float64 cannot hold exactly, stay
+    int64, and a later chunk that cannot be stored in them exactly raises a ValueError. Text
+    columns are stored as strings. Parquet dictionary-encodes them itself, per row group. In Arrow files the
+    categorical columns stay dictionary-encoded with one dictionary for the whole file, which only
+    grows (new values are sent as delta dictionaries), so low-cardinality codes read back as
+    categoricals; high-cardinality text such as hashed identifiers is stored as plain strings.
+    Arrow uses the IPC stream format, and is memory-mapped when read back.
+
+    Args:
+        path (str): Output file.
+        fmt (str): "csv", "parquet" or "arrow".
+    """
+
+    def __init__(self, path, fmt="csv"):
+        if fmt not in FORMATS:
+            raise ValueError(f"Invalid format '{fmt}'. Use one of: {', '.join(FORMATS)}")
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self.schema = None
+        self.codes = {}
+        self.dictionaries = {}
+        self.writer = None
+
+    def _build_schema(self, chunk):
+        import pyarrow as pa
+
+        fields = []
+        for field in pa.Schema.from_pandas(chunk, preserve_index=False):
+            if pa.types.is_integer(field.type):
+                values = chunk[field.name].dropna()
+                exact = values.empty or max(abs(int(values.min())), abs(int(values.max()))) <= FLOAT_EXACT_INTEGER
+                field = field.with_type(pa.float64() if exact else pa.int64())
+            elif pa.types.is_dictionary(field.type) and self.fmt == "arrow":
+                field = field.with_type(pa.dictionary(pa.int32(), pa.string()))
+            elif (pa.types.is_dictionary(field.type) or pa.types.is_string(field.type)
+                  or pa.types.is_large_string(field.type) or pa.types.is_null(field.type)):
+                field = field.with_type(pa.string())
+            fields.append(field)
+        return pa.schema(fields)
+
+    def _encode(self, series):
+        # map the chunk's categories to file-wide codes; only new values are added to the dictionary
+        import pyarrow as pa
+
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype("category")
+        codes = self.codes.setdefault(series.name, {})
+        categories = series.cat.categories.astype(str)
+        mapping = np.empty(len(categories) + 1, dtype="int32")
+        new_values = []
+        for position, value in enumerate(categories):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+                new_values.append(value)
+            mapping[position] = code
+        mapping[-1] = 0  # missing values (code -1), masked below
+
+        dictionary = self.dictionaries.get(series.name)
+        if dictionary is None:
+            dictionary = pa.array(new_values, type=pa.string())
+        elif new_values:
+            dictionary = pa.concat_arrays([dictionary, pa.array(new_values, type=pa.string())])
+        self.dictionaries[series.name] = dictionary
+
+        chunk_codes = series.cat.codes.to_numpy()
+        return pa.DictionaryArray.from_arrays(
+            pa.array(mapping[chunk_codes], type=pa.int32(), mask=chunk_codes < 0),
+            dictionary,
+        )
+
+    def _to_table(self, chunk):
+        import pyarrow as pa
+
+        arrays = []
+        for field in self.schema:
+            if pa.types.is_dictionary(field.type):
+                arrays.append(self._encode(chunk[field.name]))
+            else:
+                array = pa.array(chunk[field.name], from_pandas=True)
+                try:
+                    arrays.append(array.cast(field.type))
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                    raise ValueError(
+                        f"Column '{field.name}' was {field.type} in the first chunk but a later chunk has "
+                        f"{array.type} values that cannot be stored in it ({e}). Use output_format='csv' for this file."
+                    ) from e
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+    def write(self, chunk):
+        """
+        Append one chunk (pd.DataFrame) to the file.
+        """
+        if self.fmt == "csv":
+            chunk.to_csv(self.path, index=False, mode="w" if self.rows == 0 else "a", header=self.rows == 0)
+            self.rows += len(chunk)
+            return
+
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            self.schema = self._build_schema(chunk)
+            if self.fmt == "parquet":
+                self.writer = pq.ParquetWriter(self.path, self.schema, use_dictionary=True, compression="snappy")
+            else:
+                self.writer = ipc.new_stream(self.path, self.schema, options=ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+        self.writer.write_table(self._to_table(chunk))
+        self.rows += len(chunk)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_dataset(path, columns=None):
+    """
+    Load a dataset written by DatasetWriter (format taken from the extension).
+
+    Parquet and Arrow files are memory-mapped, so reloading them for a follow-up question takes
+    milliseconds instead of re-parsing the CSV. Dictionary-encoded Arrow columns come back as categoricals.
+
+    Args:
+        path (str): Dataset file.
+        columns (list): Optional subset of columns to load.
+
+    Returns:
+        pd.DataFrame: The dataset.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == FORMATS["parquet"]:
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    if extension == FORMATS["arrow"]:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        with pa.memory_map(path, "r") as source:
+            table = ipc.open_stream(source).read_all()
+            if columns is not None:
+                table = table.select(columns)
+            return table.to_pandas()
+    return pd.read_csv(path, usecols=columns)
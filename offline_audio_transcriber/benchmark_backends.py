@@ -0,0 +1,84 @@
+"""
+Compare the transcription backends on an audio file: load time, real-time factor and word error rate.
+
+Usage (from offline_audio_transcriber/):
+    python benchmark_backends.py --model-size base --backends whisper whisper-int8 faster-whisper
+
+Without --reference, the first backend's transcript is used as reference for the WER of the others.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import whisper
+
+from utils.backends import available_backends, load_backend
+from utils.chunking_utils import SAMPLE_RATE
+from utils.metrics_utils import word_error_rate
+
+DEFAULT_AUDIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "input", "audio_sample.mp3")
+
+
+def benchmark_backend(name, model_size, audio, language=None):
+    """
+    Returns:
+        dict: Load seconds, transcription seconds, real-time factor and transcript of one backend.
+    """
+    start = time.perf_counter()
+    backend = load_backend(name, model_size, "cpu")
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = backend.transcribe(audio, language=language, temperature=0)
+    seconds = time.perf_counter() - start
+
+    return {
+        "backend": name,
+        "load_seconds": round(load_seconds, 2),
+        "transcribe_seconds": round(seconds, 2),
+        "rtf": round(seconds / (len(audio) / SAMPLE_RATE), 3),
+        "text": result["text"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", default=DEFAULT_AUDIO, help="Audio file to transcribe")
+    parser.add_argument("--model-size", default="base", help="Whisper model size")
+    parser.add_argument("--backends", nargs="+", default=["whisper", "whisper-int8"], choices=available_backends())
+    parser.add_argument("--language", default=None, help="Audio language (detected when omitted)")
+    parser.add_argument("--reference", default=None, help="Text file with the reference transcript")
+    args = parser.parse_args()
+
+    audio = whisper.load_audio(args.audio)
+    print(f"🎧 {args.audio}: {len(audio) / SAMPLE_RATE:.1f}s of audio, model {args.model_size}")
+
+    reference = None
+    if args.reference:
+        with open(args.reference, "r", encoding="utf-8") as f:
+            reference = f.read()
+
+    results = []
+    for name in args.backends:
+        print(f"⏱️ Benchmarking {name}...")
+        try:
+            results.append(benchmark_backend(name, args.model_size, audio, args.language))
+        except ImportError as e:
+            print(f"⚠️ Skipping {name}: {e}")
+
+    if not results:
+        return
+    reference_name = "reference file" if reference is not None else results[0]["backend"]
+    reference = reference if reference is not None else results[0]["text"]
+
+    print(f"\n| Backend | Load (s) | Transcribe (s) | RTF | WER vs {reference_name} |")
+    print("|---|---|---|---|---|")
+    for r in results:
+        print(f"| {r['backend']} | {r['load_seconds']} | {r['transcribe_seconds']} | {r['rtf']} | {word_error_rate(reference, r['text']):.3f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.chunking_utils import iter_stitched_segments, merge_overlap, plan_windows, stitch_segments
+
+SAMPLE_RATE = 16000
+
+
+def noisy(seconds, seed=0):
+    return (np.random.RandomState(seed).randn(int(seconds * SAMPLE_RATE)) * 0.3).astype(np.float32)
+
+
+def test_short_audio_is_one_window():
+    audio = noisy(10)
+
+    assert plan_windows(audio, SAMPLE_RATE, window_seconds=30) == [(0, len(audio), 0, len(audio))]
+
+
+def test_windows_own_the_whole_timeline_and_cut_at_silences():
+    # 95 s of noise with silences around 30 s and 62 s
+    audio = noisy(95)
+    for second in (30, 62):
+        audio[int((second - 0.5) * SAMPLE_RATE):int((second + 0.5) * SAMPLE_RATE)] = 0
+    windows = plan_windows(audio, SAMPLE_RATE, window_seconds=30, overlap_seconds=2, search_seconds=5)
+
+    assert windows[0][2] == 0 and windows[-1][3] == len(audio)
+    for (_, _, _, own_end), (_, _, next_start, _) in zip(windows, windows[1:]):
+        assert own_end == next_start
+    for start, end, own_start, own_end in windows:
+        assert start == max(0, own_start - 2 * SAMPLE_RATE)
+        assert end == min(len(audio), own_end + 2 * SAMPLE_RATE)
+    cuts = [own_end / SAMPLE_RATE for _, _, _, own_end in windows[:2]]
+    assert cuts[0] == pytest.approx(30, abs=0.5)
+    assert cuts[1] == pytest.approx(62, abs=0.5)
+
+
+@pytest.mark.parametrize("previous, following, expected", [
+    ("we should ship the release on friday", "on Friday, and then rest.", "and then rest."),
+    ("the end.", "Something new here.", "Something new here."),
+    ("", "first words", "first words"),
+    ("it's done", "It's done now", "now"),
+])
+def test_merge_overlap(previous, following, expected):
+    assert merge_overlap(previous, following) == expected
+
+
+def make_windows():
+    # two windows: 0-12 s and 8-20 s, cut at 10 s
+    return [(0, 12 * SAMPLE_RATE, 0, 10 * SAMPLE_RATE), (8 * SAMPLE_RATE, 20 * SAMPLE_RATE, 10 * SAMPLE_RATE, 20 * SAMPLE_RATE)]
+
+
+def test_stitching_across_a_window_boundary():
+    first = [
+        {"start": 0.0, "end": 4.0, "text": " We met on Monday."},
+        {"start": 4.0, "end": 9.5, "text": " The budget is approved"},
+        {"start": 9.5, "end": 12.0, "text": " for next year"},  # midpoint 10.75: owned by the second window
+    ]
+    second = [
+        {"start": 8.0, "end": 9.0, "text": " approved"},  # midpoint 8.5: owned by the first window
+        {"start": 9.0, "end": 12.0, "text": " approved for next year"},
+        {"start": 12.0, "end": 20.0, "text": " and hiring starts soon."},
+    ]
+
+    result = stitch_segments([first, second], make_windows())
+
+    assert [s["start"] for s in result["segments"]] == [0.0, 4.0, 9.0, 12.0]
+    # "approved" was already at the end of the first window
+    assert result["text"] == "We met on Monday. The budget is approved for next year and hiring starts soon."
+
+
+def test_incremental_stitching_matches_the_batch_result():
+    first = [{"start": 0.0, "end": 9.0, "text": " one two three"}]
+    second = [{"start": 9.0, "end": 11.0, "text": " three four"}, {"start": 11.0, "end": 19.0, "text": " five"}]
+    produced = []
+
+    def windows_segments():
+        for segments in (first, second):
+            yield segments
+            produced.append(len(segments))
+
+    stitched = iter_stitched_segments(windows_segments(), make_windows())
+    assert next(stitched)["text"] == " one two three"
+    # the first window is yielded before the second one is produced
+    assert produced == []
+    rest = list(stitched)
+
+    assert [s["text"] for s in rest] == [" four", " five"]
+    assert rest == stitch_segments([first, second], make_windows())["segments"][1:]
+
+
+def test_empty_segments_are_dropped():
+    first = [{"start": 0.0, "end": 9.0, "text": " hello there"}]
+    second = [{"start": 9.0, "end": 11.0, "text": " there"}, {"start": 11.0, "end": 19.0, "text": "  "}]
+
+    result = stitch_segments([first, second], make_windows())
+
+    assert result["text"] == "hello there"
+    assert len(result["segments"]) == 1
@@ -0,0 +1,84 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.vad_utils import EnergyVAD, TimestampRemap, transcribe_speech
+
+SAMPLE_RATE = 16000
+
+
+def speech_like(seconds, seed=0):
+    return (np.random.RandomState(seed).randn(int(seconds * SAMPLE_RATE)) * 0.3).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+@pytest.fixture
+def audio():
+    # 1 s silence, 2 s speech, 3 s silence, 1.5 s speech, 2 s silence
+    return np.concatenate([silence(1), speech_like(2, 1), silence(3), speech_like(1.5, 2), silence(2)])
+
+
+def test_compacted_samples_map_back_to_the_same_audio(audio):
+    speech, remap = EnergyVAD().compact(audio)
+
+    assert 3.5 * SAMPLE_RATE <= len(speech) < 5 * SAMPLE_RATE
+    for index in range(0, len(speech), 997):
+        original = int(round(remap.remap(index / SAMPLE_RATE) * SAMPLE_RATE))
+        assert speech[index] == audio[original]
+
+
+def test_remap_round_trip_of_region_bounds():
+    remap = TimestampRemap(compact_starts=[0.0, 2.0], original_starts=[1.0, 6.0], lengths=[2.0, 1.5])
+
+    assert remap.remap(0.0) == 1.0
+    assert remap.remap(1.25) == 2.25
+    assert remap.remap(2.5) == 6.5
+    # a time on a boundary is the start of the next region, or the end of the previous one for segment ends
+    assert remap.remap(2.0) == 6.0
+    assert remap.remap(2.0, end=True) == 3.0
+    # past the last region: clamped to its end
+    assert remap.remap(10.0) == 7.5
+    for compact, original, length in remap.table():
+        assert remap.remap(compact) == original
+        assert remap.remap(compact + length, end=True) == original + length
+
+
+def test_remap_segments_keeps_the_other_fields():
+    remap = TimestampRemap([0.0, 2.0], [1.0, 6.0], [2.0, 1.5])
+    segments = remap.remap_segments([{"start": 0.5, "end": 2.0, "text": " hi"}, {"start": 2.0, "end": 3.0, "text": " there"}])
+
+    assert segments == [{"start": 1.5, "end": 3.0, "text": " hi"}, {"start": 6.0, "end": 7.0, "text": " there"}]
+
+
+def test_stats_range_counts_only_the_owned_part(audio):
+    whole = EnergyVAD()
+    whole.compact(audio)
+
+    windows = EnergyVAD()
+    half = len(audio) // 2
+    # two overlapping windows, each counting only its own half of the timeline
+    windows.compact(audio[: half + SAMPLE_RATE], stats_range=(0, half))
+    windows.compact(audio[half - SAMPLE_RATE:], stats_range=(SAMPLE_RATE, len(audio) - half + SAMPLE_RATE))
+
+    assert windows.total_seconds == pytest.approx(len(audio) / SAMPLE_RATE)
+    assert windows.speech_seconds == pytest.approx(whole.speech_seconds, abs=0.1)
+
+
+def test_transcribe_speech_returns_original_times(audio):
+    class FakeModel:
+        def transcribe(self, samples, **options):
+            seconds = len(samples) / SAMPLE_RATE
+            return {"text": " all", "segments": [{"start": 0.0, "end": seconds, "text": " all"}]}
+
+    result = transcribe_speech(FakeModel(), audio, EnergyVAD())
+
+    segment = result["segments"][0]
+    assert 0.5 < segment["start"] < 1.0
+    # the second speech burst ends at 7.5 s (plus the padding)
+    assert 7.5 <= segment["end"] < 8.0
@@ -0,0 +1,148 @@
+import torch
+import whisper
+
+BACKENDS = {}
+
+
+def register_backend(name):
+    """
+    Class decorator making a transcription backend selectable by name.
+    """
+    def decorator(cls):
+        BACKENDS[name] = cls
+        cls.name = name
+        return cls
+    return decorator
+
+
+def available_backends():
+    """
+    Returns:
+        list: Names of the registered backends.
+    """
+    return sorted(BACKENDS)
+
+
+def load_backend(name, model_size, device="cpu"):
+    """
+    Load a model with the given backend.
+
+    Args:
+        name (str): Backend name (see available_backends()).
+        model_size (str): Whisper model size ("tiny", "base", "small", "medium"...).
+        device (str): "cpu" or "cuda".
+
+    Returns:
+        TranscriptionBackend: Object exposing transcribe(audio, **options) like a Whisper model.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend '{name}'. Use one of: {', '.join(available_backends())}")
+    return BACKENDS[name](model_size, device)
+
+
+class TranscriptionBackend:
+    """
+    Interface of the transcription backends.
+
+    transcribe(audio, **options) takes a file path or mono 16 kHz float32 samples plus Whisper's
+    transcribe options and returns {"text": str, "segments": [{"start", "end", "text"}, ...]}.
+    """
+
+    name = None
+
+    def __init__(self, model_size, device="cpu"):
+        self.model_size = model_size
+        self.device = device
+
+    def transcribe(self, audio, **options):
+        raise NotImplementedError
+
+    def memory_bytes(self):
+        """
+        Returns:
+            int: Memory held by the model weights, or None when the backend cannot tell.
+        """
+        return None
+
+
+@register_backend("whisper")
+class WhisperBackend(TranscriptionBackend):
+    """
+    Stock openai-whisper PyTorch model.
+    """
+
+    def __init__(self, model_size, device="cpu"):
+        super().__init__(model_size, device)
+        self.model = whisper.load_model(model_size, device=device)
+
+    def transcribe(self, audio, **options):
+        # half precision only helps (and is only supported) on GPU
+        options.setdefault("fp16", self.device == "cuda")
+        return self.model.transcribe(audio, **options)
+
+    def memory_bytes(self):
+        tensors = list(self.model.parameters()) + list(self.model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+
+
+@register_backend("whisper-int8")
+class WhisperInt8Backend(WhisperBackend):
+    """
+    openai-whisper with its linear layers dynamically quantized to int8 (CPU only).
+
+    Weights are stored in int8 and the matrix products run on quantized kernels,
+    which shrinks the model and speeds up decoding on CPU at a small accuracy cost.
+    """
+
+    def __init__(self, model_size, device="cpu"):
+        if device != "cpu":
+            raise ValueError("The whisper-int8 backend only runs on CPU.")
+        super().__init__(model_size, device)
+        for module in self.model.modules():
+            # whisper's Linear only overrides forward to cast the weights, quantize it as a plain Linear
+            if isinstance(module, torch.nn.Linear):
+                module.__class__ = torch.nn.Linear
+        self.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def transcribe(self, audio, **options):
+        options["fp16"] = False
+        return self.model.transcribe(audio, **options)
+
+    def memory_bytes(self):
+        total = super().memory_bytes()
+        for module in self.model.modules():
+            # quantized linear layers keep their weights packed, outside of parameters()
+            if isinstance(module, torch.ao.nn.quantized.dynamic.Linear):
+                weight, bias = module.weight(), module.bias()
+                total += weight.numel() * weight.element_size() + (bias.numel() * bias.element_size() if bias is not None else 0)
+        return total
+
+
+@register_backend("faster-whisper")
+class FasterWhisperBackend(TranscriptionBackend):
+    """
+    CTranslate2 Whisper (optional `faster-whisper` package) with int8 weights on CPU.
+    """
+
+    def __init__(self, model_size, device="cpu"):
+        super().__init__(model_size, device)
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError("The faster-whisper backend needs the package: pip install faster-whisper")
+        compute_type = "int8" if device == "cpu" else "float16"
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
+
+    def transcribe(self, audio, **options):
+        language = options.get("language")
+        if language:
+            # openai-whisper accepts language names, CTranslate2 only codes
+            language = whisper.tokenizer.TO_LANGUAGE_CODE.get(language.lower(), language)
+        segments, _ = self.model.transcribe(
+            audio,
+            language=language,
+            initial_prompt=options.get("initial_prompt"),
+            temperature=options.get("temperature", 0.0),
+        )
+        segments = [{"start": s.start, "end": s.end, "text": s.text} for s in segments]
+        return {"text": "".join(s["text"] for s in segments), "segments": segments}
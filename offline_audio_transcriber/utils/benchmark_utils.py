@@ -0,0 +1,216 @@
+"""
+Transcription benchmark: runs transcribe_audio over a grid of configurations and records
+wall time, real-time factor, peak memory, model load time and summarization time.
+
+Usage (from offline_audio_transcriber/):
+    python -m utils.benchmark_utils --audio resources/input/audio_sample.mp3 --model-sizes tiny base --workers 1 2
+
+Every configuration runs in a fresh process, so model loading is cold and peak memory is not
+inherited from the previous runs. With one worker the model is loaded first and timed on its own
+(load_seconds); with several, the parent never loads it (so peak_rss_mb is only the parent's
+own memory, workers_peak_rss_mb the largest worker) and the workers' loads are part of
+transcribe_seconds. wall_seconds always includes the loading, to compare worker counts.
+Results are appended to a CSV (with the git commit) to compare commits, and the table of the
+current run is written as Markdown.
+"""
+import argparse
+import csv
+import datetime
+import itertools
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+COLUMNS = [
+    "timestamp", "commit", "dirty", "host", "cpus", "audio", "audio_seconds", "model_size", "backend",
+    "workers", "window_seconds", "vad", "wall_seconds", "rtf", "load_seconds", "transcribe_seconds",
+    "summary_seconds", "peak_rss_mb", "workers_peak_rss_mb",
+]
+
+
+def peak_rss_mb(children=False):
+    """
+    Peak resident memory of this process (or of its largest finished child process).
+
+    Returns:
+        float: Megabytes, or None when the platform does not report it.
+    """
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, kilobytes on Linux
+        return round(usage / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    if psutil is not None and not children and hasattr(psutil.Process().memory_info(), "peak_wset"):
+        return round(psutil.Process().memory_info().peak_wset / (1024 * 1024), 1)
+    return None
+
+
+def git_info(path=None):
+    """
+    Returns:
+        dict: "commit" (short hash) and "dirty" (uncommitted changes) of the repository, None values outside git.
+    """
+    path = path or os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=path, capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=path, capture_output=True, text=True, check=True).stdout
+        return {"commit": commit, "dirty": bool(status.strip())}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def audio_duration(audio_path):
+    """
+    Returns:
+        float: Length of the audio file in seconds.
+    """
+    import whisper
+    return len(whisper.load_audio(audio_path)) / whisper.audio.SAMPLE_RATE
+
+
+def _run_configuration(config):
+    # runs in a fresh process: imports, model loading and memory are not shared with other runs
+    from .model_registry import load_model
+    from .transcription_utils import transcribe_audio
+
+    # wall_seconds includes the model loading whatever the worker count, so rows compare
+    wall_start = time.perf_counter()
+    load_seconds = None
+    if config["workers"] == 1:
+        load_model(config["model_size"], backend=config["backend"])
+        load_seconds = time.perf_counter() - wall_start
+    # with several workers the parent never loads the model (peak_rss_mb is a high-water mark, an
+    # unused copy would stay in it): each worker loads its own, within transcribe_seconds
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        transcribe_audio(
+            config["audio"], output_dir, config["model_size"], config["language"],
+            workers=config["workers"], window_seconds=config["window_seconds"], vad=config["vad"],
+            backend=config["backend"], summarize=config["summarize"], timings=timings,
+        )
+        wall_seconds = time.perf_counter() - wall_start
+
+    return {
+        "wall_seconds": round(wall_seconds, 2),
+        "load_seconds": round(load_seconds, 2) if load_seconds is not None else None,
+        "transcribe_seconds": round(timings["transcribe_seconds"], 2),
+        "summary_seconds": round(timings["summary_seconds"], 2) if "summary_seconds" in timings else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "workers_peak_rss_mb": peak_rss_mb(children=True) if config["workers"] > 1 else None,
+    }
+
+
+def run_benchmark(audio_files, model_sizes=("base",), backends=("whisper",), workers=(1,), window_seconds=(300,),
+                  vad=(False,), language="english", summarize=False, results_dir="benchmark_results"):
+    """
+    Run transcribe_audio on every combination of the given settings.
+
+    Args:
+        audio_files (list): Audio files to transcribe.
+        model_sizes, backends, workers, window_seconds, vad (tuple): Values compared for each setting.
+        language (str): Language of the summaries.
+        summarize (bool): Also time the summarization (needs the local Ollama server).
+        results_dir (str): Folder of results.csv (appended across runs) and the Markdown table of this run.
+
+    Returns:
+        list: One result row (see COLUMNS) per configuration.
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    git = git_info()
+    run_info = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git["commit"],
+        "dirty": git["dirty"],
+        "host": platform.node(),
+        "cpus": os.cpu_count(),
+    }
+    durations = {audio: audio_duration(audio) for audio in audio_files}
+
+    rows = []
+    grid = list(itertools.product(audio_files, model_sizes, backends, workers, window_seconds, vad))
+    for index, (audio, model_size, backend, worker_count, window, use_vad) in enumerate(grid, start=1):
+        config = {
+            "audio": audio, "model_size": model_size, "backend": backend, "workers": worker_count,
+            "window_seconds": window, "vad": use_vad, "language": language, "summarize": summarize,
+        }
+        print(f"⏱️ [{index}/{len(grid)}] {os.path.basename(audio)} | {model_size} | {backend} | {worker_count} workers | {window}s windows | vad={use_vad}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            measures = executor.submit(_run_configuration, config).result()
+
+        row = dict(run_info, audio=os.path.basename(audio), audio_seconds=round(durations[audio], 1),
+                   model_size=model_size, backend=backend, workers=worker_count, window_seconds=window, vad=use_vad,
+                   **measures)
+        row["rtf"] = round(row["transcribe_seconds"] / row["audio_seconds"], 3) if row["audio_seconds"] else None
+        rows.append(row)
+
+    write_csv(rows, os.path.join(results_dir, "results.csv"))
+    markdown_path = os.path.join(results_dir, f"benchmark_{run_info['timestamp'].replace(':', '-')}_{git['commit'] or 'nogit'}.md")
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(to_markdown(rows))
+    print(to_markdown(rows))
+    print(f"📊 Results appended to {os.path.join(results_dir, 'results.csv')}, table saved at {markdown_path}")
+    return rows
+
+
+def write_csv(rows, path):
+    """
+    Append result rows to a CSV file, writing the header when the file is new.
+    """
+    new = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        if new:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def to_markdown(rows):
+    """
+    Returns:
+        str: Markdown comparison table of the result rows.
+    """
+    columns = ["audio", "model_size", "backend", "workers", "window_seconds", "vad", "wall_seconds", "rtf",
+               "load_seconds", "transcribe_seconds", "summary_seconds", "peak_rss_mb", "workers_peak_rss_mb"]
+    header = f"Commit `{rows[0]['commit']}`{' (dirty)' if rows[0]['dirty'] else ''} on {rows[0]['host']} ({rows[0]['cpus']} CPUs), {rows[0]['timestamp']}\n\n" if rows else ""
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    for row in rows:
+        lines.append("| " + " | ".join("" if row[c] is None else str(row[c]) for c in columns) + " |")
+    return header + "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", nargs="+", required=True, help="Audio files to transcribe")
+    parser.add_argument("--model-sizes", nargs="+", default=["base"])
+    parser.add_argument("--backends", nargs="+", default=["whisper"])
+    parser.add_argument("--workers", nargs="+", type=int, default=[1])
+    parser.add_argument("--window-seconds", nargs="+", type=float, default=[300])
+    parser.add_argument("--vad", action="store_true", help="Compare runs with and without VAD")
+    parser.add_argument("--summarize", action="store_true", help="Also time the summarization (needs Ollama)")
+    parser.add_argument("--language", default="english")
+    parser.add_argument("--results-dir", default="benchmark_results")
+    args = parser.parse_args()
+
+    run_benchmark(
+        args.audio, args.model_sizes, args.backends, args.workers, args.window_seconds,
+        (False, True) if args.vad else (False,), args.language, args.summarize, args.results_dir,
+    )
+
+
+if __name__ == "__main__":
+    main()
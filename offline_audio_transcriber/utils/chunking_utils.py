@@ -0,0 +1,133 @@
+import re
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+
+
+def frame_energy(audio, frame_samples):
+    """
+    RMS energy of consecutive non-overlapping frames (vectorized).
+
+    Args:
+        audio (np.ndarray): Mono float32 samples.
+        frame_samples (int): Samples per frame.
+
+    Returns:
+        np.ndarray: One RMS value per frame (the last partial frame is padded with zeros).
+    """
+    frames = -(-len(audio) // frame_samples)
+    padded = np.zeros(frames * frame_samples, dtype=np.float32)
+    padded[:len(audio)] = audio
+    return np.sqrt(np.mean(np.square(padded.reshape(frames, frame_samples)), axis=1))
+
+
+def plan_windows(audio, sample_rate=SAMPLE_RATE, window_seconds=300, overlap_seconds=2.0, search_seconds=15.0):
+    """
+    Split audio into overlapping windows, cutting at the quietest point near each window boundary.
+
+    Args:
+        audio (np.ndarray): Mono float32 samples.
+        sample_rate (int): Samples per second.
+        window_seconds (float): Target length of each window.
+        overlap_seconds (float): Audio shared with the neighbour window on each side of a cut.
+        search_seconds (float): How far from the target boundary to look for silence.
+
+    Returns:
+        list: (start, end, own_start, own_end) sample indexes per window. [start, end) is the audio
+            to transcribe, [own_start, own_end) the part of the timeline this window is responsible for.
+    """
+    total = len(audio)
+    window = int(window_seconds * sample_rate)
+    if total <= window:
+        return [(0, total, 0, total)]
+
+    frame_samples = max(1, int(FRAME_SECONDS * sample_rate))
+    energy = frame_energy(audio, frame_samples)
+    search = int(search_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+
+    cuts = [0]
+    while total - cuts[-1] > window:
+        target = cuts[-1] + window
+        low = max(cuts[-1] + window // 2, target - search) // frame_samples
+        high = min(total, target + search) // frame_samples
+        quietest = low + int(np.argmin(energy[low:high])) if high > low else target // frame_samples
+        cuts.append(quietest * frame_samples)
+    cuts.append(total)
+
+    return [
+        (max(0, own_start - overlap), min(total, own_end + overlap), own_start, own_end)
+        for own_start, own_end in zip(cuts[:-1], cuts[1:])
+    ]
+
+
+def _normalize_words(text):
+    return [re.sub(r"[^\w']", "", word.lower()) for word in text.split()]
+
+
+def merge_overlap(previous, following, max_words=30):
+    """
+    Join two consecutive transcript pieces, removing the words repeated at the join.
+
+    Args:
+        previous (str): Text of the earlier piece.
+        following (str): Text of the later piece.
+        max_words (int): Longest repetition searched.
+
+    Returns:
+        str: The following text without its leading words already present at the end of `previous`.
+    """
+    previous_words = _normalize_words(previous)
+    following_words = following.split()
+    normalized = _normalize_words(following)
+
+    for size in range(min(max_words, len(previous_words), len(normalized)), 0, -1):
+        if previous_words[-size:] == normalized[:size]:
+            return " ".join(following_words[size:])
+    return following.strip()
+
+
+def iter_stitched_segments(windows_segments, windows, sample_rate=SAMPLE_RATE):
+    """
+    Merge the segments transcribed per window into one timeline, window after window.
+
+    Segments (with absolute timestamps) are kept by the window owning their midpoint, then the
+    words duplicated across each join are removed. Only the end of the previous window is needed,
+    so the segments of a window are yielded as soon as it is transcribed.
+
+    Args:
+        windows_segments (iterable): Per window, in order, a list of {"start", "end", "text"} dicts.
+        windows (list): Windows as returned by plan_windows.
+        sample_rate (int): Samples per second.
+
+    Yields:
+        dict: Merged segments, in timeline order.
+    """
+    tail = []
+    for segments, (_, _, own_start, own_end) in zip(windows_segments, windows):
+        own_from = own_start / sample_rate
+        own_to = own_end / sample_rate
+        owned = [s for s in segments if own_from <= (s["start"] + s["end"]) / 2 < own_to]
+        if tail and owned:
+            owned[0] = dict(owned[0], text=" " + merge_overlap(" ".join(s["text"] for s in tail), owned[0]["text"]))
+        owned = [s for s in owned if s["text"].strip()]
+        tail = (tail + owned)[-3:]
+        yield from owned
+
+
+def stitch_segments(windows_segments, windows, sample_rate=SAMPLE_RATE):
+    """
+    Merge the segments transcribed per window into one timeline (see iter_stitched_segments).
+
+    Args:
+        windows_segments (list): Per window, a list of {"start", "end", "text"} dicts.
+        windows (list): Windows as returned by plan_windows.
+        sample_rate (int): Samples per second.
+
+    Returns:
+        dict: "text" (full transcription) and "segments" (merged segment list).
+    """
+    merged = list(iter_stitched_segments(windows_segments, windows, sample_rate))
+    return {"text": "".join(s["text"] for s in merged).strip(), "segments": merged}
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".webm", ".mp4")
+
+
+def file_hash(path, block_size=1024 * 1024):
+    """
+    Returns:
+        str: SHA-256 hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def list_audio_files(audio_dir, extensions=AUDIO_EXTENSIONS):
+    """
+    Returns:
+        list: Sorted paths of the audio files directly inside `audio_dir`.
+    """
+    return sorted(
+        os.path.join(audio_dir, name)
+        for name in os.listdir(audio_dir)
+        if name.lower().endswith(extensions) and os.path.isfile(os.path.join(audio_dir, name))
+    )
+
+
+class TranscriptionManifest:
+    """
+    Record of the audio files already transcribed into an output folder, keyed by content hash.
+
+    The manifest is rewritten atomically after every finished file, so a crashed batch
+    resumes without redoing the files completed before the crash.
+
+    Args:
+        output_dir (str): Folder holding the manifest (manifest.json) and the per-file outputs.
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, "manifest.json")
+        self.lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        else:
+            self.entries = {}
+
+    def is_done(self, content_hash, settings):
+        """
+        Returns:
+            bool: True if this content was transcribed with the same settings and its outputs still exist.
+        """
+        entry = self.entries.get(content_hash)
+        if entry is None or entry["status"] != "done" or entry["settings"] != settings:
+            return False
+        return all(os.path.exists(path) for path in entry["outputs"].values())
+
+    def summary_done(self, content_hash, language):
+        """
+        Returns:
+            bool: True if the summary of this content was generated in this language and still exists.
+        """
+        summary = (self.entries.get(content_hash) or {}).get("summary")
+        if not summary or summary["status"] != "done" or summary["language"] != language:
+            return False
+        return os.path.exists(summary["path"])
+
+    def mark(self, content_hash, audio_path, status, settings, outputs=None, error=None, seconds=None):
+        """
+        Record the outcome of the transcription of one file ("done" or "failed") and save the manifest.
+        """
+        with self.lock:
+            self.entries[content_hash] = {
+                "audio_path": audio_path,
+                "status": status,
+                "settings": settings,
+                "outputs": outputs or {},
+                "error": error,
+                "seconds": seconds,
+                "summary": None,
+            }
+            self._save()
+
+    def mark_summary(self, content_hash, status, language, path=None, error=None):
+        """
+        Record the outcome of the summary of a transcribed file ("done" or "failed") and save the manifest.
+
+        The summary is a separate step: when it fails, the transcription stays done and only the
+        summary is retried by the next run.
+        """
+        with self.lock:
+            entry = self.entries[content_hash]
+            entry["summary"] = {"status": status, "language": language, "path": path, "error": error}
+            if status == "done":
+                entry["outputs"]["summary"] = path
+            else:
+                entry["outputs"].pop("summary", None)
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,38 @@
+import re
+
+import numpy as np
+
+
+def normalize_text(text):
+    """
+    Lowercase a transcript and drop its punctuation, so only the words are compared.
+    """
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Word error rate: (substitutions + deletions + insertions) / words of the reference.
+
+    Args:
+        reference (str): Expected transcript.
+        hypothesis (str): Transcript to score.
+
+    Returns:
+        float: 0.0 for identical word sequences (can exceed 1.0 with many insertions).
+    """
+    ref = normalize_text(reference)
+    hyp = normalize_text(hypothesis)
+    if not ref:
+        return float(len(hyp) > 0)
+
+    # Levenshtein distance over words, one row of the DP table at a time
+    columns = np.arange(len(hyp) + 1)
+    previous = columns
+    for i, word in enumerate(ref, start=1):
+        mismatch = np.array([word != h for h in hyp], dtype=np.int64)
+        best = np.minimum(previous[:-1] + mismatch, previous[1:] + 1)
+        # insertions chain from the cell on the left: cell[j] = min over k <= j of best[k] + (j - k)
+        shifted = np.concatenate([[i], best - columns[1:]])
+        previous = np.minimum.accumulate(shifted) + columns
+    return float(previous[-1]) / len(ref)
@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .backends import load_backend
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def default_device():
+    """
+    Returns:
+        str: "cuda" when a GPU is available, else "cpu" (same choice as whisper.load_model).
+    """
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def process_rss_bytes():
+    """
+    Returns:
+        int: Resident memory of the current process, or None without psutil.
+    """
+    return psutil.Process().memory_info().rss if psutil is not None else None
+
+
+class ModelRegistry:
+    """
+    Keeps loaded Whisper models in memory per (backend, size, device) so repeated transcriptions
+    do not reload the weights.
+
+    When the models held exceed the memory budget, the least recently used ones are evicted
+    (the model just requested is always kept).
+
+    Args:
+        memory_budget_mb (float): Maximum memory of the models kept loaded, None for no limit.
+    """
+
+    def __init__(self, memory_budget_mb=None):
+        self.memory_budget_mb = memory_budget_mb
+        self.models = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(model_size, device, backend):
+        return (backend, model_size, device or ("cpu" if backend == "whisper-int8" else default_device()))
+
+    def get(self, model_size, device=None, backend="whisper"):
+        """
+        Return the model of this size on this device, loading it on first use.
+
+        Args:
+            model_size (str): Whisper model size ("tiny", "base", "small", "medium", "large"...).
+            device (str): "cpu" or "cuda" (default: cuda when available, cpu for whisper-int8).
+            backend (str): Transcription backend (see backends.available_backends()).
+
+        Returns:
+            TranscriptionBackend: The loaded model.
+        """
+        key = self._key(model_size, device, backend)
+        with self.lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                entry = self.models[key]
+                entry["hits"] += 1
+                return entry["model"]
+
+            print(f"⏳ Loading Whisper model {key[1]} ({key[0]}) on {key[2]}...")
+            rss_before = process_rss_bytes()
+            start = time.perf_counter()
+            model = load_backend(*key)
+            load_seconds = time.perf_counter() - start
+            memory_bytes = model.memory_bytes()
+            if memory_bytes is None and rss_before is not None:
+                # backends not built on torch: use the memory the process grew by while loading
+                memory_bytes = max(0, process_rss_bytes() - rss_before)
+            self.models[key] = {
+                "model": model,
+                "load_seconds": load_seconds,
+                "memory_bytes": memory_bytes or 0,
+                "hits": 0,
+            }
+            print(f"✅ Whisper model {key[1]} ({key[0]}) loaded in {load_seconds:.1f}s")
+            self._evict()
+            return model
+
+    def prewarm(self, *model_sizes, device=None, backend="whisper"):
+        """
+        Load the given model sizes ahead of the first transcription (e.g. at notebook start).
+        """
+        for model_size in model_sizes:
+            self.get(model_size, device, backend)
+
+    def _evict(self):
+        if self.memory_budget_mb is None:
+            return
+        budget = self.memory_budget_mb * 1024 * 1024
+        while len(self.models) > 1 and sum(e["memory_bytes"] for e in self.models.values()) > budget:
+            (backend, model_size, device), _ = self.models.popitem(last=False)
+            print(f"🗑️ Evicted Whisper model {model_size} ({backend}, {device}) to stay under {self.memory_budget_mb} MB")
+
+    def unload(self, model_size=None, device=None, backend="whisper"):
+        """
+        Drop one model (or all of them when no size is given) from memory.
+        """
+        with self.lock:
+            if model_size is None:
+                self.models.clear()
+            else:
+                self.models.pop(self._key(model_size, device, backend), None)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Per loaded model its load time, memory and reuse count, plus the process resident memory.
+        """
+        with self.lock:
+            models = [
+                {
+                    "backend": backend,
+                    "model_size": model_size,
+                    "device": device,
+                    "load_seconds": round(entry["load_seconds"], 3),
+                    "memory_mb": round(entry["memory_bytes"] / (1024 * 1024), 1),
+                    "hits": entry["hits"],
+                }
+                for (backend, model_size, device), entry in self.models.items()
+            ]
+        rss = process_rss_bytes()
+        return {
+            "models": models,
+            "models_memory_mb": round(sum(m["memory_mb"] for m in models), 1),
+            "process_rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None,
+        }
+
+    def report(self):
+        """
+        Print the models kept in memory.
+        """
+        stats = self.stats()
+        print(f"📦 Whisper models in memory: {stats['models_memory_mb']} MB (process RSS: {stats['process_rss_mb']} MB)")
+        for m in stats["models"]:
+            print(f"   - {m['model_size']} ({m['backend']}, {m['device']}): {m['memory_mb']} MB, loaded in {m['load_seconds']}s, reused {m['hits']} times")
+
+
+_registry = ModelRegistry()
+
+
+def get_registry():
+    """
+    Returns:
+        ModelRegistry: The registry shared by every transcription of this process.
+    """
+    return _registry
+
+
+def configure(memory_budget_mb=None):
+    """
+    Set the memory budget of the shared registry (evicting models if needed).
+    """
+    _registry.memory_budget_mb = memory_budget_mb
+    with _registry.lock:
+        _registry._evict()
+
+
+def load_model(model_size, device=None, backend="whisper"):
+    """
+    Returns:
+        TranscriptionBackend: The model from the shared registry (loaded once per process).
+    """
+    return _registry.get(model_size, device, backend)
+
+
+def prewarm(*model_sizes, device=None, backend="whisper"):
+    """
+    Load models into the shared registry ahead of time.
+    """
+    _registry.prewarm(*model_sizes, device=device, backend=backend)
@@ -0,0 +1,158 @@
+import json
+import os
+import subprocess
+
+import numpy as np
+
+from .chunking_utils import FRAME_SECONDS, SAMPLE_RATE, frame_energy
+from .vad_utils import transcribe_speech
+
+
+def iter_audio_blocks(audio_path, block_seconds=120, sample_rate=SAMPLE_RATE):
+    """
+    Decode an audio file with ffmpeg and yield it block by block, never holding the whole recording.
+
+    Args:
+        audio_path (str): Path to the audio file.
+        block_seconds (float): Length of each block.
+        sample_rate (int): Output sample rate.
+
+    Yields:
+        np.ndarray: Mono float32 samples in [-1, 1] (the last block may be shorter).
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", audio_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate), "-",
+    ]
+    block_bytes = int(block_seconds * sample_rate) * 2
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data[: len(data) // 2 * 2], np.int16).astype(np.float32) / 32768.0
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to decode {audio_path}")
+    finally:
+        # the consumer may stop early: do not leave ffmpeg running
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+
+def iter_segments(model, audio_path, window_seconds=120, search_seconds=10.0, vad=None, **options):
+    """
+    Transcribe an audio file window by window, yielding the segments as soon as each window is decoded.
+
+    Every window is cut at the quietest point of its last `search_seconds`, the rest is carried over
+    to the next window, and the text of the previous window is passed as prompt to keep the context.
+    Memory stays flat whatever the length of the recording.
+
+    Args:
+        model: Loaded Whisper model.
+        audio_path (str): Path to the audio file.
+        window_seconds (float): Audio decoded per window.
+        search_seconds (float): How far back from the window end to look for a silence to cut at.
+        vad (EnergyVAD): Optional detector; only the speech regions of each window are decoded.
+        options: Extra arguments for Whisper's transcribe (language, temperature...).
+
+    Yields:
+        dict: Segments with "start", "end" (seconds in the original audio) and "text".
+    """
+    frame_samples = int(FRAME_SECONDS * SAMPLE_RATE)
+    search = int(search_seconds * SAMPLE_RATE)
+    carry = np.zeros(0, dtype=np.float32)
+    offset = 0
+    previous_text = options.pop("initial_prompt", None)
+
+    blocks = iter_audio_blocks(audio_path, window_seconds)
+    block = next(blocks, None)
+    while block is not None:
+        following = next(blocks, None)
+        audio = np.concatenate([carry, block])
+        cut = len(audio)
+        if following is not None and len(audio) > search:
+            tail = len(audio) - search
+            energy = frame_energy(audio[tail:], frame_samples)
+            cut = tail + int(np.argmin(energy)) * frame_samples
+
+        result = transcribe_speech(model, audio[:cut], vad, initial_prompt=previous_text, **options)
+        for segment in result["segments"]:
+            yield {
+                "start": segment["start"] + offset / SAMPLE_RATE,
+                "end": segment["end"] + offset / SAMPLE_RATE,
+                "text": segment["text"],
+            }
+        if result["text"].strip():
+            previous_text = result["text"][-500:]
+
+        carry = audio[cut:]
+        offset += cut
+        block = following
+
+
+def format_timestamp(seconds, separator="."):
+    """
+    Returns:
+        str: HH:MM:SS.mmm (SRT uses "," as millisecond separator).
+    """
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+class TranscriptWriter:
+    """
+    Append-only writer flushing every segment to disk as soon as it is produced,
+    so a killed run keeps everything transcribed so far and the files can be tailed live.
+
+    Args:
+        output_dir (str): Folder of the transcript files.
+        formats (tuple): Any of "txt" (one segment per line), "srt", "vtt" and "jsonl".
+        basename (str): File name without extension.
+    """
+
+    FORMATS = ("txt", "srt", "vtt", "jsonl")
+
+    def __init__(self, output_dir, formats=("txt", "srt", "vtt", "jsonl"), basename="transcription"):
+        unknown = set(formats) - set(self.FORMATS)
+        if unknown:
+            raise ValueError(f"Unsupported transcript formats: {sorted(unknown)}")
+        os.makedirs(output_dir, exist_ok=True)
+        self.paths = {fmt: os.path.join(output_dir, f"{basename}.{fmt}") for fmt in formats}
+        self.files = {fmt: open(path, "w", encoding="utf-8") for fmt, path in self.paths.items()}
+        self.count = 0
+        if "vtt" in self.files:
+            self.files["vtt"].write("WEBVTT\n\n")
+            self.files["vtt"].flush()
+
+    def write(self, segment):
+        """
+        Append one segment ({"start", "end", "text"}) to every format and flush it.
+        """
+        self.count += 1
+        text = segment["text"].strip()
+        for fmt, f in self.files.items():
+            if fmt == "txt":
+                f.write(text + "\n")
+            elif fmt == "srt":
+                f.write(f"{self.count}\n{format_timestamp(segment['start'], ',')} --> {format_timestamp(segment['end'], ',')}\n{text}\n\n")
+            elif fmt == "vtt":
+                f.write(f"{format_timestamp(segment['start'])} --> {format_timestamp(segment['end'])}\n{text}\n\n")
+            else:
+                f.write(json.dumps({"start": round(segment["start"], 3), "end": round(segment["end"], 3), "text": text}, ensure_ascii=False) + "\n")
+            f.flush()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# shared modules (common_utils/) live in the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common_utils.token_utils import estimate_tokens
+
+# notes of the map step are always written in this language, so they can be reused for any output language
+NOTES_LANGUAGE = "english"
+
+NOTES_SYSTEM_MESSAGE = "You are an assistant that takes concise, factual notes from meeting transcripts."
+NOTES_PROMPT = (
+    "Below is one part of a longer meeting transcript. Write concise notes in {language} as a markdown "
+    "bullet list: topics discussed, decisions, action items (with owners when mentioned) and open questions. "
+    "Do not add an introduction.\n{text}"
+)
+MERGE_PROMPT = (
+    "Below are notes taken from consecutive parts of a meeting. Merge them into a single set of notes in "
+    "{language} as a markdown bullet list, removing repetitions and keeping every decision and action item.\n{text}"
+)
+MINUTES_SYSTEM_MESSAGE = "You are an assistant that produces minutes of meetings from transcripts, with summary, key discussion points, in markdown."
+MINUTES_PROMPT = (
+    "Below are the notes of a meeting, taken part by part in {notes_language}. Please write minutes in markdown "
+    "in {language}, including a summary with any relevant discussion points;\n{text}"
+)
+
+
+def split_text(text, max_tokens):
+    """
+    Split a text into chunks of at most `max_tokens`, cutting between lines or sentences.
+
+    Args:
+        text (str): Text to split.
+        max_tokens (int): Token budget of each chunk.
+
+    Returns:
+        list: The chunks, in order. A single sentence longer than the budget is cut by words.
+    """
+    pieces = [p for p in re.split(r"(?<=[.!?])\s+|\n+", text) if p.strip()]
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for piece in pieces:
+        tokens = estimate_tokens(piece)
+        if tokens > max_tokens:
+            words = piece.split()
+            step = max(1, len(words) * max_tokens // tokens)
+            pieces_of_piece = [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+        else:
+            pieces_of_piece = [piece]
+
+        for part in pieces_of_piece:
+            part_tokens = estimate_tokens(part)
+            if current and current_tokens + part_tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current = []
+                current_tokens = 0
+            current.append(part)
+            current_tokens += part_tokens
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def split_notes(notes, max_tokens):
+    """
+    Returns:
+        list: Consecutive groups of notes whose joined size fits the token budget.
+    """
+    groups = []
+    current = []
+    current_tokens = 0
+    for note in notes:
+        tokens = estimate_tokens(note)
+        if current and current_tokens + tokens > max_tokens:
+            groups.append(current)
+            current = []
+            current_tokens = 0
+        current.append(note)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+class SummaryCache:
+    """
+    On-disk cache of the notes generated for each chunk, keyed by the hash of the step, model and text.
+
+    Args:
+        directory (str): Folder of the cached notes (one JSON file per entry).
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        path = os.path.join(self.directory, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["summary"]
+
+    def put(self, key, summary):
+        path = os.path.join(self.directory, f"{key}.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class MapReduceSummarizer:
+    """
+    Summarizes transcripts of any length with bounded prompts.
+
+    The transcript is split into token chunks, every chunk is turned into notes concurrently (map),
+    the notes are merged group by group until they fit in one prompt (recursive reduce) and the
+    final minutes are written in the requested language. Map and merge notes are written in
+    NOTES_LANGUAGE and cached, so summarizing the same transcript in another language only redoes
+    the final step.
+
+    Args:
+        chat (callable): chat(prompt, system_prompt) -> str, e.g. a wrapper around the shared LLM client.
+        stream_chat (callable): Optional streaming counterpart returning an iterator of text chunks.
+        chunk_tokens (int): Token budget of each transcript chunk.
+        reduce_tokens (int): Token budget of the notes merged in one prompt.
+        workers (int): Chunks summarized at the same time.
+        cache (SummaryCache): Optional cache of the map/merge notes.
+        cache_namespace (str): Model name (or any string) separating the cache entries of different models.
+    """
+
+    def __init__(self, chat, stream_chat=None, chunk_tokens=3000, reduce_tokens=3000, workers=4, cache=None, cache_namespace=""):
+        self.chat = chat
+        self.stream_chat = stream_chat
+        self.chunk_tokens = chunk_tokens
+        self.reduce_tokens = reduce_tokens
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.cache_namespace = cache_namespace
+        self.cache_hits = 0
+
+    def _cached_notes(self, step, text):
+        prompt = (NOTES_PROMPT if step == "map" else MERGE_PROMPT).format(language=NOTES_LANGUAGE, text=text)
+        key = SummaryCache.key(step, self.cache_namespace, prompt) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+        notes = self.chat(prompt, NOTES_SYSTEM_MESSAGE)
+        if key is not None:
+            self.cache.put(key, notes)
+        return notes
+
+    def _notes_for(self, step, texts):
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(texts))) as executor:
+            return list(executor.map(lambda text: self._cached_notes(step, text), texts))
+
+    def reduce(self, notes):
+        """
+        Merge notes group by group until they fit in a single prompt.
+
+        Returns:
+            str: The merged notes, still in NOTES_LANGUAGE.
+        """
+        while len(notes) > 1 and estimate_tokens("\n\n".join(notes)) > self.reduce_tokens:
+            groups = split_notes(notes, self.reduce_tokens)
+            if len(groups) == len(notes):
+                # every note already fills a prompt on its own: merging pairs still shrinks the list
+                groups = [notes[i:i + 2] for i in range(0, len(notes), 2)]
+            print(f"🧩 Merging {len(notes)} partial notes into {len(groups)}...")
+            notes = self._notes_for("merge", ["\n\n".join(group) for group in groups])
+        return "\n\n".join(notes)
+
+    def summarize(self, transcription, language, stream=False):
+        """
+        Returns:
+            str or iterator: The minutes in `language` (an iterator of text chunks when streaming).
+        """
+        chunks = split_text(transcription, self.chunk_tokens)
+        print(f"🧾 Summarizing {len(chunks)} transcript chunks with {min(self.workers, len(chunks))} workers...")
+        notes = self.reduce(self._notes_for("map", chunks))
+        prompt = MINUTES_PROMPT.format(notes_language=NOTES_LANGUAGE, language=language, text=notes)
+        if stream and self.stream_chat is not None:
+            return self.stream_chat(prompt, MINUTES_SYSTEM_MESSAGE)
+        return self.chat(prompt, MINUTES_SYSTEM_MESSAGE)
+
@@ -1,60 +1,383 @@
 import os
+import sys
 import glob
+import shutil
+import time
 import whisper
-import ollama
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .chunking_utils import SAMPLE_RATE, iter_stitched_segments, plan_windows
+from .manifest_utils import TranscriptionManifest, file_hash, list_audio_files
+from .model_registry import load_model
+from .summarization_utils import MapReduceSummarizer, SummaryCache
+from .streaming_utils import TranscriptWriter, iter_segments
+from .vad_utils import EnergyVAD, transcribe_speech
 
-def llm_summarization(transcription, language):
-    # Generate meeting minutes from transcription
+# shared modules (common_utils/) live in the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common_utils.llm_client import display_stream, get_client
+from common_utils.token_utils import estimate_tokens
+
+SUMMARY_MODEL = "llama3.2"
+
+def llm_summarization(transcription, language, stream=False, chunk_tokens=3000, workers=4, cache_dir=None):
+    """
+    Generate meeting minutes from a transcription with the local llama3.2 model.
+
+    Transcriptions longer than `chunk_tokens` are summarized map-reduce (see MapReduceSummarizer),
+    so the prompt size and latency stay bounded whatever the length of the meeting.
+
+    Parameters:
+    - transcription (str): Text to summarize.
+    - language (str): Language of the minutes.
+    - stream (bool): Render the minutes incrementally while they are generated.
+    - chunk_tokens (int): Token budget of each transcript chunk.
+    - workers (int): Chunks summarized at the same time.
+    - cache_dir (str): Optional folder caching the chunk notes between runs.
+
+    Returns:
+    - str: The minutes in markdown.
+    """
+    client = get_client()
     system_message = "You are an assistant that produces minutes of meetings from transcripts, with summary, key discussion points, in markdown."
+    if estimate_tokens(transcription) > chunk_tokens:
+        summarizer = MapReduceSummarizer(
+            chat=lambda prompt, system: client.chat(prompt, SUMMARY_MODEL, system, execution_mode="offline"),
+            stream_chat=lambda prompt, system: client.stream_chat(prompt, SUMMARY_MODEL, system, execution_mode="offline"),
+            chunk_tokens=chunk_tokens,
+            reduce_tokens=chunk_tokens,
+            workers=workers,
+            cache=SummaryCache(cache_dir) if cache_dir else None,
+            cache_namespace=SUMMARY_MODEL,
+        )
+        summary = summarizer.summarize(transcription, language, stream)
+        if summarizer.cache_hits:
+            print(f"♻️ Reused {summarizer.cache_hits} cached chunk notes")
+        return display_stream(summary) if stream else summary
+
     user_prompt = f"Below is an extract transcript from a conversation. Please write minutes in markdown in {language}, including a summary with any relevant discussion points;\n{transcription}"
-    response = ollama.chat(
-        model="llama3.2",
-        messages=[
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": user_prompt}
-        ]
-    )
-    summary = response["message"]["content"]
+    if stream:
+        summary = display_stream(client.stream_chat(user_prompt, SUMMARY_MODEL, system_message, execution_mode="offline"))
+    else:
+        summary = client.chat(user_prompt, SUMMARY_MODEL, system_message, execution_mode="offline")
     return summary
 
-def transcribe_audio(audio_dir: str, output_dir: str, model_size: str = "medium", language: str = "english") -> None:
+# Whisper model of each transcription worker process, loaded once (through the registry) by the pool initializer
+_worker_model = None
+
+def _init_transcription_worker(model_size, threads, backend="whisper"):
+    global _worker_model
+    import torch
+    torch.set_num_threads(threads)
+    _worker_model = load_model(model_size, device="cpu", backend=backend)
+
+def _transcribe_window(audio_window, offset_seconds, options, vad=None, owned=None):
+    if vad is not None:
+        # this is the worker's own copy of the detector, possibly pickled with the caller's running totals
+        vad.reset_stats()
+    # only the owned part of the window is counted, the overlaps belong to the neighbour windows
+    result = transcribe_speech(_worker_model, audio_window, vad, stats_range=owned, **options)
+    segments = [
+        {"start": s["start"] + offset_seconds, "end": s["end"] + offset_seconds, "text": s["text"]}
+        for s in result["segments"]
+    ]
+    return segments, (vad.total_seconds, vad.speech_seconds) if vad is not None else None
+
+def iter_chunked_segments(audio_path, model_size="medium", workers=None, window_seconds=300, overlap_seconds=2.0, vad=None, backend="whisper", **options):
+    """
+    Transcribe a long audio file in parallel on CPU, yielding the segments in order while the pool works.
+
+    The audio is decoded once, split at silences into overlapping windows, transcribed in a process
+    pool (each worker loads the Whisper model once) and stitched back without the overlapping text.
+    The segments of a window are yielded as soon as it and every window before it are done.
+
+    Parameters:
+    - audio_path (str): Path to the audio file.
+    - model_size (str): Whisper model size to use.
+    - workers (int): Number of worker processes (default: CPU count).
+    - window_seconds (float): Target length of each window.
+    - overlap_seconds (float): Audio shared by consecutive windows.
+    - vad (EnergyVAD): Optional detector; only the speech regions of each window are decoded.
+    - backend (str): Transcription backend ("whisper", "whisper-int8", "faster-whisper").
+    - options: Extra arguments for Whisper's transcribe (language, temperature...).
+
+    Yields:
+    - dict: Segments with "start", "end" (seconds in the original audio) and "text".
+    """
+    workers = workers or os.cpu_count() or 1
+
+    audio = whisper.load_audio(audio_path)
+    windows = plan_windows(audio, SAMPLE_RATE, window_seconds, overlap_seconds)
+    workers = min(workers, len(windows))
+    # share the CPU cores between the workers instead of letting each torch use all of them
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"✂️ Split {len(audio) / SAMPLE_RATE:.0f}s of audio into {len(windows)} windows for {workers} workers")
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_transcription_worker, initargs=(model_size, threads, backend))
+    try:
+        futures = [
+            executor.submit(_transcribe_window, audio[start:end], start / SAMPLE_RATE, options, vad, (own_start - start, own_end - start))
+            for start, end, own_start, own_end in windows
+        ]
+
+        def windows_segments():
+            # in window order: the later windows keep running in the pool meanwhile
+            for future in futures:
+                segments, vad_stats = future.result()
+                if vad_stats is not None:
+                    vad.add_stats(*vad_stats)
+                yield segments
+
+        yield from iter_stitched_segments(windows_segments(), windows)
+    finally:
+        # the consumer may stop early: do not transcribe the remaining windows
+        executor.shutdown(cancel_futures=True)
+
+def transcribe_chunked(audio_path, model_size="medium", workers=None, window_seconds=300, overlap_seconds=2.0, vad=None, backend="whisper", **options):
+    """
+    Transcribe a long audio file in parallel on CPU (see iter_chunked_segments).
+
+    Parameters:
+    - audio_path (str): Path to the audio file.
+    - model_size (str): Whisper model size to use.
+    - workers (int): Number of worker processes (default: CPU count).
+    - window_seconds (float): Target length of each window.
+    - overlap_seconds (float): Audio shared by consecutive windows.
+    - vad (EnergyVAD): Optional detector; only the speech regions of each window are decoded.
+    - backend (str): Transcription backend ("whisper", "whisper-int8", "faster-whisper").
+    - options: Extra arguments for Whisper's transcribe (language, temperature...).
+
+    Returns:
+    - dict: "text" and "segments" (with timestamps in the original audio).
+    """
+    segments = list(iter_chunked_segments(audio_path, model_size, workers, window_seconds, overlap_seconds, vad, backend, **options))
+    return {"text": "".join(s["text"] for s in segments).strip(), "segments": segments}
+
+def _transcribe_file(audio_path, file_dir, model_size, backend, window_seconds, transcript_formats, vad, options):
+    # same path as transcribe_audio: windowed decoding, optional VAD, transcript files written segment by segment
+    start = time.perf_counter()
+    detector = EnergyVAD() if vad else None
+    with TranscriptWriter(file_dir, transcript_formats) as writer:
+        # the model is the one the pool initializer loaded into the registry
+        for segment in transcribe_stream(audio_path, model_size, window_seconds, vad=detector, backend=backend, device="cpu", **options):
+            writer.write(segment)
+    return {
+        "paths": dict(writer.paths),
+        "seconds": time.perf_counter() - start,
+        "vad": detector.stats() if detector is not None else None,
+    }
+
+def _read_transcript(path):
+    # transcription.txt holds one segment per line
+    with open(path, "r", encoding="utf-8") as f:
+        return " ".join(line.strip() for line in f if line.strip())
+
+def _output_names(audio_paths):
+    # one output folder per file, named after its stem unless two files share it
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in audio_paths]
+    return {
+        path: stem if stems.count(stem) == 1 else os.path.basename(path).replace(".", "_")
+        for path, stem in zip(audio_paths, stems)
+    }
+
+def _copy_outputs(outputs, file_dir):
+    # outputs of an identical file, copied so every audio file has its own folder
+    os.makedirs(file_dir, exist_ok=True)
+    for path in outputs.values():
+        target = os.path.join(file_dir, os.path.basename(path))
+        if os.path.exists(path) and os.path.abspath(path) != os.path.abspath(target):
+            shutil.copy2(path, target)
+
+def transcribe_directory(audio_dir: str, output_dir: str, model_size: str = "medium", language: str = "english", workers: int = 1, summarize: bool = True, backend: str = "whisper", window_seconds: float = 300, transcript_formats: tuple = ("txt", "srt", "vtt", "jsonl"), vad: bool = False) -> dict:
+    """
+    Transcribe every audio file of `audio_dir` through a work queue of worker processes.
+
+    Each file gets its own folder `output_dir/<file stem>/` with the same outputs as transcribe_audio:
+    the transcript files (written incrementally, window by window) and summary.txt.
+    A manifest keyed by content hash records the finished files, so files already transcribed
+    (even renamed) are skipped and an interrupted batch resumes where it stopped. A skipped file
+    with the same content as another one gets a copy of that file's outputs in its own folder.
+    The summary is recorded as a separate step: when it fails (e.g. Ollama is down), the
+    transcription is kept and the next run only retries the summary.
+
+    Parameters:
+    - audio_dir (str): Directory containing the audio files.
+    - output_dir (str): Directory for the per-file outputs and the manifest.
+    - model_size (str): Whisper model size to use (default: "medium").
+    - language (str): Language of the summaries.
+    - workers (int): Transcription worker processes, each one with its own copy of the model.
+    - summarize (bool): Also generate the summary of each file.
+    - backend (str): Transcription backend ("whisper", "whisper-int8", "faster-whisper").
+    - window_seconds (float): Length of the audio windows transcribed (and saved) one after the other.
+    - transcript_formats (tuple): Transcript files written ("txt", "srt", "vtt", "jsonl"); transcription.txt is always written.
+    - vad (bool): Skip silence and non-speech audio before decoding.
+
+    Returns:
+    - dict: Status per audio path ("done", "skipped", "failed" or "summary_failed").
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    audio_paths = list_audio_files(audio_dir)
+    if not audio_paths:
+        raise FileNotFoundError(f"No audio file found in {audio_dir}")
+
+    manifest = TranscriptionManifest(output_dir)
+    # the summary is generated from transcription.txt
+    transcript_formats = tuple(dict.fromkeys(("txt",) + tuple(transcript_formats)))
+    settings = {"model_size": model_size, "backend": backend, "window_seconds": window_seconds, "transcript_formats": list(transcript_formats), "vad": vad}
+    names = _output_names(audio_paths)
+
+    statuses = {}
+    pending = {}
+    unsummarized = {}
+    duplicates = {}
+    for audio_path in audio_paths:
+        content_hash = file_hash(audio_path)
+        if content_hash in pending or content_hash in unsummarized:
+            # same content as a file of this batch: its outputs are copied once it is processed
+            duplicates.setdefault(content_hash, []).append(audio_path)
+        elif not manifest.is_done(content_hash, settings):
+            pending[content_hash] = audio_path
+        elif summarize and not manifest.summary_done(content_hash, language):
+            # transcribed by an earlier run whose summary failed: only the summary is redone
+            unsummarized[content_hash] = audio_path
+        else:
+            _copy_outputs(manifest.entries[content_hash]["outputs"], os.path.join(output_dir, names[audio_path]))
+            statuses[audio_path] = "skipped"
+    print(f"🗂️ {len(audio_paths)} audio files found, {len(pending)} to transcribe with {workers} workers, {len(unsummarized)} to summarize")
+
+    def finish(content_hash, audio_path, status):
+        # summary (separate step of the manifest), then copies for the files with the same content
+        entry = manifest.entries[content_hash]
+        if summarize:
+            summary_path = os.path.join(output_dir, names[audio_path], "summary.txt")
+            try:
+                transcription = _read_transcript(entry["outputs"]["transcription.txt"])
+                summary = llm_summarization(transcription, language, cache_dir=os.path.join(output_dir, "summary_cache"))
+                with open(summary_path, "w", encoding="utf-8") as f:
+                    f.write(summary)
+                manifest.mark_summary(content_hash, "done", language, summary_path)
+            except Exception as e:
+                print(f"⚠️ Summary of {os.path.basename(audio_path)} failed, it will be retried by the next run: {e}")
+                manifest.mark_summary(content_hash, "failed", language, error=str(e))
+                status = "summary_failed"
+        statuses[audio_path] = status
+        for duplicate in duplicates.get(content_hash, []):
+            _copy_outputs(entry["outputs"], os.path.join(output_dir, names[duplicate]))
+            statuses[duplicate] = "skipped" if status != "summary_failed" else status
+
+    for content_hash, audio_path in unsummarized.items():
+        finish(content_hash, audio_path, "done")
+
+    if pending:
+        workers = max(1, min(workers, len(pending)))
+        # share the CPU cores between the workers instead of letting each torch use all of them
+        threads = max(1, (os.cpu_count() or 1) // workers)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_transcription_worker, initargs=(model_size, threads, backend)) as executor:
+            futures = {
+                executor.submit(_transcribe_file, path, os.path.join(output_dir, names[path]), model_size, backend, window_seconds, transcript_formats, vad, {}): (content_hash, path)
+                for content_hash, path in pending.items()
+            }
+            for future in as_completed(futures):
+                content_hash, audio_path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ {os.path.basename(audio_path)} failed: {e}")
+                    manifest.mark(content_hash, audio_path, "failed", settings, error=str(e))
+                    statuses[audio_path] = "failed"
+                    for duplicate in duplicates.get(content_hash, []):
+                        statuses[duplicate] = "failed"
+                    continue
+                # the transcription is recorded before the summary, so a summary failure never redoes it
+                outputs = {f"transcription.{fmt}": path for fmt, path in result["paths"].items()}
+                manifest.mark(content_hash, audio_path, "done", settings, outputs, seconds=round(result["seconds"], 2))
+                skipped = f", {result['vad']['skipped_percentage']}% non-speech skipped" if result["vad"] else ""
+                print(f"✅ {os.path.basename(audio_path)} transcribed in {result['seconds']:.1f}s{skipped} → {os.path.join(output_dir, names[audio_path])}")
+                finish(content_hash, audio_path, "done")
+
+    counts = {status: list(statuses.values()).count(status) for status in ("done", "skipped", "failed", "summary_failed")}
+    print(f"🏁 Batch finished: {counts['done']} processed, {counts['skipped']} skipped, {counts['failed']} failed, {counts['summary_failed']} without summary")
+    return statuses
+
+def transcribe_stream(audio_path, model_size="medium", window_seconds=300, vad=None, backend="whisper", device=None, **options):
+    """
+    Transcribe an audio file as a generator of segments, produced window by window.
+
+    Parameters:
+    - audio_path (str): Path to the audio file.
+    - model_size (str): Whisper model size to use.
+    - window_seconds (float): Audio decoded before the next segments are yielded.
+    - vad (EnergyVAD): Optional detector; only the speech regions are decoded.
+    - backend (str): Transcription backend ("whisper", "whisper-int8", "faster-whisper").
+    - device (str): "cpu" or "cuda" (default: cuda when available).
+    - options: Extra arguments for Whisper's transcribe (language, temperature...).
+
+    Yields:
+    - dict: Segments with "start", "end" (seconds) and "text".
+    """
+    yield from iter_segments(load_model(model_size, device=device, backend=backend), audio_path, window_seconds, vad=vad, **options)
+
+def transcribe_audio(audio_dir: str, output_dir: str, model_size: str = "medium", language: str = "english", stream_summary: bool = False, workers: int = 1, window_seconds: float = 300, transcript_formats: tuple = ("txt", "srt", "vtt", "jsonl"), vad: bool = False, backend: str = "whisper", summarize: bool = True, timings: dict = None) -> None:
     """
     Transcribe the first MP3 file found in `audio_dir` using Whisper model of size `model_size`.
     Saves transcription and summary to `output_dir`.
 
     Parameters:
-    - audio_dir (str): Path to the directory containing MP3 files.
+    - audio_dir (str): Path to the directory containing MP3 files (or directly to one audio file).
     - output_dir (str): Path to save transcription and summary outputs.
     - model_size (str): Whisper model size to use (default: "medium").
+    - stream_summary (bool): Render the summary incrementally while it is generated.
+    - workers (int): Worker processes; more than 1 transcribes long audio in parallel windows (see iter_chunked_segments).
+    - window_seconds (float): Length of the audio windows transcribed (and saved) one after the other.
+    - transcript_formats (tuple): Transcript files written incrementally ("txt", "srt", "vtt", "jsonl").
+    - vad (bool): Skip silence and non-speech audio before decoding (timestamps still refer to the original audio).
+    - backend (str): Transcription backend: "whisper" (stock), "whisper-int8" (quantized, CPU) or "faster-whisper".
+    - summarize (bool): Generate the summary after the transcription.
+    - timings (dict): Optional dict filled with "transcribe_seconds" and "summary_seconds".
     """
 
     # 2. Create the output folder if it does not exist
     os.makedirs(output_dir, exist_ok=True)
 
     # 3. Find the first MP3 file
-    mp3_files = glob.glob(os.path.join(audio_dir, "*.mp3"))
-    if not mp3_files:
-        raise FileNotFoundError(f"No MP3 file found in {audio_dir}")
-    audio_path = mp3_files[0]
+    if os.path.isfile(audio_dir):
+        audio_path = audio_dir
+    else:
+        mp3_files = glob.glob(os.path.join(audio_dir, "*.mp3"))
+        if not mp3_files:
+            raise FileNotFoundError(f"No MP3 file found in {audio_dir}")
+        audio_path = mp3_files[0]
     print(f"🎧 Using audio file: {audio_path}")
 
-    # 4. Load the Whisper model and transcribe
-    print(f"🧠 Transcribing with Whisper ({model_size})... please wait, this can take several minutes...")
-    model = whisper.load_model(model_size)
-    result = model.transcribe(audio_path)
+    # 4. Load the Whisper model and transcribe, saving every segment as soon as it is produced
+    print(f"🧠 Transcribing with Whisper ({model_size}, {backend} backend)... please wait, this can take several minutes...")
+    detector = EnergyVAD() if vad else None
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    texts = []
+    with TranscriptWriter(output_dir, transcript_formats) as writer:
+        if workers > 1:
+            segments = iter_chunked_segments(audio_path, model_size, workers, window_seconds, vad=detector, backend=backend)
+        else:
+            segments = transcribe_stream(audio_path, model_size, window_seconds, vad=detector, backend=backend)
+        for segment in segments:
+            writer.write(segment)
+            texts.append(segment["text"])
 
-    transcription = result["text"]
+    transcription = "".join(texts).strip()
+    timings["transcribe_seconds"] = time.perf_counter() - start
     print("✅ Transcription completed.")
-
-    # 5. Save transcription
-    transcription_path = os.path.join(output_dir, "transcription.txt")
-    with open(transcription_path, "w", encoding="utf-8") as f:
-        f.write(transcription)
-    print(f"📝 Transcription saved at {transcription_path}")
+    if detector is not None:
+        detector.report()
+    print(f"📝 Transcription saved at {', '.join(writer.paths.values())}")
 
     # 6. Optional: summarize the text with a local or Hugging Face model
+    if not summarize:
+        return None
     print("🧾 Generating text summary using LLaMa 3...")
-    summary = llm_summarization(transcription, language)
+    start = time.perf_counter()
+    summary = llm_summarization(transcription, language, stream_summary, cache_dir=os.path.join(output_dir, "summary_cache"))
+    timings["summary_seconds"] = time.perf_counter() - start
 
     # 7. Save summary
     summary_path = os.path.join(output_dir, "summary.txt")
@@ -0,0 +1,221 @@
+import threading
+
+import numpy as np
+
+from .chunking_utils import FRAME_SECONDS, SAMPLE_RATE, frame_energy
+
+
+def _runs(mask):
+    """
+    Returns:
+        tuple: (starts, ends) frame indexes of the runs of True values in a boolean array.
+    """
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class TimestampRemap:
+    """
+    Maps times of the speech-only audio back to the original recording.
+
+    Args:
+        compact_starts (np.ndarray): Start (seconds) of every kept region in the compacted audio.
+        original_starts (np.ndarray): Start (seconds) of the same regions in the original audio.
+        lengths (np.ndarray): Length (seconds) of every region.
+    """
+
+    def __init__(self, compact_starts, original_starts, lengths):
+        self.compact_starts = np.asarray(compact_starts, dtype=np.float64)
+        self.original_starts = np.asarray(original_starts, dtype=np.float64)
+        self.lengths = np.asarray(lengths, dtype=np.float64)
+
+    def remap(self, seconds, end=False):
+        """
+        Args:
+            seconds (float): Time in the compacted audio.
+            end (bool): Time is the end of a segment: on a region boundary, map it to the end of
+                the previous region instead of the start of the next one.
+
+        Returns:
+            float: The same instant in the original audio.
+        """
+        if not len(self.compact_starts):
+            return seconds
+        side = "left" if end else "right"
+        index = max(0, int(np.searchsorted(self.compact_starts, seconds, side=side)) - 1)
+        return float(self.original_starts[index] + min(seconds - self.compact_starts[index], self.lengths[index]))
+
+    def remap_segments(self, segments):
+        """
+        Returns:
+            list: Copies of the segments with "start"/"end" in original audio time.
+        """
+        return [
+            dict(segment, start=self.remap(segment["start"]), end=self.remap(segment["end"], end=True))
+            for segment in segments
+        ]
+
+    def table(self):
+        """
+        Returns:
+            list: (compact_start, original_start, length) per kept region, in seconds.
+        """
+        return list(zip(self.compact_starts.tolist(), self.original_starts.tolist(), self.lengths.tolist()))
+
+
+class EnergyVAD:
+    """
+    Energy based voice-activity detection, vectorized with NumPy.
+
+    A frame is speech when its RMS energy is above `threshold_ratio` times the noise floor
+    (a low percentile of the frame energies) and above `min_energy`. Short pauses are bridged,
+    isolated blips dropped and every speech region padded, so words are not clipped.
+
+    Args:
+        sample_rate (int): Samples per second.
+        threshold_ratio (float): Speech threshold relative to the noise floor.
+        noise_percentile (float): Percentile of frame energies taken as noise floor.
+        min_energy (float): Absolute RMS under which a frame is always silence.
+        min_silence_seconds (float): Shorter pauses are kept as speech.
+        min_speech_seconds (float): Shorter speech runs are dropped.
+        padding_seconds (float): Audio kept before and after each speech region.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, threshold_ratio=3.0, noise_percentile=10, min_energy=0.005,
+                 min_silence_seconds=0.6, min_speech_seconds=0.25, padding_seconds=0.2):
+        self.sample_rate = sample_rate
+        self.threshold_ratio = threshold_ratio
+        self.noise_percentile = noise_percentile
+        self.min_energy = min_energy
+        self.min_silence_seconds = min_silence_seconds
+        self.min_speech_seconds = min_speech_seconds
+        self.padding_seconds = padding_seconds
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.total_seconds = 0.0
+        self.speech_seconds = 0.0
+
+    def add_stats(self, total_seconds, speech_seconds):
+        """
+        Account for audio compacted elsewhere (e.g. by a copy of this detector in a worker process).
+        """
+        with self.lock:
+            self.total_seconds += total_seconds
+            self.speech_seconds += speech_seconds
+
+    def __getstate__(self):
+        # sent to worker processes: the lock cannot be pickled
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def speech_regions(self, audio):
+        """
+        Returns:
+            list: (start, end) sample indexes of the speech regions, sorted and non-overlapping.
+        """
+        frame_samples = max(1, int(FRAME_SECONDS * self.sample_rate))
+        energy = frame_energy(audio, frame_samples)
+        if not len(energy):
+            return []
+        threshold = max(self.min_energy, np.percentile(energy, self.noise_percentile) * self.threshold_ratio)
+        speech = energy > threshold
+
+        # bridge short pauses
+        starts, ends = _runs(~speech)
+        short = (ends - starts) < self.min_silence_seconds / FRAME_SECONDS
+        inner = (starts > 0) & (ends < len(speech))
+        for start, end in zip(starts[short & inner], ends[short & inner]):
+            speech[start:end] = True
+
+        starts, ends = _runs(speech)
+        keep = (ends - starts) >= self.min_speech_seconds / FRAME_SECONDS
+        padding = int(self.padding_seconds / FRAME_SECONDS)
+        starts = np.maximum(0, starts[keep] - padding) * frame_samples
+        ends = np.minimum(len(energy), ends[keep] + padding) * frame_samples
+
+        regions = []
+        for start, end in zip(starts.tolist(), np.minimum(ends, len(audio)).tolist()):
+            if regions and start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+            else:
+                regions.append((start, end))
+        return regions
+
+    def compact(self, audio, stats_range=None):
+        """
+        Drop the non-speech audio.
+
+        Args:
+            audio (np.ndarray): Mono float32 samples.
+            stats_range (tuple): (start, end) samples of `audio` to count in the stats (default: all of it),
+                e.g. the part of an overlapping window that no other window accounts for.
+
+        Returns:
+            tuple: (speech-only audio, TimestampRemap back to the original timeline).
+        """
+        regions = self.speech_regions(audio)
+        lengths = np.array([end - start for start, end in regions], dtype=np.int64)
+        compact_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if len(lengths) else lengths
+        speech = np.concatenate([audio[start:end] for start, end in regions]) if regions else audio[:0]
+
+        low, high = stats_range if stats_range is not None else (0, len(audio))
+        counted = sum(max(0, min(end, high) - max(start, low)) for start, end in regions)
+        self.add_stats((high - low) / self.sample_rate, counted / self.sample_rate)
+
+        remap = TimestampRemap(
+            compact_starts / self.sample_rate,
+            np.array([start for start, _ in regions]) / self.sample_rate,
+            lengths / self.sample_rate,
+        )
+        return speech, remap
+
+    def stats(self):
+        """
+        Returns:
+            dict: Audio seen, speech kept and silence skipped (seconds and percentage).
+        """
+        skipped = self.total_seconds - self.speech_seconds
+        return {
+            "total_seconds": round(self.total_seconds, 1),
+            "speech_seconds": round(self.speech_seconds, 1),
+            "skipped_seconds": round(skipped, 1),
+            "skipped_percentage": round(100 * skipped / self.total_seconds, 1) if self.total_seconds else 0.0,
+        }
+
+    def report(self):
+        stats = self.stats()
+        print(
+            f"🔇 VAD skipped {stats['skipped_seconds']}s of {stats['total_seconds']}s "
+            f"({stats['skipped_percentage']}% non-speech audio)"
+        )
+
+
+def transcribe_speech(model, audio, vad=None, stats_range=None, **options):
+    """
+    Transcribe audio with Whisper, decoding only its speech regions when a VAD is given.
+
+    Args:
+        model: Loaded Whisper model.
+        audio (np.ndarray): Mono float32 samples.
+        vad (EnergyVAD): Optional detector; the segment times are mapped back to `audio`.
+        stats_range (tuple): Part of `audio` counted in the detector stats (see EnergyVAD.compact).
+        options: Extra arguments for Whisper's transcribe.
+
+    Returns:
+        dict: "text" and "segments", timed against `audio`.
+    """
+    if vad is None:
+        return model.transcribe(audio, **options)
+
+    speech, remap = vad.compact(audio, stats_range)
+    if len(speech) < vad.sample_rate * vad.min_speech_seconds:
+        return {"text": "", "segments": []}
+    result = model.transcribe(speech, **options)
+    return {"text": result["text"], "segments": remap.remap_segments(result["segments"])}
@@ -1,11 +1,12 @@
 import subprocess
 import os
-from openai import OpenAI
-import ollama
-from dotenv import load_dotenv
-import httpx
+import sys
 from IPython.display import Markdown, display
 
+# shared modules (common_utils/) live in the repository root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from common_utils.llm_client import display_stream, get_client
+
 def run_python_script(script_path: str):
     """
     Executes a Python script given its path.
@@ -33,35 +34,17 @@ def find_first_file(directory: str, extension: str) -> str:
             return os.path.join(directory, filename)
     raise FileNotFoundError(f"No .py files found in directory: {directory}")
 
-def call_llama3_ollama(prompt: str, model: str, system_prompt: str) -> str:
-    import ollama
-    response = ollama.chat(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ]
-    )
-    llm_response = response["message"]["content"]
-    return llm_response
-
-def call_chatgpt_openai(prompt: str, model_name: str, system_prompt: str) -> str:
-    load_dotenv()
-    os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY')
-
-    openai = OpenAI(http_client=httpx.Client(verify=False))
-    
-    response = openai.chat.completions.create(
-        model=model_name,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt}
-        ]
-    )
-    
-    return response.choices[0].message.content
+def call_llama3_ollama(prompt: str, model: str, system_prompt: str, stream: bool = False) -> str:
+    if stream:
+        return display_stream(get_client().stream_chat(prompt, model, system_prompt, execution_mode="offline"))
+    return get_client().chat(prompt, model, system_prompt, execution_mode="offline")
+
+def call_chatgpt_openai(prompt: str, model_name: str, system_prompt: str, stream: bool = False) -> str:
+    if stream:
+        return display_stream(get_client().stream_chat(prompt, model_name, system_prompt, execution_mode="online"))
+    return get_client().chat(prompt, model_name, system_prompt, execution_mode="online")
 
-def optimize_script(input_path: str, extension: str, output_dir: str, model_source: str, system_prompt: str, execution_mode, output_file_name="optimized_script.py", create_unitary_tests=True):
+def optimize_script(input_path: str, extension: str, output_dir: str, model_source: str, system_prompt: str, execution_mode, output_file_name="optimized_script.py", create_unitary_tests=True, stream=False):
 
         
     if not os.path.isdir(input_path):
@@ -115,11 +98,11 @@ ORIGINAL CODE:
 
     if execution_mode.lower() == "offline":
         print(f"▶️ Using {model_source} via Ollama...")
-        full_response = call_llama3_ollama(prompt, model_source, system_prompt)
+        full_response = call_llama3_ollama(prompt, model_source, system_prompt, stream)
     
     elif execution_mode.lower() == "online":
         print(f"▶️ Using {model_source} via OpenAI API...")
-        full_response = call_chatgpt_openai(prompt, model_source, system_prompt)
+        full_response = call_chatgpt_openai(prompt, model_source, system_prompt, stream)
     
     else:
         raise ValueError("Invalid execution_mode. Use 'offline' or 'online'.")